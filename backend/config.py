@@ -20,6 +20,24 @@ class Settings(BaseSettings):
     PDF_ENGINE: Literal["native", "mineru", "auto"] = Field(default="native")
     MINERU_ENABLED: bool = Field(default=False)
     MINERU_MODEL_OPTS: Dict[str, Any] = Field(default_factory=dict)
+    PARSE_WORKERS: int = Field(default=0, ge=0)
+    PARSE_CACHE: bool = Field(default=True)
+    LLM_CONCURRENCY: int = Field(default=4, ge=1)
+    LLM_CONTEXT_WINDOW: int = Field(default=0, ge=0)
+    SPEC_PREFILTER: bool = Field(default=True)
+    SPEC_RESULT_CACHE: bool = Field(default=True)
+    PROFILE_SAMPLE_RATE: float = Field(default=0.0, ge=0.0, le=1.0)
+    WEB_WORKERS: int = Field(default=0, ge=0)
+    WORKER_MAX_REQUESTS: int = Field(default=1000, ge=0)
+    WORKER_MAX_REQUESTS_JITTER: int = Field(default=100, ge=0)
+    DRAIN_TIMEOUT_S: float = Field(default=30.0, ge=0.0)
+    RETENTION_MAX_BYTES: int = Field(default=0, ge=0)
+    RETENTION_STAGE_MAX_BYTES: Dict[str, int] = Field(default_factory=dict)
+    RETENTION_MAX_AGE_DAYS: Dict[str, float] = Field(default_factory=dict)
+    RETENTION_SWEEP_INTERVAL_S: float = Field(default=3600.0, ge=0.0)
+    ARTIFACT_FSYNC: Literal["always", "batch", "never"] = Field(default="batch")
+    ARTIFACT_FILE_MODE: int = Field(default=0o644, ge=0, le=0o777)
+    JSON_CODEC: Literal["auto", "orjson", "msgspec", "stdlib"] = Field(default="auto")
 
     @field_validator("ALLOW_ORIGINS", mode="before")
     @classmethod
@@ -31,6 +49,14 @@ class Settings(BaseSettings):
             return [item.strip() for item in value.split(",") if item.strip()]
         return list(value)
 
+    @field_validator("ARTIFACT_FILE_MODE", mode="before")
+    @classmethod
+    def _parse_octal_mode(cls, value: Any) -> Any:
+        """Read file modes from the environment as octal, like ``chmod``."""
+        if isinstance(value, str):
+            return int(value.strip(), 8)
+        return value
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -7,25 +7,44 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from .config import get_settings
 from .database import init_db
-from .routers import export, health, headers, settings, specs, upload
+from .profiling import profile_requests
+from .services import inflight, retention
+from .services.llm import close_shared_clients
+from .services.upload_stream import UploadLimitMiddleware
+from .store import sync_pending
+from .routers import export, health, headers, metrics, profiles, search, settings, specs, upload
+from .routers.files import files_router
+from .routers.ingest import ingest_router
+from .routers.system import system_router
 
 app = FastAPI(title="SimpleSpecs", version="1.0.0")
 
+# Innermost, so its 413 still passes through CORS and profiling.
+app.add_middleware(UploadLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Id"],
 )
+app.middleware("http")(profile_requests)
 
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(profiles.router)
 app.include_router(upload.router)
 app.include_router(headers.router)
 app.include_router(settings.router)
 app.include_router(specs.router)
 app.include_router(export.router)
+app.include_router(search.router)
+app.include_router(system_router)
+app.include_router(ingest_router)
+app.include_router(files_router)
 
 @app.on_event("startup")
 def _ensure_database() -> None:
@@ -33,6 +52,39 @@ def _ensure_database() -> None:
 
     init_db()
 
+
+@app.on_event("startup")
+async def _start_retention_sweeper() -> None:
+    """Periodically apply the artifact retention policy."""
+
+    retention.start_sweeper()
+
+
+@app.on_event("startup")
+def _install_drain_handler() -> None:
+    """Let running spec jobs finish before ``SIGTERM`` stops the server."""
+
+    inflight.install_drain_handler(get_settings().DRAIN_TIMEOUT_S)
+
+
+@app.on_event("shutdown")
+async def _stop_retention_sweeper() -> None:
+    await retention.stop_sweeper()
+
+
+@app.on_event("shutdown")
+async def _close_llm_clients() -> None:
+    """Close pooled LLM provider connections."""
+
+    await close_shared_clients()
+
+
+@app.on_event("shutdown")
+def _sync_artifact_writes() -> None:
+    """Flush artifact writes whose fsync the ``batch`` policy deferred."""
+
+    sync_pending()
+
 frontend_dir = Path(__file__).resolve().parent.parent / "frontend"
 if frontend_dir.exists():
     app.mount("/", StaticFiles(directory=frontend_dir, html=True), name="frontend")
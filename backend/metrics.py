@@ -0,0 +1,222 @@
+"""Lightweight stage timing and counter instrumentation for SimpleSpecs."""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from .logging import get_logger
+from .services.capabilities import optional_import
+
+try:  # pragma: no cover - platform dependent
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+__all__ = [
+    "increment",
+    "job_report",
+    "observe",
+    "record_llm_call",
+    "render_prometheus",
+    "reset_metrics",
+    "stage_timer",
+]
+
+_METRIC_PREFIX = "simplespecs"
+_MAX_JOBS = 256
+
+_LabelKey = tuple[tuple[str, str], ...]
+
+_logger = get_logger(__name__)
+_lock = threading.Lock()
+_counters: dict[str, dict[_LabelKey, float]] = {}
+_summaries: dict[str, dict[_LabelKey, list[float]]] = {}
+_jobs: "OrderedDict[str, list[dict[str, Any]]]" = OrderedDict()
+
+
+def _label_key(labels: dict[str, Any]) -> _LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def increment(name: str, value: float = 1.0, **labels: Any) -> None:
+    """Add ``value`` to the counter ``name`` for the given label set."""
+
+    key = _label_key(labels)
+    with _lock:
+        series = _counters.setdefault(name, {})
+        series[key] = series.get(key, 0.0) + value
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record an observation (count and sum) for the summary ``name``."""
+
+    key = _label_key(labels)
+    with _lock:
+        series = _summaries.setdefault(name, {})
+        entry = series.setdefault(key, [0.0, 0.0])
+        entry[0] += 1
+        entry[1] += value
+
+
+def _record_job(job_id: str, record: dict[str, Any]) -> None:
+    with _lock:
+        stages = _jobs.get(job_id)
+        if stages is None:
+            stages = []
+            _jobs[job_id] = stages
+            while len(_jobs) > _MAX_JOBS:
+                _jobs.popitem(last=False)
+        else:
+            _jobs.move_to_end(job_id)
+        stages.append(record)
+
+
+def _max_rss_bytes() -> int:
+    if resource is not None:
+        peak = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        # ``ru_maxrss`` is in bytes on macOS and in kilobytes elsewhere.
+        return peak if sys.platform == "darwin" else peak * 1024
+    psutil = optional_import("psutil")
+    if psutil is None:
+        return 0
+    memory = psutil.Process().memory_info()
+    # Windows reports the peak working set; other platforms only the current RSS.
+    return int(getattr(memory, "peak_wset", memory.rss))
+
+
+@contextmanager
+def stage_timer(stage: str, job_id: str | None = None, **labels: Any) -> Iterator[dict[str, Any]]:
+    """Time a pipeline stage and record it globally and in the job report.
+
+    The yielded dictionary can be used to attach extra fields (for example an
+    object count) to the per-job record.
+    """
+
+    extra: dict[str, Any] = {}
+    started_wall = time.perf_counter()
+    started_cpu = time.process_time()
+    outcome = "ok"
+    try:
+        yield extra
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started_wall
+        cpu = time.process_time() - started_cpu
+        observe("stage_seconds", elapsed, stage=stage, **labels)
+        increment("stage_total", stage=stage, outcome=outcome, **labels)
+        if job_id:
+            _record_job(
+                job_id,
+                {
+                    "stage": stage,
+                    "seconds": round(elapsed, 6),
+                    "cpu_seconds": round(cpu, 6),
+                    "max_rss_bytes": _max_rss_bytes(),
+                    "outcome": outcome,
+                    **{key: value for key, value in labels.items() if value is not None},
+                    **extra,
+                },
+            )
+        _logger.debug(
+            "stage=%s job=%s outcome=%s seconds=%.4f cpu=%.4f",
+            stage,
+            job_id or "-",
+            outcome,
+            elapsed,
+            cpu,
+        )
+
+
+def record_llm_call(
+    provider: str,
+    seconds: float,
+    *,
+    outcome: str = "ok",
+    retries: int = 0,
+    usage: dict[str, Any] | None = None,
+) -> None:
+    """Record latency, retry and token usage counters for one LLM call."""
+
+    observe("llm_request_seconds", seconds, provider=provider)
+    increment("llm_requests_total", provider=provider, outcome=outcome)
+    if retries:
+        increment("llm_retries_total", retries, provider=provider)
+    if usage:
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if isinstance(prompt_tokens, (int, float)):
+            increment("llm_prompt_tokens_total", prompt_tokens, provider=provider)
+        if isinstance(completion_tokens, (int, float)):
+            increment("llm_completion_tokens_total", completion_tokens, provider=provider)
+
+
+def job_report(job_id: str) -> dict[str, Any] | None:
+    """Return the structured timing report for ``job_id`` if one was recorded."""
+
+    with _lock:
+        stages = _jobs.get(job_id)
+        if stages is None:
+            return None
+        stages = [dict(item) for item in stages]
+    totals: dict[str, float] = {}
+    for item in stages:
+        totals[item["stage"]] = totals.get(item["stage"], 0.0) + item["seconds"]
+    return {
+        "job_id": job_id,
+        "stages": stages,
+        "totals": {key: round(value, 6) for key, value in totals.items()},
+        "total_seconds": round(sum(totals.values()), 6),
+    }
+
+
+def _format_labels(key: _LabelKey) -> str:
+    if not key:
+        return ""
+    parts = []
+    for name, value in key:
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{name}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def render_prometheus() -> str:
+    """Render all metrics using the Prometheus text exposition format."""
+
+    with _lock:
+        counters = {name: dict(series) for name, series in _counters.items()}
+        summaries = {
+            name: {key: list(entry) for key, entry in series.items()}
+            for name, series in _summaries.items()
+        }
+
+    lines: list[str] = []
+    for name in sorted(counters):
+        metric = f"{_METRIC_PREFIX}_{name}"
+        lines.append(f"# TYPE {metric} counter")
+        for key, value in sorted(counters[name].items()):
+            lines.append(f"{metric}{_format_labels(key)} {value:g}")
+    for name in sorted(summaries):
+        metric = f"{_METRIC_PREFIX}_{name}"
+        lines.append(f"# TYPE {metric} summary")
+        for key, (count, total) in sorted(summaries[name].items()):
+            labels = _format_labels(key)
+            lines.append(f"{metric}_count{labels} {count:g}")
+            lines.append(f"{metric}_sum{labels} {total:.6f}")
+    lines.append(f"# TYPE {_METRIC_PREFIX}_process_max_rss_bytes gauge")
+    lines.append(f"{_METRIC_PREFIX}_process_max_rss_bytes {_max_rss_bytes()}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Clear all recorded metrics (intended for tests)."""
+
+    with _lock:
+        _counters.clear()
+        _summaries.clear()
+        _jobs.clear()
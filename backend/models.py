@@ -21,9 +21,70 @@ class ParsedObject(BaseModel):
     )
 
 
+class DocumentObject(BaseModel):
+    """Parsed element stored as an artifact under ``<file_id>/parsed/objects.json``."""
+
+    object_id: str
+    file_id: str
+    kind: Literal["text", "table", "image"] = "text"
+    text: str | None = None
+    page_index: int | None = None
+    bbox: list[float] | None = None
+    order_index: int
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class SectionSpan(BaseModel):
+    """First and last document object covered by a section."""
+
+    start_object: str
+    end_object: str
+
+
+class SectionNode(BaseModel):
+    """Node of a document's header tree."""
+
+    section_id: str
+    file_id: str
+    number: str | None = None
+    title: str
+    depth: int = 0
+    children: list[SectionNode] = Field(default_factory=list)
+    span: SectionSpan | None = None
+
+
+class SectionSpec(BaseModel):
+    """Specification extracted from a section, with the objects it came from."""
+
+    spec_id: str
+    file_id: str
+    section_id: str
+    section_number: str | None = None
+    section_title: str
+    spec_text: str
+    confidence: float | None = None
+    source_object_ids: list[str] = Field(default_factory=list)
+
+
 class UploadResponse(BaseModel):
     upload_id: str
     object_count: int
+    deduplicated: bool = False
+
+
+class BatchUploadItem(BaseModel):
+    filename: str
+    upload_id: str | None = None
+    object_count: int = 0
+    status: Literal["processed", "deduplicated", "failed"]
+    error: str | None = None
+
+
+class BatchUploadResponse(BaseModel):
+    items: list[BatchUploadItem]
+    processed: int
+    deduplicated: int
+    failed: int
 
 
 class ObjectsResponse(BaseModel):
@@ -59,3 +120,19 @@ class SpecItem(BaseModel):
     section_name: str
     specification: str
     domain: str = "Mechanical"
+
+
+class SearchHit(BaseModel):
+    kind: Literal["spec", "object"]
+    upload_id: str
+    ref: str | None = None
+    section_number: str | None = None
+    section_name: str | None = None
+    text: str
+    snippet: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    items: list[SearchHit]
+    total: int
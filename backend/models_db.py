@@ -39,3 +39,42 @@ class ModelSettingsUpdate(ModelSettingsBase):
     """Request model for updating persisted settings."""
 
     pass
+
+
+class ParsedArtifact(SQLModel, table=True):
+    """Content-addressed index entry pointing at previously parsed output."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    sha256: str = Field(index=True, max_length=64)
+    scope: str = Field(max_length=16)
+    engine: str = Field(max_length=32)
+    parser_version: str = Field(max_length=32)
+    artifact_id: str = Field(max_length=64)
+    object_count: int = Field(default=0, ge=0)
+    created_at: datetime = Field(default_factory=_utcnow, nullable=False)
+
+
+class SectionResult(SQLModel, table=True):
+    """Cross-document LLM result for a section, keyed by its normalized content."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    content_key: str = Field(index=True, unique=True, max_length=64)
+    namespace: str = Field(max_length=32)
+    model: str = Field(max_length=255)
+    prompt_version: str = Field(max_length=16)
+    payload: str = Field(description="JSON list of the section's LLM results")
+    hit_count: int = Field(default=0, ge=0)
+    created_at: datetime = Field(default_factory=_utcnow, nullable=False)
+
+
+class StoredFile(SQLModel, table=True):
+    """Retention index entry for an artifact file and when it was last used."""
+
+    id: int | None = Field(default=None, primary_key=True)
+    path: str = Field(index=True, unique=True, max_length=1024)
+    root: str = Field(max_length=16)
+    document_id: str = Field(index=True, max_length=128)
+    stage: str = Field(max_length=16)
+    size_bytes: int = Field(default=0, ge=0)
+    modified_ts: float = Field(default=0.0, description="File mtime as Unix time")
+    accessed_ts: float = Field(default=0.0, description="Last recorded read as Unix time")
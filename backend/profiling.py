@@ -0,0 +1,234 @@
+"""Opt-in per-request cProfile capture for the heavy pipeline endpoints."""
+from __future__ import annotations
+
+import cProfile
+import json
+import pstats
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future
+from contextvars import ContextVar
+from functools import wraps
+from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar
+
+from fastapi import Request
+from starlette.responses import Response
+
+from .config import Settings, get_settings
+from .logging import get_logger
+
+__all__ = [
+    "PROFILED_PATHS",
+    "PROFILE_HEADER",
+    "PROFILE_QUERY_PARAM",
+    "profile_path",
+    "profile_requests",
+    "profiled",
+    "profiles_dir",
+    "submit_profiled",
+]
+
+T = TypeVar("T")
+
+PROFILED_PATHS = frozenset(
+    {"/api/upload", "/api/upload/batch", "/ingest", "/api/headers", "/api/specs"}
+)
+PROFILE_HEADER = "X-SimpleSpecs-Profile"
+PROFILE_QUERY_PARAM = "profile"
+
+_TRUTHY = {"1", "true", "yes", "on"}
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+_logger = get_logger(__name__)
+# cProfile cannot run two profilers on the same thread, and every profiled
+# endpoint executes on the event loop thread, so captures are serialized.
+_profiler_lock = threading.Lock()
+
+
+class _Capture:
+    """Worker-side stats collected for the request being profiled."""
+
+    def __init__(self) -> None:
+        self.thread_id = threading.get_ident()
+        self.stats: list[dict[Any, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, stats: dict[Any, Any]) -> None:
+        with self._lock:
+            self.stats.append(stats)
+
+
+class _CollectedStats:
+    """Adapter letting :class:`pstats.Stats` load a raw stats mapping."""
+
+    def __init__(self, stats: dict[Any, Any]) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+# Context variables propagate into ``asyncio.to_thread`` and Starlette's
+# threadpool, which is how offloaded work finds the request it belongs to.
+_active_capture: ContextVar[_Capture | None] = ContextVar("profile_capture", default=None)
+
+
+def _run_profiled(
+    func: Callable[..., T], *args: Any, **kwargs: Any
+) -> tuple[T, dict[Any, Any] | None]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Python 3.12+ profiles through interpreter-wide ``sys.monitoring``;
+        # the request profiler is then already observing this thread.
+        return func(*args, **kwargs), None
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+def profiled(func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap a worker-thread callable so its calls land in the request profile.
+
+    ``cProfile`` only traces the thread it was enabled on, so work handed to
+    ``asyncio.to_thread`` or ``run_in_threadpool`` is invisible to the
+    middleware's profiler unless the callable profiles itself.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        capture = _active_capture.get()
+        if capture is None or capture.thread_id == threading.get_ident():
+            return func(*args, **kwargs)
+        result, stats = _run_profiled(func, *args, **kwargs)
+        if stats is not None:
+            capture.add(stats)
+        return result
+
+    return wrapper
+
+
+def submit_profiled(executor: Executor, func: Callable[..., T], *args: Any) -> Future[T]:
+    """Submit ``func`` to ``executor``, profiling it when a capture is active.
+
+    Used for process pools: the worker profiles itself and ships its stats
+    back with the result, which is unwrapped before the returned future
+    resolves.  ``func`` must be picklable.
+    """
+
+    capture = _active_capture.get()
+    if capture is None:
+        return executor.submit(func, *args)
+
+    outer: Future[T] = Future()
+    inner = executor.submit(_run_profiled, func, *args)
+
+    def _resolve(done: Future[tuple[T, dict[Any, Any] | None]]) -> None:
+        try:
+            result, stats = done.result()
+        except BaseException as exc:  # noqa: BLE001 - forwarded to the caller
+            outer.set_exception(exc)
+            return
+        if stats is not None:
+            capture.add(stats)
+        outer.set_result(result)
+
+    inner.add_done_callback(_resolve)
+    return outer
+
+
+def profiles_dir(settings: Settings | None = None) -> Path:
+    """Return the directory holding captured request profiles."""
+
+    settings = settings or get_settings()
+    return Path(settings.ARTIFACTS_DIR) / "_profiles"
+
+
+def profile_path(profile_id: str, settings: Settings | None = None) -> Path | None:
+    """Return the ``.prof`` path for ``profile_id`` or ``None`` when invalid."""
+
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    return profiles_dir(settings) / f"{profile_id}.prof"
+
+
+def _profiling_requested(request: Request, settings: Settings) -> bool:
+    if request.url.path not in PROFILED_PATHS:
+        return False
+    flag = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY_PARAM)
+    if flag is not None:
+        return flag.strip().lower() in _TRUTHY
+    rate = settings.PROFILE_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def _store_profile(
+    profiler: cProfile.Profile,
+    capture: _Capture,
+    request: Request,
+    status_code: int,
+    elapsed: float,
+) -> str:
+    profile_id = uuid.uuid4().hex
+    target = profiles_dir()
+    target.mkdir(parents=True, exist_ok=True)
+    stats = pstats.Stats(profiler)
+    for worker_stats in capture.stats:
+        stats.add(_CollectedStats(worker_stats))
+    stats.dump_stats(str(target / f"{profile_id}.prof"))
+    metadata: dict[str, Any] = {
+        "profile_id": profile_id,
+        "method": request.method,
+        "path": request.url.path,
+        "status_code": status_code,
+        "seconds": round(elapsed, 6),
+        "created_at": time.time(),
+    }
+    with (target / f"{profile_id}.json").open("w", encoding="utf-8") as handle:
+        json.dump(metadata, handle)
+    return profile_id
+
+
+async def profile_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """HTTP middleware capturing a cProfile trace for opted-in requests."""
+
+    settings = get_settings()
+    if not _profiling_requested(request, settings):
+        return await call_next(request)
+    if not _profiler_lock.acquire(blocking=False):
+        response = await call_next(request)
+        response.headers["X-Profile-Skipped"] = "busy"
+        return response
+
+    profiler = cProfile.Profile()
+    capture = _Capture()
+    token = _active_capture.set(capture)
+    started = time.perf_counter()
+    try:
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+    finally:
+        _active_capture.reset(token)
+        _profiler_lock.release()
+    elapsed = time.perf_counter() - started
+
+    try:
+        profile_id = _store_profile(profiler, capture, request, response.status_code, elapsed)
+    except OSError as exc:  # pragma: no cover - disk issues are logged only
+        _logger.warning("Unable to store request profile: %s", exc)
+        return response
+    response.headers["X-Profile-Id"] = profile_id
+    return response
@@ -3,33 +3,66 @@ from __future__ import annotations
 
 import csv
 import io
+from itertools import chain
+from typing import Any, Iterable, Iterator
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
-from ..store import read_json, specs_path
+from ..metrics import stage_timer
+from ..services.retention import touch
+from ..services.streaming import accepts_gzip, batch_chunks, gzip_chunks
+from ..store import iter_specs
 
 router = APIRouter(prefix="/api")
 
+_CSV_HEADER = ["Section number", "Section name", "Specification", "Domain"]
+_CSV_FIELDS = ("section_number", "section_name", "specification", "domain")
 
-@router.get("/export/specs.csv")
-async def export_specs(upload_id: str = Query(...)) -> StreamingResponse:
-    specs = read_json(specs_path(upload_id))
-    if not specs:
-        raise HTTPException(status_code=404, detail="No specifications available")
 
-    header = ["Section number", "Section name", "Specification", "Domain"]
+def _csv_rows(upload_id: str, specs: Iterable[dict[str, Any]]) -> Iterator[bytes]:
     buffer = io.StringIO()
     writer = csv.writer(buffer)
-    writer.writerow(header)
-    for item in specs:
-        row = [
-            (item.get("section_number") or "").replace("\r", " ").replace("\n", " "),
-            (item.get("section_name") or "").replace("\r", " ").replace("\n", " "),
-            (item.get("specification") or "").replace("\r", " ").replace("\n", " "),
-            (item.get("domain") or "").replace("\r", " ").replace("\n", " "),
-        ]
-        writer.writerow(row)
-    buffer.seek(0)
-    headers = {"Content-Disposition": "attachment; filename=specs.csv"}
-    return StreamingResponse(buffer, media_type="text/csv", headers=headers)
+
+    def _flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    with stage_timer("export", upload_id, format="csv") as timing:
+        writer.writerow(_CSV_HEADER)
+        yield _flush()
+        row_count = 0
+        for item in specs:
+            writer.writerow(
+                [
+                    (item.get(field) or "").replace("\r", " ").replace("\n", " ")
+                    for field in _CSV_FIELDS
+                ]
+            )
+            row_count += 1
+            yield _flush()
+        timing["row_count"] = row_count
+
+
+@router.get("/export/specs.csv")
+async def export_specs(
+    upload_id: str = Query(...),
+    accept_encoding: str | None = Header(default=None),
+) -> StreamingResponse:
+    """Stream the specs of an upload as CSV, gzip-encoded when accepted."""
+
+    specs = iter_specs(upload_id)
+    first = next(specs, None)
+    if first is None:
+        raise HTTPException(status_code=404, detail="No specifications available")
+    await run_in_threadpool(touch, upload_id)
+
+    body = batch_chunks(_csv_rows(upload_id, chain([first], specs)))
+    headers = {"Content-Disposition": "attachment; filename=specs.csv", "Vary": "Accept-Encoding"}
+    if accepts_gzip(accept_encoding):
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="text/csv", headers=headers)
@@ -2,19 +2,36 @@
 from __future__ import annotations
 
 from collections import Counter
+import copy
 import csv
-import hashlib
 import io
-import json
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable, Iterator
 
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Header, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json
 
 from ..config import get_settings
-from ..models import SectionNode, SpecItem
+from ..metrics import stage_timer
+from ..models import SectionNode, SectionSpec
 from ..services.chunker import load_persisted_chunks, run_chunking
+from ..services.columnar import (
+    COLUMNAR_FORMATS,
+    ColumnarUnavailableError,
+    encode_table,
+    objects_table,
+    specs_table,
+)
+from ..services.dedup import collapse_spec_records
+from ..services.inflight import DrainingError, track_job
+from ..services.llm_client import build_async_adapter
+from ..services.manifest import artifact_entry, etag_for, etag_matches
+from ..services.section_edits import apply_section_edits
+from ..services.streaming import batch_chunks, gzip_chunks
+from ..store import dumps_json, iter_json_array, loads_json
 
 files_router = APIRouter(prefix="", tags=["files"])
 
@@ -27,23 +44,105 @@ def _iter_leaves(node: SectionNode) -> Iterator[SectionNode]:
         yield from _iter_leaves(child)
 
 
-def _compute_sha256(path: Path) -> str | None:
-    if not path.exists():
-        return None
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(8192), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+def _artifact_sha256(base: Path, relative: str) -> str | None:
+    entry = artifact_entry(base, relative)
+    return entry.sha256 if entry is not None else None
 
 
-def _sorted_specs(specs: Iterable[SpecItem]) -> list[SpecItem]:
-    return sorted(specs, key=lambda item: (item.section_title, item.spec_id))
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
 
 
 def _load_json(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return loads_json(path.read_bytes())
+
+
+_EXPORT_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+_CSV_HEADER = [
+    "spec_id",
+    "file_id",
+    "section_id",
+    "section_number",
+    "section_title",
+    "spec_text",
+    "confidence",
+    "source_object_ids",
+]
+
+
+class _ItemTally:
+    """Count items flowing through a generator for timing reports."""
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def count(self, items: Iterable[SectionSpec]) -> Iterator[SectionSpec]:
+        for item in items:
+            self.value += 1
+            yield item
+
+
+def _dumps(payload: Any) -> str:
+    return dumps_json(payload).decode("utf-8")
+
+
+def _json_chunks(
+    file_id: str, section_root: SectionNode, specs: Iterable[SectionSpec]
+) -> Iterator[bytes]:
+    """Encode the export envelope incrementally, one spec per chunk."""
+
+    sections = _dumps([section_root.model_dump(mode="json")])
+    yield f'{{"file_id":{_dumps(file_id)},"sections":{sections},"specs":['.encode("utf-8")
+    separator = b""
+    for item in specs:
+        yield separator + to_json(item)
+        separator = b","
+    yield b"]}"
+
+
+def _ndjson_chunks(
+    file_id: str, section_root: SectionNode, specs: Iterable[SectionSpec]
+) -> Iterator[bytes]:
+    """Emit a header line with the sections followed by one line per spec."""
+
+    header = {"file_id": file_id, "sections": [section_root.model_dump(mode="json")]}
+    yield (_dumps(header) + "\n").encode("utf-8")
+    for item in specs:
+        yield to_json(item) + b"\n"
+
+
+def _csv_chunks(
+    file_id: str, section_root: SectionNode, specs: Iterable[SectionSpec]
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def _flush() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    writer.writerow(_CSV_HEADER)
+    yield _flush()
+    for item in specs:
+        writer.writerow(
+            [
+                item.spec_id,
+                item.file_id,
+                item.section_id,
+                item.section_number or "",
+                item.section_title,
+                item.spec_text,
+                "" if item.confidence is None else f"{item.confidence}",
+                _dumps(item.source_object_ids),
+            ]
+        )
+        yield _flush()
 
 
 @files_router.post("/chunks/{file_id}", response_model=dict[str, list[str]])
@@ -58,9 +157,23 @@ def create_chunks(file_id: str) -> dict[str, list[str]]:
 
 
 @files_router.get("/chunks/{file_id}", response_model=dict[str, list[str]])
-def get_chunks(file_id: str) -> dict[str, list[str]]:
-    """Return persisted section chunks for the provided file."""
-
+def get_chunks(
+    file_id: str,
+    response: Response,
+    if_none_match: str | None = Header(default=None),
+) -> dict[str, list[str]] | Response:
+    """Return persisted section chunks for the provided file.
+
+    Served with a strong ``ETag``; a matching ``If-None-Match`` gets ``304``.
+    """
+
+    base = Path(get_settings().ARTIFACTS_DIR) / file_id
+    entry = artifact_entry(base, "chunks/chunks.json")
+    if entry is not None:
+        etag = etag_for(entry.sha256)
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        response.headers["ETag"] = etag
     try:
         return load_persisted_chunks(file_id)
     except FileNotFoundError as exc:
@@ -68,64 +181,139 @@ def get_chunks(file_id: str) -> dict[str, list[str]]:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail) from exc
 
 
-@files_router.get("/qa/{file_id}")
-def qa_report(file_id: str) -> dict[str, Any]:
-    """Return quality assurance metrics for the processed file."""
+@files_router.put("/sections/{file_id}")
+async def update_sections(
+    file_id: str,
+    root: SectionNode,
+    reextract: bool = Query(default=True, description="Refresh specs of changed leaves"),
+    llm: str | None = Query(default=None, description="LLM provider for re-extraction"),
+) -> dict[str, Any]:
+    """Replace the section tree after a header edit and refresh dependents.
 
-    settings = get_settings()
-    base = Path(settings.ARTIFACTS_DIR) / file_id
-    parsed_path = base / "parsed" / "objects.json"
-    sections_path = base / "headers" / "sections.json"
-    chunks_path = base / "chunks" / "chunks.json"
-    specs_path = base / "specs" / "specs.json"
+    Only leaves whose spans moved are re-chunked, and specs are re-extracted
+    only for leaves whose object list changed; other specs keep their IDs.
+    """
 
-    if not parsed_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Parsed objects missing.",
-        )
-    if not sections_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Header sections missing.",
-        )
-    if not chunks_path.exists():
+    settings = get_settings()
+    if not (Path(settings.ARTIFACTS_DIR) / file_id / "parsed" / "objects.json").exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found.")
+    adapter = build_async_adapter(llm, settings, params={"temperature": 0.0}) if reextract else None
+    try:
+        with track_job(file_id):
+            result = await apply_section_edits(file_id, root, adapter, reextract=reextract)
+    except DrainingError as exc:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Section chunks missing.",
-        )
-
-    parsed_objects: list[dict[str, Any]] = _load_json(parsed_path)
-    section_root = SectionNode.model_validate(_load_json(sections_path))
-    chunk_map_raw = _load_json(chunks_path)
-    chunk_map: dict[str, list[str]] = {
-        key: [str(item) for item in value]
-        for key, value in chunk_map_raw.items()
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
+    return {
+        "file_id": file_id,
+        "chunks": result.chunks,
+        "changed_sections": result.changed_sections,
+        "removed_sections": result.removed_sections,
+        "specs_count": None if result.specs is None else len(result.specs),
     }
 
-    specs_present = specs_path.exists()
-    specs: list[SpecItem] = []
-    if specs_present:
-        specs_payload = _load_json(specs_path)
-        specs = [SpecItem.model_validate(item) for item in specs_payload]
 
-    leaves = list(_iter_leaves(section_root))
-    leaf_ids = {leaf.section_id for leaf in leaves}
-    specs_by_section: Counter[str] = Counter(spec.section_id for spec in specs)
-    leaves_with_specs = sum(1 for leaf in leaves if specs_by_section.get(leaf.section_id))
+_Fingerprint = tuple[int, int]
 
+
+def _fingerprint(path: Path) -> _Fingerprint | None:
+    """Return ``(mtime_ns, size)`` for ``path`` or ``None`` when missing."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class _StructureQA:
+    """QA inputs derived from the parsed, section and chunk artifacts."""
+
+    parsed_object_count: int
+    leaf_ids: frozenset[str]
+    leaf_count: int
+    chunk_map: dict[str, tuple[str, ...]]
+    sections_sha256: str | None
+    chunks_sha256: str | None
+
+
+@lru_cache(maxsize=64)
+def _structure_qa(
+    base: str,
+    parsed_fp: _Fingerprint,
+    sections_fp: _Fingerprint,
+    chunks_fp: _Fingerprint,
+) -> _StructureQA:
+    """Load and summarize the structural artifacts under ``base``.
+
+    The fingerprints are only part of the cache key: rewriting any of the
+    three files changes its ``mtime``/size and forces a reload.
+    """
+
+    root = Path(base)
+    parsed_objects: list[dict[str, Any]] = _load_json(root / "parsed" / "objects.json")
+    sections_path = root / "headers" / "sections.json"
+    chunks_path = root / "chunks" / "chunks.json"
+    section_root = SectionNode.model_validate(_load_json(sections_path))
+    chunk_map_raw = _load_json(chunks_path)
+    leaves = list(_iter_leaves(section_root))
+    return _StructureQA(
+        parsed_object_count=len(parsed_objects),
+        leaf_ids=frozenset(leaf.section_id for leaf in leaves),
+        leaf_count=len(leaves),
+        chunk_map={
+            key: tuple(str(item) for item in value) for key, value in chunk_map_raw.items()
+        },
+        sections_sha256=_artifact_sha256(root, "headers/sections.json"),
+        chunks_sha256=_artifact_sha256(root, "chunks/chunks.json"),
+    )
+
+
+@lru_cache(maxsize=64)
+def _qa_payload(
+    base: str,
+    parsed_fp: _Fingerprint,
+    sections_fp: _Fingerprint,
+    chunks_fp: _Fingerprint,
+    specs_fp: _Fingerprint | None,
+) -> dict[str, Any]:
+    """Combine the cached structure summary with a pass over the specs.
+
+    When only the specs change, the structural summary is reused and just
+    the specs file is read again.
+    """
+
+    structure = _structure_qa(base, parsed_fp, sections_fp, chunks_fp)
+    specs_path = Path(base) / "specs" / "specs.json"
+    specs_present = specs_fp is not None
+
+    specs_by_section: Counter[str] = Counter()
     duplicate_ids: set[str] = set()
     seen_ids: set[str] = set()
-    for spec in specs:
-        if spec.spec_id in seen_ids:
-            duplicate_ids.add(spec.spec_id)
-        seen_ids.add(spec.spec_id)
-
     mismatched_specs: list[str] = []
-    for spec in specs:
-        expected = chunk_map.get(spec.section_id, [])
-        if spec.section_id not in leaf_ids or spec.source_object_ids != expected:
-            mismatched_specs.append(spec.spec_id)
+    specs_count = 0
+    if specs_present:
+        for item in iter_json_array(specs_path):
+            spec = SectionSpec.model_validate(item)
+            specs_count += 1
+            specs_by_section[spec.section_id] += 1
+            if spec.spec_id in seen_ids:
+                duplicate_ids.add(spec.spec_id)
+            seen_ids.add(spec.spec_id)
+            expected = structure.chunk_map.get(spec.section_id, ())
+            if (
+                spec.section_id not in structure.leaf_ids
+                or tuple(spec.source_object_ids) != expected
+            ):
+                mismatched_specs.append(spec.spec_id)
+
+    leaves_with_specs = sum(1 for leaf_id in structure.leaf_ids if specs_by_section.get(leaf_id))
+    skipped_path = Path(base) / "specs" / "skipped.json"
+    skipped_sections = _load_json(skipped_path) if specs_present and skipped_path.exists() else []
 
     warnings: list[str] = []
     if mismatched_specs:
@@ -136,10 +324,13 @@ def qa_report(file_id: str) -> dict[str, Any]:
         warnings.append(f"Duplicate spec_ids detected: {joined}")
 
     coverage = {
-        "parsed_object_count": len(parsed_objects),
-        "leaf_section_count": len(leaves),
-        "specs_count": len(specs),
-        "leaf_spec_ratio": (leaves_with_specs / len(leaves)) if leaves else 0.0,
+        "parsed_object_count": structure.parsed_object_count,
+        "leaf_section_count": structure.leaf_count,
+        "specs_count": specs_count,
+        "leaf_spec_ratio": (
+            (leaves_with_specs / structure.leaf_count) if structure.leaf_count else 0.0
+        ),
+        "skipped_section_count": len(skipped_sections),
     }
 
     consistency = {
@@ -151,120 +342,265 @@ def qa_report(file_id: str) -> dict[str, Any]:
     }
 
     determinism = {
-        "sections_sha256": _compute_sha256(sections_path),
-        "chunks_sha256": _compute_sha256(chunks_path),
-        "specs_sha256": _compute_sha256(specs_path) if specs_present else None,
+        "sections_sha256": structure.sections_sha256,
+        "chunks_sha256": structure.chunks_sha256,
+        "specs_sha256": _artifact_sha256(Path(base), "specs/specs.json") if specs_present else None,
     }
 
     return {
-        "file_id": file_id,
-        "qa": {
-            "coverage": coverage,
-            "consistency": consistency,
-            "determinism": determinism,
-            "warnings": warnings,
-        },
+        "coverage": coverage,
+        "consistency": consistency,
+        "determinism": determinism,
+        "skipped_sections": skipped_sections,
+        "warnings": warnings,
     }
 
 
-@files_router.get("/export/{file_id}")
-def export_file(file_id: str, fmt: str = Query(default="json")) -> StreamingResponse:
-    """Export sections and specs as JSON or CSV."""
+@files_router.get("/qa/{file_id}")
+def qa_report(file_id: str) -> dict[str, Any]:
+    """Return quality assurance metrics for the processed file.
+
+    Results are memoized per artifact fingerprint (``mtime`` and size), so
+    polling an unchanged file costs four ``stat`` calls.
+    """
 
     settings = get_settings()
     base = Path(settings.ARTIFACTS_DIR) / file_id
-    parsed_path = base / "parsed" / "objects.json"
-    sections_path = base / "headers" / "sections.json"
-    chunks_path = base / "chunks" / "chunks.json"
-    specs_path = base / "specs" / "specs.json"
+    parsed_fp = _fingerprint(base / "parsed" / "objects.json")
+    sections_fp = _fingerprint(base / "headers" / "sections.json")
+    chunks_fp = _fingerprint(base / "chunks" / "chunks.json")
+    specs_fp = _fingerprint(base / "specs" / "specs.json")
 
-    if not parsed_path.exists():
+    if parsed_fp is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Parsed objects missing.",
+        )
+    if sections_fp is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Header sections missing.",
+        )
+    if chunks_fp is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Section chunks missing.",
+        )
+
+    qa = _qa_payload(str(base), parsed_fp, sections_fp, chunks_fp, specs_fp)
+    return {"file_id": file_id, "qa": copy.deepcopy(qa)}
+
+
+def _export_paths(file_id: str, *, require_specs: bool = True) -> dict[str, Path]:
+    """Return the artifact paths for ``file_id`` after checking they exist."""
+
+    settings = get_settings()
+    base = Path(settings.ARTIFACTS_DIR) / file_id
+    paths = {
+        "parsed": base / "parsed" / "objects.json",
+        "sections": base / "headers" / "sections.json",
+        "chunks": base / "chunks" / "chunks.json",
+        "specs": base / "specs" / "specs.json",
+    }
+
+    if not paths["parsed"].exists():
         if not base.exists():
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found.")
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Parsed objects missing.",
         )
-    if not sections_path.exists():
+    if not require_specs:
+        return paths
+    if not paths["sections"].exists():
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Header sections missing.",
         )
-    if not chunks_path.exists():
+    if not paths["chunks"].exists():
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Section chunks missing.",
         )
-    if not specs_path.exists():
+    if not paths["specs"].exists():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Specs not found.",
         )
+    return paths
+
+
+def _export_order(item: dict[str, Any]) -> tuple[str, str]:
+    return (item.get("section_title") or "", item.get("spec_id") or "")
+
+
+@lru_cache(maxsize=256)
+def _in_export_order(path: str, fingerprint: _Fingerprint | None) -> bool:
+    """Return whether ``specs.json`` is already sorted by ``(section_title, spec_id)``.
+
+    ``_persist_specs`` writes specs in that order, but files written before it
+    did are not; checking costs one streaming pass per file version.
+    """
+
+    previous: tuple[str, str] | None = None
+    for item in iter_json_array(Path(path)):
+        key = _export_order(item)
+        if previous is not None and key < previous:
+            return False
+        previous = key
+    return True
+
+
+def _iter_export_specs(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield spec records in export order, sorting legacy files in memory."""
+
+    if _in_export_order(str(path), _fingerprint(path)):
+        return iter_json_array(path)
+    return iter(sorted(iter_json_array(path), key=_export_order))
+
+
+def _export_etag(file_ids: list[str], relatives: tuple[str, ...], variant: str) -> str:
+    """Derive a strong ETag from the manifest digests an export is built from."""
+
+    artifacts_dir = Path(get_settings().ARTIFACTS_DIR)
+    parts = [variant]
+    for file_id in file_ids:
+        parts.append(file_id)
+        for relative in relatives:
+            parts.append(_artifact_sha256(artifacts_dir / file_id, relative) or "")
+    return etag_for(*parts)
+
+
+def _columnar_export(
+    file_ids: list[str],
+    fmt: str,
+    table: str,
+    filename_stem: str,
+    if_none_match: str | None,
+    *,
+    dedup: bool = False,
+) -> Response:
+    """Build one Parquet/Arrow table across ``file_ids`` and return it."""
+
+    paths = [_export_paths(file_id, require_specs=table == "specs") for file_id in file_ids]
+    relative = "specs/specs.json" if table == "specs" else "parsed/objects.json"
+    variant = f"{fmt}:{table}:dedup" if dedup else f"{fmt}:{table}"
+    etag = _export_etag(file_ids, (relative,), variant)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    media_type, extension = COLUMNAR_FORMATS[fmt]
+    try:
+        with stage_timer(
+            "export", file_ids[0] if len(file_ids) == 1 else None, format=fmt, table=table
+        ) as timing:
+            if table == "specs" and dedup:
+                records = [record for item in paths for record in iter_json_array(item["specs"])]
+                tables = [specs_table(collapse_spec_records(records))]
+            elif table == "specs":
+                tables = [specs_table(iter_json_array(item["specs"])) for item in paths]
+            else:
+                tables = [objects_table(iter_json_array(item["parsed"])) for item in paths]
+            payload = encode_table(tables, fmt)
+            timing["row_count"] = sum(item.num_rows for item in tables)
+            timing["file_count"] = len(file_ids)
+    except ColumnarUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={"error": "pyarrow_not_available", "message": str(exc)},
+        ) from exc
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename_stem}_{table}.{extension}"',
+        "ETag": etag,
+    }
+    return Response(content=payload, media_type=media_type, headers=headers)
+
+
+@files_router.get("/export")
+def export_bulk(
+    file_ids: list[str] = Query(..., alias="file_id", min_length=1),
+    fmt: str = Query(default="parquet", pattern="^(parquet|arrow)$"),
+    table: str = Query(default="specs", pattern="^(specs|objects)$"),
+    dedup: bool = Query(default=False, description="Collapse near-duplicate specs across files"),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """Export specs or parsed objects of many files as a single columnar table.
+
+    Repeat ``file_id`` for every document to include; the ``file_id`` column
+    tells the rows apart. Every listed file must have the requested artifact.
+    With ``dedup`` the specs of the whole set are collapsed to their first
+    occurrence, which keeps the merged ``source_object_ids`` of its group.
+    """
+
+    return _columnar_export(
+        list(dict.fromkeys(file_ids)),
+        fmt,
+        table,
+        "export_bulk",
+        if_none_match,
+        dedup=dedup and table == "specs",
+    )
+
+
+@files_router.get("/export/{file_id}")
+def export_file(
+    file_id: str,
+    fmt: str = Query(default="json"),
+    table: str = Query(default="specs", pattern="^(specs|objects)$"),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    """Stream sections and specs as JSON, NDJSON or CSV, or export Parquet/Arrow.
+
+    Specs are decoded from disk one at a time, so memory stays flat regardless
+    of the spec count; only legacy files not yet stored in export order are
+    sorted in memory. Append ``.gz`` to any text format (``json.gz``,
+    ``ndjson.gz``, ``csv.gz``) to download a gzip-compressed file.
+
+    ``parquet`` and ``arrow`` (an Arrow IPC stream) return a columnar table
+    with dictionary-encoded section and source-object columns; ``table``
+    selects between the specs and the parsed objects. These formats need the
+    optional ``pyarrow`` dependency and answer ``501`` without it.
+
+    Every variant carries a strong ``ETag`` derived from the manifest digests
+    of its inputs, so a matching ``If-None-Match`` is answered with ``304``.
+    """
 
     normalized = fmt.lower()
-    if normalized not in {"json", "csv"}:
+    if normalized in COLUMNAR_FORMATS:
+        return _columnar_export(
+            [file_id], normalized, table, f"export_{file_id}", if_none_match
+        )
+
+    paths = _export_paths(file_id)
+
+    base_format, _, compression = normalized.partition(".")
+    if base_format not in _EXPORT_MEDIA_TYPES or compression not in {"", "gz"}:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unsupported export format.",
         )
 
-    section_root = SectionNode.model_validate(_load_json(sections_path))
-    specs_payload = [SpecItem.model_validate(item) for item in _load_json(specs_path)]
-    ordered_specs = _sorted_specs(specs_payload)
-
-    if normalized == "json":
-        content = json.dumps(
-            {
-                "file_id": file_id,
-                "sections": [section_root.model_dump(mode="json")],
-                "specs": [item.model_dump(mode="json") for item in ordered_specs],
-            },
-            ensure_ascii=False,
-            separators=(",", ":"),
-        )
-        headers = {
-            "Content-Disposition": f'attachment; filename="export_{file_id}.json"'
-        }
-        return StreamingResponse(
-            iter([content.encode("utf-8")]),
-            media_type="application/json",
-            headers=headers,
-        )
-
-    header_row = [
-        "spec_id",
-        "file_id",
-        "section_id",
-        "section_number",
-        "section_title",
-        "spec_text",
-        "confidence",
-        "source_object_ids",
-    ]
-
-    def row_iter() -> Iterator[bytes]:
-        buffer = io.StringIO()
-        writer = csv.writer(buffer, lineterminator="\n")
-        writer.writerow(header_row)
-        yield buffer.getvalue().encode("utf-8")
-        for item in ordered_specs:
-            buffer = io.StringIO()
-            writer = csv.writer(buffer, lineterminator="\n")
-            writer.writerow(
-                [
-                    item.spec_id,
-                    item.file_id,
-                    item.section_id,
-                    item.section_number or "",
-                    item.section_title,
-                    item.spec_text,
-                    "" if item.confidence is None else f"{item.confidence}",
-                    json.dumps(item.source_object_ids, ensure_ascii=False, separators=(",", ":")),
-                ]
-            )
-            yield buffer.getvalue().encode("utf-8")
-
+    etag = _export_etag([file_id], ("headers/sections.json", "specs/specs.json"), normalized)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+
+    section_root = SectionNode.model_validate(_load_json(paths["sections"]))
+    encoders = {"json": _json_chunks, "ndjson": _ndjson_chunks, "csv": _csv_chunks}
+    # Specs on disk were written from validated models; skip re-validation.
+    specs = (SectionSpec.model_construct(**item) for item in _iter_export_specs(paths["specs"]))
+
+    def body() -> Iterator[bytes]:
+        with stage_timer("export", file_id, format=normalized) as timing:
+            counter = _ItemTally()
+            yield from encoders[base_format](file_id, section_root, counter.count(specs))
+            timing["spec_count"] = counter.value
+
+    content: Iterator[bytes] = batch_chunks(body())
+    media_type = _EXPORT_MEDIA_TYPES[base_format]
+    if compression:
+        content = gzip_chunks(content)
+        media_type = "application/gzip"
     headers = {
-        "Content-Disposition": f'attachment; filename="export_{file_id}.csv"'
+        "Content-Disposition": f'attachment; filename="export_{file_id}.{normalized}"',
+        "ETag": etag,
     }
-    return StreamingResponse(row_iter(), media_type="text/csv", headers=headers)
+    return StreamingResponse(content, media_type=media_type, headers=headers)
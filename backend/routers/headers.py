@@ -2,17 +2,25 @@
 from __future__ import annotations
 
 import re
+import time
 from typing import List, Dict, Any, Optional
 
 import httpx
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
+from ..logging import get_logger
+from ..metrics import record_llm_call, stage_timer
 from ..models import HeaderItem, HeadersRequest
+from ..profiling import profiled
 from ..services.llm import get_provider
+from ..services.retention import touch
 from ..services.text_blocks import document_text
+from ..services.tokens import get_tokenizer, prompt_budget, split_text
 from ..store import headers_path, read_jsonl, upload_objects_path, write_json
 
 router = APIRouter(prefix="/api")
+logger = get_logger(__name__)
 
 _HEADERS_PROMPT = """Please show a simple numbered nested list of all headers and subheaders for this document.
 Return ONLY the list enclosed in #headers# fencing, #headers#
@@ -179,22 +187,23 @@ async def _chat_via_ollama(
             if k not in ("max_tokens",) and k not in options:
                 payload[k] = v
 
+    started = time.perf_counter()
     async with httpx.AsyncClient(timeout=timeout, headers=oheaders) as client:
         try:
             # Debug log (small snippet) for payload visibility
             short_payload = {k: (v if k != "messages" else f"[{len(messages)} messages]") for k, v in payload.items()}
-            print(f"[headers.py] POST {url} {payload}")
+            logger.debug("POST %s %s", url, short_payload)
             resp = await client.post(url, json=payload)
-            print(f"[headers.py] {resp}")
+            logger.debug("Ollama responded %s", resp)
             resp.raise_for_status()
         except httpx.HTTPStatusError as e:
-            
+            record_llm_call("ollama", time.perf_counter() - started, outcome="error")
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail=f"Ollama call failed ({resp.status_code}): {resp.text}",
             ) from e
-            print(f"[headers.py] {resp}")
         except httpx.RequestError as e:
+            record_llm_call("ollama", time.perf_counter() - started, outcome="error")
             raise HTTPException(
                 status_code=status.HTTP_502_BAD_GATEWAY,
                 detail=f"Ollama connection error: {e!r}",
@@ -208,6 +217,17 @@ async def _chat_via_ollama(
                 detail=f"Ollama returned non-JSON: {resp.text[:1000]}",
             )
 
+    record_llm_call(
+        "ollama",
+        time.perf_counter() - started,
+        usage={
+            "prompt_tokens": data.get("prompt_eval_count"),
+            "completion_tokens": data.get("eval_count"),
+        }
+        if isinstance(data, dict)
+        else None,
+    )
+
     content = _extract_content_tolerant(data)
     if not content or not isinstance(content, str) or not content.strip():
         snippet = str(data)
@@ -220,6 +240,34 @@ async def _chat_via_ollama(
 
     return _strip_reasoning_tags(content.strip())
 
+
+def _parse_headers_block(response_text: str) -> List[HeaderItem]:
+    """Parse the numbered lines of a ``#headers#`` fenced block."""
+
+    match = re.search(r"#headers#(.*?)#headers#", response_text, re.DOTALL | re.IGNORECASE)
+    if not match:
+        # Provide a useful preview to debug prompts
+        preview = response_text[:800] + (" ... [truncated]" if len(response_text) > 800 else "")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"LLM returned unexpected format (missing #headers# fence). Preview: {preview}",
+        )
+
+    content = match.group(1)
+    headers: List[HeaderItem] = []
+    for raw_line in content.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        mline = re.match(r"^(\d+(?:\.\d+)*)[\s\-\.]+(.+)$", line)
+        if not mline:
+            continue
+        section_number = mline.group(1).strip()
+        section_name = mline.group(2).strip()
+        headers.append(HeaderItem(section_number=section_number, section_name=section_name))
+    return headers
+
+
 # ---------------------------
 # Endpoint
 # ---------------------------
@@ -233,6 +281,14 @@ async def extract_headers(payload: HeadersRequest) -> List[HeaderItem]:
     call Ollama directly using a payload compatible with your `ollama_test.py` style.
     Otherwise it will use the configured LLM provider via `get_provider(...).chat(messages)`.
     """
+    await run_in_threadpool(profiled(touch), payload.upload_id)
+    with stage_timer("header_discovery", payload.upload_id, provider=payload.provider) as timing:
+        headers = await _discover_headers(payload)
+        timing["header_count"] = len(headers)
+    return headers
+
+
+async def _discover_headers(payload: HeadersRequest) -> List[HeaderItem]:
     # Load document
     objects_raw = read_jsonl(upload_objects_path(payload.upload_id))
     if not objects_raw:
@@ -242,32 +298,31 @@ async def extract_headers(payload: HeadersRequest) -> List[HeaderItem]:
     if not document.strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Document is empty")
 
-    # Build chat
-    messages: List[Dict[str, str]] = [
-        {"role": "system", "content": "You analyze engineering specification documents."},
-        {"role": "user", "content": f"{_HEADERS_PROMPT}\n\nDocument contents:\n{document}"},
-    ]
+    # Size the document to the model's context; oversize documents are sent
+    # in consecutive parts and the header lists concatenated.
+    system_prompt = "You analyze engineering specification documents."
+    user_prefix = f"{_HEADERS_PROMPT}\n\nDocument contents:\n"
+    budget = prompt_budget(
+        payload.model, template=system_prompt + user_prefix, params=payload.params
+    )
+    parts = split_text(document, budget, get_tokenizer(payload.model))
+    if len(parts) > 1:
+        logger.debug(
+            "Document for upload %s split into %d parts (budget %d tokens)",
+            payload.upload_id,
+            len(parts),
+            budget,
+        )
 
     # Decide path
     use_ollama = _is_ollama_mode(payload.provider, payload.base_url)
-
+    provider = None
     if use_ollama:
-        print("[headers.py] Using Ollama mode")
+        logger.debug("Using Ollama mode for upload %s", payload.upload_id)
         if not payload.base_url:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="base_url is required for Ollama mode")
         if not payload.model:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="model is required for Ollama mode")
-
-        # If caller explicitly wants single-string prompt, allow via params flag
-        combine = bool(getattr(payload, "combine_to_single_prompt", False) or (payload.params or {}).get("combine_to_single_prompt"))
-        response_text = await _chat_via_ollama(
-            base_url=payload.base_url,
-            model=payload.model,
-            messages=messages,
-            params=payload.params,
-            timeout=float((payload.params or {}).get("timeout", 60.0)),
-            combine_to_single_prompt=combine,
-        )
     else:
         provider = get_provider(
             payload.provider,
@@ -276,30 +331,34 @@ async def extract_headers(payload: HeadersRequest) -> List[HeaderItem]:
             api_key=payload.api_key,
             base_url=payload.base_url,
         )
-        response_text = await provider.chat(messages)
-
-    # Parse fenced #headers# block
-    match = re.search(r"#headers#(.*?)#headers#", response_text, re.DOTALL | re.IGNORECASE)
-    if not match:
-        # Provide a useful preview to debug prompts
-        preview = response_text[:800] + (" ... [truncated]" if len(response_text) > 800 else "")
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"LLM returned unexpected format (missing #headers# fence). Preview: {preview}",
-        )
 
-    content = match.group(1)
     headers: List[HeaderItem] = []
-    for raw_line in content.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        mline = re.match(r"^(\d+(?:\.\d+)*)[\s\-\.]+(.+)$", line)
-        if not mline:
-            continue
-        section_number = mline.group(1).strip()
-        section_name = mline.group(2).strip()
-        headers.append(HeaderItem(section_number=section_number, section_name=section_name))
+    seen: set[tuple[str, str]] = set()
+    for part in parts:
+        messages: List[Dict[str, str]] = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"{user_prefix}{part}"},
+        ]
+        if provider is None:
+            # If caller explicitly wants single-string prompt, allow via params flag
+            combine = bool(getattr(payload, "combine_to_single_prompt", False) or (payload.params or {}).get("combine_to_single_prompt"))
+            response_text = await _chat_via_ollama(
+                base_url=payload.base_url,
+                model=payload.model,
+                messages=messages,
+                params=payload.params,
+                timeout=float((payload.params or {}).get("timeout", 60.0)),
+                combine_to_single_prompt=combine,
+            )
+        else:
+            response_text = await provider.chat(messages)
+
+        for item in _parse_headers_block(response_text):
+            key = (item.section_number, item.section_name)
+            if key in seen:
+                continue
+            seen.add(key)
+            headers.append(item)
 
     if not headers:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="No headers parsed from fenced block")
@@ -1,11 +1,19 @@
 """Health check endpoint."""
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+
+from ..services.inflight import is_draining
 
 router = APIRouter()
 
 
 @router.get("/healthz")
-async def healthz() -> dict[str, str]:
-    """Return service health information."""
+async def healthz(response: Response) -> dict[str, str]:
+    """Return service health information.
+
+    A draining worker answers ``503`` so load balancers stop routing to it.
+    """
 
+    if is_draining():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "draining"}
     return {"status": "ok"}
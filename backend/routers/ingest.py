@@ -1,46 +1,50 @@
 """Upload and parsing routes for document ingestion."""
 from __future__ import annotations
 
-import json
+import shutil
 import uuid
 from pathlib import Path
-from typing import Annotated, Iterable
+from typing import Annotated, Callable, Iterable
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, File, Form, Header, HTTPException, Response, UploadFile, status
 
 from ..config import Settings, get_settings
-from ..models import ParsedObject
+from ..metrics import stage_timer
+from ..models import DocumentObject
+from ..services.content_index import find_parsed_artifact, register_parsed_artifact
+from ..services.inflight import DrainingError, track_job
+from ..services.manifest import artifact_entry, etag_for, etag_matches, write_artifact_json
 from ..services.parse_docx import parse_docx
 from ..services.parse_txt import parse_txt
 from ..services.pdf_mineru import MinerUUnavailableError
-from ..services.pdf_parser import select_pdf_parser
+from ..services.pdf_parser import ENGINE_VERSIONS, select_pdf_parser
+from ..services.search_index import index_objects
+from ..services.upload_stream import max_upload_bytes, receive_upload
 
 ingest_router = APIRouter(tags=["ingest"])
 
+_INDEX_SCOPE = "ingest"
+_TEXT_PARSER_VERSION = "1"
+_OBJECTS_ARTIFACT = "parsed/objects.json"
+
 
 def _ensure_order(
-    objects: Iterable[ParsedObject], file_id: str
-) -> list[ParsedObject]:
-    ordered: list[ParsedObject] = []
+    objects: Iterable[DocumentObject], file_id: str
+) -> list[DocumentObject]:
+    ordered: list[DocumentObject] = []
     for idx, obj in enumerate(objects):
         payload = obj.model_dump()
         payload["file_id"] = file_id
         payload["order_index"] = idx
         payload["object_id"] = payload.get("object_id") or f"{file_id}-{idx:06d}"
-        ordered.append(ParsedObject(**payload))
+        ordered.append(DocumentObject(**payload))
     return ordered
 
 
-def _write_objects_json(target: Path, objects: list[ParsedObject]) -> None:
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w", encoding="utf-8") as handle:
-        json.dump([obj.model_dump(mode="json") for obj in objects], handle, indent=2)
-
-
-def _load_objects_json(path: Path) -> list[ParsedObject]:
-    with path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    return [ParsedObject.model_validate(item) for item in data]
+def _write_objects_json(artifact_root: Path, objects: list[DocumentObject]) -> None:
+    payload = [obj.model_dump(mode="json") for obj in objects]
+    write_artifact_json(artifact_root, _OBJECTS_ARTIFACT, payload)
+    index_objects(artifact_root.name, payload)
 
 
 def _validate_extension(filename: str | None) -> str:
@@ -58,15 +62,6 @@ def _validate_extension(filename: str | None) -> str:
     return extension
 
 
-def _check_size_limit(data: bytes, settings: Settings) -> None:
-    max_bytes = settings.MAX_FILE_MB * 1024 * 1024
-    if len(data) > max_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
-            detail="File exceeds maximum allowed size.",
-        )
-
-
 def _is_ocr_available() -> bool:
     try:
         import importlib.util
@@ -91,60 +86,133 @@ def _resolve_engine(engine_value: str | None, settings: Settings) -> str:
     return normalized
 
 
+def _index_key(extension: str, engine: str | None, settings: Settings) -> tuple[str, str]:
+    if extension == "pdf":
+        selected_engine = _resolve_engine(engine, settings)
+        return selected_engine, ENGINE_VERSIONS[selected_engine]
+    return extension, _TEXT_PARSER_VERSION
+
+
+def _parsed_exists(settings: Settings) -> Callable[[str], bool]:
+    def _exists(file_id: str) -> bool:
+        return (Path(settings.ARTIFACTS_DIR) / file_id / "parsed" / "objects.json").exists()
+
+    return _exists
+
+
+def _parse_document(
+    document_path: Path,
+    extension: str,
+    engine: str | None,
+    settings: Settings,
+    sha256: str | None = None,
+) -> list[DocumentObject]:
+    if extension == "pdf":
+        selected_engine = _resolve_engine(engine, settings)
+        try:
+            parser = select_pdf_parser(
+                settings=settings,
+                file_path=str(document_path),
+                override=selected_engine,
+                sha256=sha256,
+            )
+        except MinerUUnavailableError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail={"error": "mineru_not_available", "message": str(exc)},
+            ) from exc
+        try:
+            objects = parser.parse_pdf(str(document_path))
+        except MinerUUnavailableError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail={"error": "mineru_not_available", "message": str(exc)},
+            ) from exc
+    elif extension == "docx":
+        objects = parse_docx(str(document_path))
+    else:
+        objects = parse_txt(str(document_path))
+    return objects
+
+
 @ingest_router.post("/ingest", summary="Upload and parse a document")
 async def upload_and_parse(
     file: UploadFile | None = File(None),
     engine: Annotated[str | None, Form()] = None,
+    dedupe: Annotated[bool, Form()] = True,
 ) -> dict[str, str | int]:
-    """Persist an uploaded file and parse it into structured objects."""
+    """Persist an uploaded file and parse it into structured objects.
+
+    When identical content was already parsed with the same engine and parser
+    version, the existing ``file_id`` is returned with status
+    ``deduplicated`` so its parsed objects, headers and specs are reused.
+    """
 
     settings = get_settings()
     if file is None:
         file_id = uuid.uuid5(uuid.NAMESPACE_URL, "simplespecs/mock").hex[:8]
         artifact_root = Path(settings.ARTIFACTS_DIR) / file_id
-        parsed_dir = artifact_root / "parsed"
-        _write_objects_json(parsed_dir / "objects.json", [])
+        _write_objects_json(artifact_root, [])
         return {"file_id": file_id, "object_count": 0, "status": "queued"}
 
     extension = _validate_extension(file.filename)
-    content = await file.read()
-    _check_size_limit(content, settings)
-
     file_id = uuid.uuid4().hex
+    try:
+        with track_job(file_id):
+            return await _ingest_upload(file_id, file, extension, engine, dedupe, settings)
+    except DrainingError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
+
+
+async def _ingest_upload(
+    file_id: str,
+    file: UploadFile,
+    extension: str,
+    engine: str | None,
+    dedupe: bool,
+    settings: Settings,
+) -> dict[str, str | int]:
+    index_engine, parser_version = _index_key(extension, engine, settings)
     artifact_root = Path(settings.ARTIFACTS_DIR) / file_id
     source_dir = artifact_root / "source"
     parsed_dir = artifact_root / "parsed"
-    source_dir.mkdir(parents=True, exist_ok=True)
-    parsed_dir.mkdir(parents=True, exist_ok=True)
-
     document_path = source_dir / f"document.{extension}"
-    document_path.write_bytes(content)
 
     try:
-        if extension == "pdf":
-            selected_engine = _resolve_engine(engine, settings)
-            try:
-                parser = select_pdf_parser(
-                    settings=settings,
-                    file_path=str(document_path),
-                    override=selected_engine,
-                )
-            except MinerUUnavailableError as exc:
-                raise HTTPException(
-                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                    detail={"error": "mineru_not_available", "message": str(exc)},
-                ) from exc
-            try:
-                objects = parser.parse_pdf(str(document_path))
-            except MinerUUnavailableError as exc:
-                raise HTTPException(
-                    status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                    detail={"error": "mineru_not_available", "message": str(exc)},
-                ) from exc
-        elif extension == "docx":
-            objects = parse_docx(str(document_path))
-        else:
-            objects = parse_txt(str(document_path))
+        try:
+            received = await receive_upload(
+                file, document_path, max_bytes=max_upload_bytes(settings)
+            )
+        except HTTPException:
+            shutil.rmtree(artifact_root, ignore_errors=True)
+            raise
+
+        if dedupe:
+            existing = find_parsed_artifact(
+                received.sha256,
+                scope=_INDEX_SCOPE,
+                engine=index_engine,
+                parser_version=parser_version,
+                exists=_parsed_exists(settings),
+            )
+            if existing is not None:
+                shutil.rmtree(artifact_root, ignore_errors=True)
+                return {
+                    "file_id": existing.artifact_id,
+                    "object_count": existing.object_count,
+                    "status": "deduplicated",
+                }
+
+        parsed_dir.mkdir(parents=True, exist_ok=True)
+        with stage_timer("parse", file_id, extension=extension) as timing:
+            objects = _parse_document(
+                document_path, extension, engine, settings, sha256=received.sha256
+            )
+            timing["object_count"] = len(objects)
     finally:
         await file.close()
 
@@ -160,7 +228,15 @@ async def upload_and_parse(
                 detail="Document appears scanned. Enable OCR or MinerU for processing.",
             )
 
-    _write_objects_json(parsed_dir / "objects.json", ordered_objects)
+    _write_objects_json(artifact_root, ordered_objects)
+    register_parsed_artifact(
+        received.sha256,
+        scope=_INDEX_SCOPE,
+        engine=index_engine,
+        parser_version=parser_version,
+        artifact_id=file_id,
+        object_count=len(ordered_objects),
+    )
 
     return {
         "file_id": file_id,
@@ -169,12 +245,30 @@ async def upload_and_parse(
     }
 
 
-@ingest_router.get("/parsed/{file_id}", summary="Retrieve parsed objects")
-def get_parsed_objects(file_id: str) -> list[ParsedObject]:
-    """Return persisted parsed objects for a file."""
+@ingest_router.get(
+    "/parsed/{file_id}",
+    response_model=list[DocumentObject],
+    summary="Retrieve parsed objects",
+)
+def get_parsed_objects(
+    file_id: str,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Return persisted parsed objects for a file.
+
+    The response carries a strong ``ETag`` taken from the artifact manifest;
+    a matching ``If-None-Match`` is answered with ``304`` without reading the
+    objects. The stored artifact was serialized from validated objects, so
+    its bytes are served as-is instead of being decoded and re-encoded.
+    """
 
     settings = get_settings()
-    parsed_path = Path(settings.ARTIFACTS_DIR) / file_id / "parsed" / "objects.json"
-    if not parsed_path.exists():
+    artifact_root = Path(settings.ARTIFACTS_DIR) / file_id
+    entry = artifact_entry(artifact_root, _OBJECTS_ARTIFACT)
+    if entry is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not parsed.")
-    return _load_objects_json(parsed_path)
+    etag = etag_for(entry.sha256)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    content = (artifact_root / _OBJECTS_ARTIFACT).read_bytes()
+    return Response(content=content, media_type="application/json", headers={"ETag": etag})
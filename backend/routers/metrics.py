@@ -0,0 +1,26 @@
+"""Instrumentation endpoints exposing stage timings and counters."""
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import job_report, render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Return all metrics in the Prometheus text exposition format."""
+
+    return PlainTextResponse(
+        render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/metrics/jobs/{job_id}")
+async def job_timings(job_id: str) -> dict:
+    """Return the structured per-stage timing report for a job."""
+
+    report = job_report(job_id)
+    if report is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No timings recorded for job")
+    return report
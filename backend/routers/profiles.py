@@ -0,0 +1,54 @@
+"""Download endpoints for captured request profiles."""
+from __future__ import annotations
+
+import io
+import json
+import pstats
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse, Response
+
+from ..profiling import profile_path, profiles_dir
+
+router = APIRouter(prefix="/api/profiles", tags=["profiles"])
+
+
+@router.get("")
+async def list_profiles() -> list[dict]:
+    """Return metadata for all captured profiles, newest first."""
+
+    directory = profiles_dir()
+    if not directory.exists():
+        return []
+    entries: list[dict] = []
+    for meta_path in directory.glob("*.json"):
+        try:
+            with meta_path.open("r", encoding="utf-8") as handle:
+                entries.append(json.load(handle))
+        except (OSError, ValueError):
+            continue
+    entries.sort(key=lambda item: item.get("created_at", 0), reverse=True)
+    return entries
+
+
+@router.get("/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    fmt: str = Query(default="prof", pattern="^(prof|text)$"),
+    limit: int = Query(default=50, ge=1, le=1000),
+) -> Response:
+    """Download a raw ``.prof`` file or a cumulative-time text summary."""
+
+    target = profile_path(profile_id)
+    if target is None or not target.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if fmt == "text":
+        buffer = io.StringIO()
+        stats = pstats.Stats(str(target), stream=buffer)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return PlainTextResponse(buffer.getvalue())
+    return FileResponse(
+        target,
+        media_type="application/octet-stream",
+        filename=f"profile_{profile_id}.prof",
+    )
@@ -0,0 +1,59 @@
+"""Full-text search over extracted specs and parsed text."""
+from __future__ import annotations
+
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..metrics import stage_timer
+from ..models import SearchHit, SearchResponse
+from ..services.search_index import SearchUnavailableError, match_expression, search
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search_index(
+    q: str = Query(..., min_length=1, description="Terms or \"quoted phrases\"; a trailing * matches prefixes"),
+    kind: Literal["spec", "object"] | None = Query(None, description="Restrict to specs or parsed text"),
+    upload_id: list[str] | None = Query(None, description="Restrict to these uploads (repeatable)"),
+    section: str | None = Query(None, description="Section number, including its subsections"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=200),
+) -> SearchResponse:
+    """Search specs and parsed text across every upload, best matches first."""
+
+    if not match_expression(q):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty search query")
+    try:
+        with stage_timer("search") as timing:
+            result = await run_in_threadpool(
+                search,
+                q,
+                kind=kind,
+                document_ids=upload_id,
+                section=section,
+                limit=page_size,
+                offset=(page - 1) * page_size,
+            )
+            timing["hit_count"] = result.total
+    except SearchUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail={"error": "search_not_available", "message": str(exc)},
+        ) from exc
+    items = [
+        SearchHit(
+            kind=hit.kind,
+            upload_id=hit.document_id,
+            ref=hit.ref,
+            section_number=hit.section_number,
+            section_name=hit.section_name,
+            text=hit.text,
+            snippet=hit.snippet,
+            score=hit.score,
+        )
+        for hit in result.items
+    ]
+    return SearchResponse(items=items, total=result.total)
@@ -6,14 +6,11 @@ from datetime import datetime, timezone
 from fastapi import APIRouter, Depends
 from sqlmodel import Session, select
 
-from ..database import get_session, init_db
+from ..database import get_session
 from ..models_db import ModelSettings, ModelSettingsRead, ModelSettingsUpdate
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
-# Ensure tables are created when the router is imported.
-init_db()
-
 
 def _fetch_current(session: Session) -> ModelSettings | None:
     return session.exec(select(ModelSettings).limit(1)).first()
@@ -1,25 +1,47 @@
 """Specifications extraction endpoints."""
 from __future__ import annotations
 
+import asyncio
 import re
-from typing import List
+from typing import Any, List
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 
+from ..config import get_settings
+from ..metrics import stage_timer
 from ..models import HeaderItem, SpecItem, SpecsRequest
+from ..profiling import profiled
+from ..services.dedup import near_duplicate_groups
+from ..services.inflight import DrainingError, track_job
 from ..services.llm import get_provider
-from ..services.text_blocks import document_lines, section_text
+from ..services.prefilter import skip_reason
+from ..services.result_cache import (
+    lookup_section_results,
+    section_content_key,
+    store_section_results,
+)
+from ..services.retention import touch
+from ..services.search_index import index_specs
+from ..services.text_blocks import document_lines, section_lines
+from ..services.tokens import get_tokenizer, prompt_budget, split_windows
 from ..store import (
     headers_path,
     read_json,
     read_jsonl,
     specs_path,
     upload_objects_path,
-    write_json,
+    write_jsonl,
 )
 
 router = APIRouter(prefix="/api")
 
+_SPEC_SYSTEM_PROMPT = "You extract mechanical engineering specifications."
+_WINDOW_OVERLAP = 0.1
+_PROMPT_VERSION = "1"
+"""Bump whenever ``_SPEC_PROMPT_TEMPLATE`` changes so cached section results expire."""
+_CACHE_NAMESPACE = "api-specs"
+
 _SPEC_PROMPT_TEMPLATE = """You are extracting mechanical engineering specifications from a single section of a document.
 
 Section number: {section_number}
@@ -40,6 +62,23 @@ Output format (fenced):
 
 @router.post("/specs", response_model=list[SpecItem])
 async def extract_specs(payload: SpecsRequest) -> List[SpecItem]:
+    await run_in_threadpool(profiled(touch), payload.upload_id)
+    try:
+        with track_job(payload.upload_id), stage_timer(
+            "spec_extraction", payload.upload_id, provider=payload.provider
+        ) as timing:
+            specs = await _extract_specs(payload, timing)
+            timing["spec_count"] = len(specs)
+    except DrainingError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "5"},
+        ) from exc
+    return specs
+
+
+async def _extract_specs(payload: SpecsRequest, report: dict[str, Any]) -> List[SpecItem]:
     raw_objects = read_jsonl(upload_objects_path(payload.upload_id))
     if not raw_objects:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
@@ -61,19 +100,63 @@ async def extract_specs(payload: SpecsRequest) -> List[SpecItem]:
         base_url=payload.base_url,
     )
 
-    specs: list[SpecItem] = []
-    for header in headers:
-        text = section_text(lines, headers, header)
+    # Oversize sections are cut at line (object) boundaries into overlapping
+    # windows sized to the model's prompt budget; all windows run concurrently.
+    tokenizer = get_tokenizer(payload.model)
+    jobs: list[tuple[int, HeaderItem, list[str]]] = []
+    skipped: list[dict[str, str]] = []
+    keys: dict[int, str] = {}
+    settings = get_settings()
+    identity = f"{payload.provider}:{payload.model}"
+    bodies: list[tuple[int, HeaderItem, list[str]]] = []
+    for position, header in enumerate(headers):
+        body = section_lines(lines, headers, header)
+        # The first line is the heading itself.
+        if settings.SPEC_PREFILTER:
+            reason = skip_reason(header.section_name, "\n".join(body[1:]))
+            if reason is not None:
+                skipped.append({"section_number": header.section_number, "reason": reason})
+                continue
+        if settings.SPEC_RESULT_CACHE:
+            key = section_content_key(
+                body[1:], namespace=_CACHE_NAMESPACE, model=identity, prompt_version=_PROMPT_VERSION
+            )
+            if key is not None:
+                keys[position] = key
+        bodies.append((position, header, body))
+
+    # Sections seen verbatim in other documents reuse their stored results.
+    cached = await run_in_threadpool(profiled(lookup_section_results), keys.values()) if keys else {}
+    report["cached_sections"] = sum(1 for key in keys.values() if key in cached)
+    for position, header, body in bodies:
+        if keys.get(position) in cached:
+            continue
+        template = _SPEC_PROMPT_TEMPLATE.format(
+            section_number=header.section_number,
+            section_name=header.section_name,
+            section_text="",
+        )
+        budget = prompt_budget(
+            payload.model, template=_SPEC_SYSTEM_PROMPT + template, params=payload.params
+        )
+        windows = split_windows(body, budget, tokenizer, overlap=_WINDOW_OVERLAP)
+        jobs.append((position, header, windows or [""]))
+
+    report["skipped_sections"] = skipped
+    semaphore = asyncio.Semaphore(settings.LLM_CONCURRENCY)
+
+    async def _extract_window(header: HeaderItem, text: str) -> list[str]:
         prompt = _SPEC_PROMPT_TEMPLATE.format(
             section_number=header.section_number,
             section_name=header.section_name,
             section_text=text or "No additional text found for this section.",
         )
         messages = [
-            {"role": "system", "content": "You extract mechanical engineering specifications."},
+            {"role": "system", "content": _SPEC_SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ]
-        response_text = await provider.chat(messages)
+        async with semaphore:
+            response_text = await provider.chat(messages)
         match = re.search(r"#specs#(.*?)#specs#", response_text, re.DOTALL | re.IGNORECASE)
         if not match:
             raise HTTPException(
@@ -82,7 +165,8 @@ async def extract_specs(payload: SpecsRequest) -> List[SpecItem]:
             )
         block = match.group(1).strip()
         if not block or block.strip().upper() == "NONE":
-            continue
+            return []
+        found: list[str] = []
         for raw_line in block.splitlines():
             line = raw_line.strip()
             if not line or line.upper() == "NONE":
@@ -91,13 +175,44 @@ async def extract_specs(payload: SpecsRequest) -> List[SpecItem]:
                 line = line[1:].strip()
             if not line:
                 continue
+            found.append(line)
+        return found
+
+    found_by_header: list[list[str]] = [[] for _ in headers]
+
+    async def _extract_section(position: int, header: HeaderItem, windows: list[str]) -> None:
+        results = await asyncio.gather(*(_extract_window(header, text) for text in windows))
+        found_by_header[position] = [line for found in results for line in found]
+        key = keys.get(position)
+        if key is not None:
+            # Checkpoint every finished section right away: a job interrupted by
+            # a worker restart resumes from the sections already stored.
+            await run_in_threadpool(
+                profiled(store_section_results),
+                {key: found_by_header[position]},
+                namespace=_CACHE_NAMESPACE,
+                model=identity,
+                prompt_version=_PROMPT_VERSION,
+            )
+
+    await asyncio.gather(*(_extract_section(*job) for job in jobs))
+    for position, key in keys.items():
+        if key in cached:
+            found_by_header[position] = list(cached[key])
+
+    specs: list[SpecItem] = []
+    for header, found in zip(headers, found_by_header):
+        # Overlapping windows and paraphrase repeat statements near their cuts.
+        for group in near_duplicate_groups(found):
             specs.append(
                 SpecItem(
                     section_number=header.section_number,
                     section_name=header.section_name,
-                    specification=line,
+                    specification=found[group[0]],
                 )
             )
 
-    write_json(specs_path(payload.upload_id), [spec.model_dump() for spec in specs])
+    records = [spec.model_dump() for spec in specs]
+    write_jsonl(specs_path(payload.upload_id), records)
+    await run_in_threadpool(profiled(index_specs), payload.upload_id, records)
     return specs
@@ -1,34 +1,53 @@
 """System capability routes for SimpleSpecs."""
 from __future__ import annotations
 
-import importlib
 import shutil
+from typing import Any
 
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 
 from ..config import get_settings
+from ..services.capabilities import capability_report, is_available
+from ..services.retention import storage_stats, sweep
 
 system_router = APIRouter(prefix="/system", tags=["system"])
 
 
 @system_router.get("/capabilities")
-def get_capabilities() -> dict[str, bool | str]:
-    """Return mock detection information for optional tooling."""
+def get_capabilities() -> dict[str, Any]:
+    """Report external tools and optional libraries without importing them.
+
+    ``libraries`` lists every registered optional library with whether it is
+    installed and whether this worker has loaded it yet.
+    """
 
     settings = get_settings()
     gs_available = shutil.which("gs") is not None
-    capabilities = {
+    return {
         "tesseract": shutil.which("tesseract") is not None,
         "gs": gs_available,
         "ghostscript": gs_available,
         "java": shutil.which("java") is not None,
-        "mineru_importable": False,
+        "mineru_importable": is_available("mineru"),
         "pdf_engine": settings.PDF_ENGINE,
+        "libraries": capability_report(),
     }
-    try:
-        importlib.import_module("mineru")
-    except ModuleNotFoundError:
-        pass
-    else:
-        capabilities["mineru_importable"] = True
-    return capabilities
+
+
+@system_router.get("/storage")
+async def get_storage(refresh: bool = False) -> dict[str, Any]:
+    """Report stored artifact bytes per stage, the retention policy and last sweep.
+
+    Figures come from the retention index; ``refresh=true`` rescans the disk first.
+    """
+
+    return await run_in_threadpool(storage_stats, refresh=refresh)
+
+
+@system_router.post("/storage/sweep")
+async def sweep_storage() -> dict[str, Any]:
+    """Apply the retention policy now and return the updated statistics."""
+
+    await run_in_threadpool(sweep)
+    return await run_in_threadpool(storage_stats)
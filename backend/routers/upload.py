@@ -5,21 +5,50 @@ import os
 import uuid
 from pathlib import Path
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile, status
-
-from ..models import ObjectsResponse, ParsedObject, UploadResponse
+from fastapi import APIRouter, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import get_settings
+from ..metrics import stage_timer
+from ..models import (
+    BatchUploadItem,
+    BatchUploadResponse,
+    ObjectsResponse,
+    ParsedObject,
+    UploadResponse,
+)
+from ..profiling import profiled
 from ..services.parsing import parse_document
-from ..store import read_jsonl, upload_objects_path, write_jsonl
+from ..services.upload_stream import max_upload_bytes, receive_upload
+from ..services.uploads import (
+    SUPPORTED_EXTENSIONS,
+    BatchSource,
+    find_existing_upload,
+    ingest_paths,
+    store_parsed_upload,
+)
+from ..store import construct_trusted, read_jsonl, upload_objects_path
 
 router = APIRouter(prefix="/api")
 
 
-SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".docx"}
+def _temp_dir() -> Path:
+    temp_dir = Path(os.getenv("TMPDIR", "/tmp"))
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    return temp_dir
 
 
 @router.post("/upload", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload(file: UploadFile = File(...)) -> UploadResponse:
-    """Upload a document, parse it immediately and persist the parsed objects."""
+async def upload(
+    file: UploadFile = File(...),
+    dedupe: bool = Query(True, description="Reuse parsed output of identical uploads"),
+) -> UploadResponse:
+    """Upload a document, parse it immediately and persist the parsed objects.
+
+    Identical content previously parsed by the same parser version is linked
+    instead of re-parsed: the existing ``upload_id`` (and with it any headers
+    and specs already extracted for it) is returned.
+    """
 
     filename = file.filename or "document"
     extension = Path(filename).suffix.lower()
@@ -29,19 +58,28 @@ async def upload(file: UploadFile = File(...)) -> UploadResponse:
             detail=f"Unsupported file type: {extension or 'unknown'}",
         )
 
-    temp_dir = Path(os.getenv("TMPDIR", "/tmp"))
-    temp_dir.mkdir(parents=True, exist_ok=True)
-    temp_path = temp_dir / f"upload_{uuid.uuid4().hex}{extension}"
+    temp_path = _temp_dir() / f"upload_{uuid.uuid4().hex}{extension}"
 
     try:
-        with temp_path.open("wb") as buffer:
-            while chunk := await file.read(1024 * 1024):
-                buffer.write(chunk)
+        received = await receive_upload(
+            file, temp_path, max_bytes=max_upload_bytes(get_settings())
+        )
+        sha256 = received.sha256
+
+        if dedupe:
+            existing = find_existing_upload(sha256)
+            if existing is not None:
+                return UploadResponse(
+                    upload_id=existing.artifact_id,
+                    object_count=existing.object_count,
+                    deduplicated=True,
+                )
 
-        parsed_objects = parse_document(temp_path)
         upload_id = uuid.uuid4().hex
-        jsonl_path = upload_objects_path(upload_id)
-        write_jsonl(jsonl_path, parsed_objects)
+        with stage_timer("parse", upload_id, extension=extension) as timing:
+            parsed_objects = parse_document(temp_path, sha256=sha256)
+            timing["object_count"] = len(parsed_objects)
+        store_parsed_upload(upload_id, sha256, parsed_objects)
         return UploadResponse(upload_id=upload_id, object_count=len(parsed_objects))
     finally:
         try:
@@ -51,24 +89,84 @@ async def upload(file: UploadFile = File(...)) -> UploadResponse:
             pass
 
 
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_batch(
+    files: list[UploadFile] = File(...),
+    dedupe: bool = Query(True, description="Reuse parsed output of identical uploads"),
+    workers: int | None = Query(None, ge=1, description="Maximum parallel parser processes"),
+) -> BatchUploadResponse:
+    """Upload many documents at once and parse them concurrently.
+
+    Each file is streamed to disk and parsed in a bounded process pool; the
+    response is a manifest with one entry (and status) per uploaded file.
+    """
+
+    settings = get_settings()
+    batch_id = uuid.uuid4().hex
+    temp_dir = _temp_dir()
+    sources: list[BatchSource] = []
+    rejected: dict[int, BatchUploadItem] = {}
+    try:
+        for position, file in enumerate(files):
+            filename = file.filename or "document"
+            extension = Path(filename).suffix.lower()
+            temp_path = temp_dir / f"upload_{batch_id}_{position:04d}{extension}"
+            try:
+                received = await receive_upload(
+                    file, temp_path, max_bytes=max_upload_bytes(settings)
+                )
+            except HTTPException as exc:
+                rejected[position] = BatchUploadItem(
+                    filename=filename, status="failed", error=str(exc.detail)
+                )
+                continue
+            finally:
+                await file.close()
+            sources.append(BatchSource(path=temp_path, filename=filename, sha256=received.sha256))
+
+        with stage_timer("batch_ingest", batch_id) as timing:
+            parsed = await run_in_threadpool(
+                profiled(ingest_paths), sources, max_workers=workers, dedupe=dedupe
+            )
+            timing["file_count"] = len(files)
+    finally:
+        for source in sources:
+            source.path.unlink(missing_ok=True)
+
+    parsed_iter = iter(parsed)
+    items = [
+        rejected[position] if position in rejected else next(parsed_iter)
+        for position in range(len(files))
+    ]
+    return BatchUploadResponse(
+        items=items,
+        processed=sum(1 for item in items if item.status == "processed"),
+        deduplicated=sum(1 for item in items if item.status == "deduplicated"),
+        failed=sum(1 for item in items if item.status == "failed"),
+    )
+
+
 @router.get("/objects", response_model=ObjectsResponse)
 async def get_objects(
     upload_id: str = Query(...),
     page: int = Query(1, ge=1),
     page_size: int = Query(200, ge=1, le=2000),
-) -> ObjectsResponse:
-    """Return paginated parsed objects for a previous upload."""
+) -> Response:
+    """Return paginated parsed objects for a previous upload.
+
+    Stored objects were validated when the upload was persisted, so only the
+    requested page is rebuilt (without re-validation) and serialized
+    straight to JSON bytes.
+    """
 
     path = upload_objects_path(upload_id)
     if not path.exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
     raw_objects = read_jsonl(path)
-    objects = [ParsedObject.model_validate(obj) for obj in raw_objects]
 
-    total = len(objects)
+    total = len(raw_objects)
     start = (page - 1) * page_size
     end = start + page_size
-    if start >= total:
-        return ObjectsResponse(items=[], total=total)
-
-    return ObjectsResponse(items=objects[start:end], total=total)
+    items = construct_trusted(ParsedObject, raw_objects[start:end])
+    body = ObjectsResponse.model_construct(items=items, total=total).model_dump_json()
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,133 @@
+"""Local spec-candidate scanner scoring lines for units, tolerances and standards."""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Sequence
+
+__all__ = [
+    "CANDIDATE_THRESHOLD",
+    "Candidate",
+    "has_candidates",
+    "scan_lines",
+    "score_lines",
+    "top_candidates",
+]
+
+CANDIDATE_THRESHOLD = 1.0
+"""Minimum line score for a line to count as a spec candidate."""
+
+_NUMBER = r"\d+(?:[.,]\d+)?"
+_UNITS = (
+    r"mm|cm|km|µm|um|m|inch(?:es)?|in\.|ft|"
+    r"N(?:[·.\-]?m)?|kN|lbf|ft[·.\-]?lbf?|"
+    r"Pa|kPa|MPa|GPa|bar[ag]?|psi[ag]?|"
+    r"°\s?[CF]|deg\s?[CF]|K|"
+    r"kg|g|lbs?|t|"
+    r"m[23³²]?/[hs]|l/min|L/min|gpm|cfm|"
+    r"V|kV|A|mA|W|kW|MW|VA|kVA|Hz|kHz|rpm|dB(?:A|\(A\))?|"
+    r"ms|s|min|h|"
+    r"%"
+)
+_STANDARD_BODIES = r"ASME|ASTM|ANSI|NFPA|IEEE|NACE|NEMA|AISC|DIN|ISO|IEC|AWS|SAE|MSS|JIS"
+_DESIGNATED_BODIES = r"API|EN|BS|UL|CSA"
+_DESIGNATOR = r"[\s-]?(?:[A-Z]{1,3}\s?)?\d[\w.\-/:]*"
+
+_SCANNER = re.compile(
+    "|".join(
+        (
+            rf"(?P<tolerance>(?:±|\+/-|\+\s?/\s?-)\s?{_NUMBER})",
+            rf"(?P<unit>(?<![\w.]){_NUMBER}\s?(?:{_UNITS})(?![A-Za-z]))",
+            rf"(?P<standard>\b(?:{_STANDARD_BODIES})\b(?:{_DESIGNATOR})?)",
+            rf"(?P<designated>\b(?:{_DESIGNATED_BODIES}){_DESIGNATOR})",
+            r"(?P<modal>\b(?i:shall|must|required|is to be|are to be)\b)",
+            r"(?P<limit>\b(?i:max(?:imum)?|min(?:imum)?|not (?:to )?exceed|at least|no (?:more|less) than)\b)",
+            r"(?P<bullet>^[ \t]*(?:[-•*]|\d+(?:\.\d+)*[.)])[ \t]+)",
+        )
+    ),
+    re.MULTILINE,
+)
+"""All features in one alternation so a document is scanned in a single pass."""
+
+_WEIGHTS = {
+    "tolerance": 3.0,
+    "unit": 2.0,
+    "standard": 2.0,
+    "designated": 2.0,
+    "modal": 1.5,
+    "limit": 1.0,
+    "bullet": 0.5,
+}
+_BULLET_PREFIX = re.compile(r"^\s*(?:[-•*]\s+|\d+(?:\.\d+)*[.)]\s*)")
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """A scored line and the feature kinds found on it."""
+
+    line_index: int
+    text: str
+    score: float
+    features: frozenset[str]
+
+
+def _scan(lines: Sequence[str]) -> tuple[list[float], list[set[str]]]:
+    scores = [0.0] * len(lines)
+    features: list[set[str]] = [set() for _ in lines]
+    if not lines:
+        return scores, features
+    # Line start offsets in the joined text map every match back to its line.
+    starts = [0, *accumulate(len(line) + 1 for line in lines[:-1])]
+    for match in _SCANNER.finditer("\n".join(lines)):
+        kind = match.lastgroup
+        if kind is None:
+            continue
+        index = bisect_right(starts, match.start()) - 1
+        if kind not in features[index]:
+            features[index].add(kind)
+            scores[index] += _WEIGHTS[kind]
+        else:
+            # Repeated hits of one kind add little beyond the first.
+            scores[index] += _WEIGHTS[kind] * 0.25
+    return scores, features
+
+
+def score_lines(lines: Sequence[str]) -> list[float]:
+    """Return a spec-likelihood score per line; ``0`` means no feature at all."""
+
+    return _scan(lines)[0]
+
+
+def scan_lines(lines: Sequence[str], *, threshold: float = CANDIDATE_THRESHOLD) -> list[Candidate]:
+    """Return the lines scoring at least ``threshold``, in document order."""
+
+    scores, features = _scan(lines)
+    return [
+        Candidate(index, lines[index], scores[index], frozenset(features[index]))
+        for index in range(len(lines))
+        if scores[index] >= threshold
+    ]
+
+
+def has_candidates(text: str, *, threshold: float = CANDIDATE_THRESHOLD) -> bool:
+    """Return whether any line of ``text`` looks like a specification."""
+
+    return any(score >= threshold for score in score_lines(text.splitlines()))
+
+
+def top_candidates(text: str, *, limit: int = 5) -> list[str]:
+    """Return the ``limit`` best-scoring candidate lines of ``text``, in document order.
+
+    Leading bullets and list numbers are removed from the returned lines.
+    """
+
+    candidates = scan_lines(text.splitlines())
+    best = sorted(candidates, key=lambda item: (-item.score, item.line_index))[:limit]
+    lines: list[str] = []
+    for candidate in sorted(best, key=lambda item: item.line_index):
+        cleaned = _BULLET_PREFIX.sub("", candidate.text.strip()).rstrip(".;:,").strip()
+        if cleaned:
+            lines.append(cleaned)
+    return lines
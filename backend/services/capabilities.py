@@ -0,0 +1,117 @@
+"""Registry of optional libraries imported on first use instead of at startup."""
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+import threading
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+
+__all__ = [
+    "CAPABILITIES",
+    "Capability",
+    "CapabilityUnavailableError",
+    "capability_report",
+    "is_available",
+    "optional_import",
+    "require",
+]
+
+
+@dataclass(frozen=True)
+class Capability:
+    """An optional dependency and what it enables."""
+
+    module: str
+    purpose: str
+
+
+CAPABILITIES: dict[str, Capability] = {
+    "pdfplumber": Capability("pdfplumber", "PDF text extraction"),
+    "pymupdf": Capability("fitz", "PDF image blocks"),
+    "camelot": Capability("camelot", "PDF table extraction"),
+    "pikepdf": Capability("pikepdf", "PDF document metadata"),
+    "docx": Capability("docx", "DOCX parsing"),
+    "mineru": Capability("mineru", "MinerU PDF parsing"),
+    "magic_pdf": Capability("magic_pdf", "Legacy MinerU PDF parsing"),
+    "pyarrow": Capability("pyarrow", "Parquet/Arrow exports"),
+    "tiktoken": Capability("tiktoken", "Exact OpenAI token counts"),
+    "orjson": Capability("orjson", "Fast JSON artifact and API encoding"),
+    "msgspec": Capability("msgspec", "Fast JSON artifact encoding"),
+    "psutil": Capability("psutil", "Peak memory metrics without the resource module"),
+}
+"""Known optional libraries by capability name."""
+
+
+class CapabilityUnavailableError(RuntimeError):
+    """Raised by :func:`require` when an optional library cannot be imported."""
+
+
+_lock = threading.Lock()
+_loaded: dict[str, ModuleType | None] = {}
+_errors: dict[str, str] = {}
+
+
+def _module_name(name: str) -> str:
+    capability = CAPABILITIES.get(name)
+    return capability.module if capability else name
+
+
+def optional_import(name: str) -> ModuleType | None:
+    """Import the library behind capability ``name`` once, or return ``None``.
+
+    The outcome is remembered, so a missing or broken library costs one
+    import attempt per process. Unknown names are treated as module names.
+    """
+
+    if name in _loaded:
+        return _loaded[name]
+    with _lock:
+        if name not in _loaded:
+            try:
+                _loaded[name] = importlib.import_module(_module_name(name))
+            except Exception as exc:  # pragma: no cover - depends on the environment
+                # Broken installs raise more than ImportError (e.g. OSError from
+                # missing shared libraries); treat them all as unavailable.
+                _loaded[name] = None
+                _errors[name] = f"{type(exc).__name__}: {exc}"
+    return _loaded[name]
+
+
+def require(name: str) -> ModuleType:
+    """Return the library behind ``name`` or raise :class:`CapabilityUnavailableError`."""
+
+    module = optional_import(name)
+    if module is None:
+        detail = _errors.get(name, "not installed")
+        raise CapabilityUnavailableError(f"{_module_name(name)} is unavailable ({detail}).")
+    return module
+
+
+def is_available(name: str) -> bool:
+    """Return whether ``name`` can be imported, without importing it."""
+
+    if name in _loaded:
+        return _loaded[name] is not None
+    try:
+        return importlib.util.find_spec(_module_name(name)) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def capability_report() -> dict[str, dict[str, Any]]:
+    """Describe every registered capability without importing anything new."""
+
+    report: dict[str, dict[str, Any]] = {}
+    for name, capability in CAPABILITIES.items():
+        entry: dict[str, Any] = {
+            "purpose": capability.purpose,
+            "available": is_available(name),
+            "loaded": capability.module in sys.modules,
+        }
+        if name in _errors:
+            entry["error"] = _errors[name]
+        report[name] = entry
+    return report
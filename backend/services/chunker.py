@@ -1,46 +1,55 @@
 """Granular chunking helpers for section trees."""
 from __future__ import annotations
 
-import json
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable
 
 from ..config import Settings, get_settings
-from ..models import ParsedObject, SectionNode
-
-__all__ = ["compute_section_spans", "load_persisted_chunks", "run_chunking"]
-
-
-def _sorted_objects(objects: list[ParsedObject]) -> list[ParsedObject]:
+from ..metrics import stage_timer
+from ..models import DocumentObject, SectionNode
+from ..store import construct_trusted, read_json
+from .manifest import write_artifact_json
+
+__all__ = [
+    "ChunkUpdate",
+    "compute_section_spans",
+    "load_parsed_objects",
+    "load_persisted_chunks",
+    "run_chunking",
+    "run_incremental_chunking",
+    "update_section_spans",
+]
+
+
+def _sorted_objects(objects: list[DocumentObject]) -> list[DocumentObject]:
     return sorted(
         objects,
         key=lambda obj: ((obj.page_index or 0), obj.order_index),
     )
 
 
-def _load_parsed_objects(file_id: str, settings: Settings) -> list[ParsedObject]:
+def load_parsed_objects(file_id: str, settings: Settings) -> list[DocumentObject]:
+    """Load the persisted parsed objects of ``file_id``."""
+
     objects_path = Path(settings.ARTIFACTS_DIR) / file_id / "parsed" / "objects.json"
     if not objects_path.exists():
         raise FileNotFoundError("parsed_objects_missing")
-    with objects_path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
-    return [ParsedObject.model_validate(item) for item in payload]
+    payload = read_json(objects_path)
+    return construct_trusted(DocumentObject, payload)
 
 
 def _load_sections(file_id: str, settings: Settings) -> SectionNode:
     sections_path = Path(settings.ARTIFACTS_DIR) / file_id / "headers" / "sections.json"
     if not sections_path.exists():
         raise FileNotFoundError("sections_missing")
-    with sections_path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    payload = read_json(sections_path)
     return SectionNode.model_validate(payload)
 
 
 def _persist_chunks(file_id: str, mapping: dict[str, list[str]], settings: Settings) -> None:
-    base = Path(settings.ARTIFACTS_DIR) / file_id / "chunks"
-    base.mkdir(parents=True, exist_ok=True)
-    target = base / "chunks.json"
-    with target.open("w", encoding="utf-8") as handle:
-        json.dump(mapping, handle, indent=2)
+    base = Path(settings.ARTIFACTS_DIR) / file_id
+    write_artifact_json(base, "chunks/chunks.json", mapping)
 
 
 def load_persisted_chunks(file_id: str, settings: Settings | None = None) -> dict[str, list[str]]:
@@ -50,8 +59,7 @@ def load_persisted_chunks(file_id: str, settings: Settings | None = None) -> dic
     target = Path(settings.ARTIFACTS_DIR) / file_id / "chunks" / "chunks.json"
     if not target.exists():
         raise FileNotFoundError("chunks_missing")
-    with target.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    data = read_json(target)
     return {key: list(value) for key, value in data.items()}
 
 
@@ -59,24 +67,17 @@ def run_chunking(file_id: str, settings: Settings | None = None) -> dict[str, li
     """Compute and persist section chunks for the provided file identifier."""
 
     settings = settings or get_settings()
-    objects = _load_parsed_objects(file_id, settings)
+    objects = load_parsed_objects(file_id, settings)
     sections = _load_sections(file_id, settings)
-    mapping = compute_section_spans(sections, objects)
+    with stage_timer("chunking", file_id) as timing:
+        mapping = compute_section_spans(sections, objects)
+        timing["object_count"] = len(objects)
+        timing["section_count"] = len(mapping)
     _persist_chunks(file_id, mapping, settings)
     return mapping
 
 
-def compute_section_spans(root: SectionNode, objects: list[ParsedObject]) -> dict[str, list[str]]:
-    """Return ordered object identifiers for every section in the tree.
-
-    The function enforces non-overlapping assignments across leaf sections using
-    the deterministic tie-breaker described in the phase plan. Parent sections
-    receive the ordered concatenation of their descendant leaf chunks.
-    """
-
-    ordered_objects = _sorted_objects(list(objects))
-    object_index: dict[str, int] = {obj.object_id: idx for idx, obj in enumerate(ordered_objects)}
-
+def _collect_nodes(root: SectionNode) -> tuple[list[SectionNode], list[SectionNode]]:
     leaf_nodes: list[SectionNode] = []
     all_nodes: list[SectionNode] = []
 
@@ -88,9 +89,16 @@ def compute_section_spans(root: SectionNode, objects: list[ParsedObject]) -> dic
             _collect(child)
 
     _collect(root)
+    return leaf_nodes, all_nodes
+
 
+def _leaf_ranges(
+    leaf_nodes: Iterable[SectionNode], object_index: dict[str, int]
+) -> dict[str, tuple[int, int]]:
     leaf_ranges: dict[str, tuple[int, int]] = {}
     for leaf in leaf_nodes:
+        if leaf.span is None:
+            continue
         start_id = leaf.span.start_object
         end_id = leaf.span.end_object
         if start_id is None or end_id is None:
@@ -101,10 +109,20 @@ def compute_section_spans(root: SectionNode, objects: list[ParsedObject]) -> dic
             continue
         low, high = sorted((start_index, end_index))
         leaf_ranges[leaf.section_id] = (low, high)
+    return leaf_ranges
 
-    leaf_chunks: dict[str, list[str]] = {leaf.section_id: [] for leaf in leaf_nodes}
 
-    for index, obj in enumerate(ordered_objects):
+def _assign_objects(
+    ordered_objects: list[DocumentObject],
+    positions: Iterable[int],
+    leaf_nodes: list[SectionNode],
+    leaf_ranges: dict[str, tuple[int, int]],
+) -> dict[str, list[str]]:
+    """Assign the objects at ``positions`` to their winning leaf."""
+
+    leaf_chunks: dict[str, list[str]] = {leaf.section_id: [] for leaf in leaf_nodes}
+    for index in positions:
+        obj = ordered_objects[index]
         candidates: list[tuple[int, int, str, SectionNode]] = []
         for leaf in leaf_nodes:
             span = leaf_ranges.get(leaf.section_id)
@@ -119,7 +137,12 @@ def compute_section_spans(root: SectionNode, objects: list[ParsedObject]) -> dic
             continue
         _, _, _, chosen_leaf = min(candidates, key=lambda item: (item[0], item[1], item[2]))
         leaf_chunks[chosen_leaf.section_id].append(obj.object_id)
+    return leaf_chunks
+
 
+def _aggregate_chunks(
+    root: SectionNode, all_nodes: list[SectionNode], leaf_chunks: dict[str, list[str]]
+) -> dict[str, list[str]]:
     result: dict[str, list[str]] = {}
 
     def _build(node: SectionNode) -> list[str]:
@@ -140,3 +163,141 @@ def compute_section_spans(root: SectionNode, objects: list[ParsedObject]) -> dic
         result.setdefault(node.section_id, [])
 
     return result
+
+
+def compute_section_spans(root: SectionNode, objects: list[DocumentObject]) -> dict[str, list[str]]:
+    """Return ordered object identifiers for every section in the tree.
+
+    The function enforces non-overlapping assignments across leaf sections using
+    the deterministic tie-breaker described in the phase plan. Parent sections
+    receive the ordered concatenation of their descendant leaf chunks.
+    """
+
+    ordered_objects = _sorted_objects(list(objects))
+    object_index: dict[str, int] = {obj.object_id: idx for idx, obj in enumerate(ordered_objects)}
+    leaf_nodes, all_nodes = _collect_nodes(root)
+    leaf_ranges = _leaf_ranges(leaf_nodes, object_index)
+    leaf_chunks = _assign_objects(
+        ordered_objects, range(len(ordered_objects)), leaf_nodes, leaf_ranges
+    )
+    return _aggregate_chunks(root, all_nodes, leaf_chunks)
+
+
+@dataclass(frozen=True)
+class ChunkUpdate:
+    """Chunks for an edited tree and the leaves whose object list changed."""
+
+    mapping: dict[str, list[str]]
+    changed_sections: frozenset[str]
+    removed_sections: frozenset[str]
+
+
+def update_section_spans(
+    previous_root: SectionNode,
+    root: SectionNode,
+    previous_mapping: dict[str, list[str]],
+    objects: list[DocumentObject],
+) -> ChunkUpdate:
+    """Re-chunk ``root`` reusing ``previous_mapping`` computed for ``previous_root``.
+
+    A leaf is dirty when it was added, removed, or its span or depth changed.
+    Only objects inside the old or new range of a dirty leaf can change owner,
+    so just those positions are re-assigned; every other object keeps its
+    previous leaf. The result equals ``compute_section_spans(root, objects)``.
+    """
+
+    ordered_objects = _sorted_objects(list(objects))
+    object_index: dict[str, int] = {obj.object_id: idx for idx, obj in enumerate(ordered_objects)}
+    previous_leaves, _ = _collect_nodes(previous_root)
+    leaf_nodes, all_nodes = _collect_nodes(root)
+    previous_by_id = {leaf.section_id: leaf for leaf in previous_leaves}
+    current_ids = {leaf.section_id for leaf in leaf_nodes}
+    removed = frozenset(set(previous_by_id) - current_ids)
+
+    if any(section_id not in previous_mapping for section_id in previous_by_id):
+        # The stored chunks do not belong to the previous tree; start over.
+        mapping = compute_section_spans(root, objects)
+        return ChunkUpdate(mapping, frozenset(current_ids), removed)
+
+    previous_ranges = _leaf_ranges(previous_leaves, object_index)
+    leaf_ranges = _leaf_ranges(leaf_nodes, object_index)
+    dirty: set[str] = set(removed)
+    for leaf in leaf_nodes:
+        before = previous_by_id.get(leaf.section_id)
+        if (
+            before is None
+            or before.depth != leaf.depth
+            or previous_ranges.get(leaf.section_id) != leaf_ranges.get(leaf.section_id)
+        ):
+            dirty.add(leaf.section_id)
+
+    affected: set[int] = set()
+    for section_id in dirty:
+        for span in (previous_ranges.get(section_id), leaf_ranges.get(section_id)):
+            if span is not None:
+                affected.update(range(span[0], span[1] + 1))
+
+    leaf_chunks: dict[str, list[str]] = {}
+    for leaf in leaf_nodes:
+        if leaf.section_id in dirty:
+            leaf_chunks[leaf.section_id] = []
+            continue
+        leaf_chunks[leaf.section_id] = [
+            object_id
+            for object_id in previous_mapping[leaf.section_id]
+            if object_id in object_index and object_index[object_id] not in affected
+        ]
+
+    if affected:
+        low, high = min(affected), max(affected)
+        overlapping = [
+            leaf
+            for leaf in leaf_nodes
+            if leaf.section_id in leaf_ranges
+            and leaf_ranges[leaf.section_id][0] <= high
+            and leaf_ranges[leaf.section_id][1] >= low
+        ]
+        reassigned = _assign_objects(ordered_objects, sorted(affected), overlapping, leaf_ranges)
+        for section_id, object_ids in reassigned.items():
+            if object_ids:
+                merged = leaf_chunks[section_id] + object_ids
+                leaf_chunks[section_id] = sorted(merged, key=object_index.__getitem__)
+
+    mapping = _aggregate_chunks(root, all_nodes, leaf_chunks)
+    changed = frozenset(
+        leaf.section_id
+        for leaf in leaf_nodes
+        if mapping[leaf.section_id] != previous_mapping.get(leaf.section_id)
+    )
+    return ChunkUpdate(mapping, changed, removed)
+
+
+def run_incremental_chunking(
+    file_id: str,
+    previous_root: SectionNode | None,
+    root: SectionNode,
+    settings: Settings | None = None,
+) -> ChunkUpdate:
+    """Re-chunk an edited section tree, reusing the persisted chunks when possible.
+
+    Falls back to a full pass (reporting every leaf as changed) when there is
+    no previous tree or no persisted chunk map.
+    """
+
+    settings = settings or get_settings()
+    objects = load_parsed_objects(file_id, settings)
+    try:
+        previous_mapping = load_persisted_chunks(file_id, settings) if previous_root else None
+    except FileNotFoundError:
+        previous_mapping = None
+    with stage_timer("chunking", file_id, mode="incremental") as timing:
+        if previous_root is None or previous_mapping is None:
+            mapping = compute_section_spans(root, objects)
+            leaf_ids = frozenset(leaf.section_id for leaf in _collect_nodes(root)[0])
+            update = ChunkUpdate(mapping, leaf_ids, frozenset())
+        else:
+            update = update_section_spans(previous_root, root, previous_mapping, objects)
+        timing["object_count"] = len(objects)
+        timing["changed_sections"] = len(update.changed_sections)
+    _persist_chunks(file_id, update.mapping, settings)
+    return update
@@ -0,0 +1,135 @@
+"""Columnar (Parquet / Arrow IPC) encoding of specs and parsed objects."""
+from __future__ import annotations
+
+import importlib
+import io
+import json
+from typing import Any, Iterable
+
+from .capabilities import optional_import
+
+__all__ = [
+    "COLUMNAR_FORMATS",
+    "ColumnarUnavailableError",
+    "encode_table",
+    "objects_table",
+    "specs_table",
+]
+
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+"""Supported formats mapped to ``(media type, file extension)``."""
+
+
+class ColumnarUnavailableError(RuntimeError):
+    """Raised when pyarrow is not installed."""
+
+
+def _pyarrow() -> Any:
+    module = optional_import("pyarrow")
+    if module is None:
+        raise ColumnarUnavailableError(
+            "pyarrow is not installed; install requirements-optional.txt for columnar exports."
+        )
+    return module
+
+
+def _dictionary(pa: Any, values: list[Any]) -> Any:
+    return pa.array(values, type=pa.string()).dictionary_encode()
+
+
+def specs_table(specs: Iterable[dict[str, Any]]) -> Any:
+    """Build an Arrow table of specs with dictionary-encoded repeated columns."""
+
+    pa = _pyarrow()
+    columns: dict[str, list[Any]] = {
+        "spec_id": [],
+        "file_id": [],
+        "section_id": [],
+        "section_number": [],
+        "section_title": [],
+        "spec_text": [],
+        "confidence": [],
+        "source_object_ids": [],
+    }
+    for item in specs:
+        for name, values in columns.items():
+            values.append(item.get(name))
+    source_ids = pa.array(columns["source_object_ids"], type=pa.list_(pa.string()))
+    # Object identifiers repeat across every spec of a section; encode the
+    # flattened values once and rebuild the list column around them.
+    source_ids = pa.ListArray.from_arrays(
+        source_ids.offsets,
+        source_ids.flatten().dictionary_encode(),
+        mask=source_ids.is_null(),
+    )
+    return pa.table(
+        {
+            "spec_id": pa.array(columns["spec_id"], type=pa.string()),
+            "file_id": _dictionary(pa, columns["file_id"]),
+            "section_id": _dictionary(pa, columns["section_id"]),
+            "section_number": _dictionary(pa, columns["section_number"]),
+            "section_title": _dictionary(pa, columns["section_title"]),
+            "spec_text": pa.array(columns["spec_text"], type=pa.string()),
+            "confidence": pa.array(columns["confidence"], type=pa.float64()),
+            "source_object_ids": source_ids,
+        }
+    )
+
+
+def objects_table(objects: Iterable[dict[str, Any]]) -> Any:
+    """Build an Arrow table of parsed objects; metadata is kept as JSON text."""
+
+    pa = _pyarrow()
+    columns: dict[str, list[Any]] = {
+        "object_id": [],
+        "file_id": [],
+        "kind": [],
+        "text": [],
+        "page_index": [],
+        "bbox": [],
+        "order_index": [],
+        "metadata": [],
+    }
+    for item in objects:
+        for name in ("object_id", "file_id", "kind", "text", "page_index", "bbox", "order_index"):
+            columns[name].append(item.get(name))
+        metadata = item.get("metadata")
+        columns["metadata"].append(
+            None if metadata is None else json.dumps(metadata, ensure_ascii=False, separators=(",", ":"))
+        )
+    return pa.table(
+        {
+            "object_id": pa.array(columns["object_id"], type=pa.string()),
+            "file_id": _dictionary(pa, columns["file_id"]),
+            "kind": _dictionary(pa, columns["kind"]),
+            "text": pa.array(columns["text"], type=pa.string()),
+            "page_index": pa.array(columns["page_index"], type=pa.int32()),
+            "bbox": pa.array(columns["bbox"], type=pa.list_(pa.float64())),
+            "order_index": pa.array(columns["order_index"], type=pa.int64()),
+            "metadata": _dictionary(pa, columns["metadata"]),
+        }
+    )
+
+
+def encode_table(tables: list[Any], fmt: str) -> bytes:
+    """Concatenate ``tables`` and serialize them as Parquet or an Arrow stream."""
+
+    pa = _pyarrow()
+    if len(tables) == 1:
+        table = tables[0]
+    else:
+        table = pa.concat_tables(tables).unify_dictionaries().combine_chunks()
+    sink = io.BytesIO()
+    if fmt == "parquet":
+        parquet = importlib.import_module("pyarrow.parquet")
+        parquet.write_table(table, sink, compression="zstd")
+    elif fmt == "arrow":
+        ipc = importlib.import_module("pyarrow.ipc")
+        with ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    return sink.getvalue()
@@ -0,0 +1,77 @@
+"""Content-addressed index of parsed artifacts used to deduplicate uploads."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlmodel import select
+
+from ..database import session_scope
+from ..models_db import ParsedArtifact
+
+__all__ = ["IndexedArtifact", "find_parsed_artifact", "register_parsed_artifact"]
+
+
+@dataclass(frozen=True)
+class IndexedArtifact:
+    """Previously parsed output matching an upload's content hash."""
+
+    artifact_id: str
+    object_count: int
+
+
+def find_parsed_artifact(
+    sha256: str,
+    *,
+    scope: str,
+    engine: str,
+    parser_version: str,
+    exists: Callable[[str], bool],
+) -> IndexedArtifact | None:
+    """Return the newest indexed artifact whose parsed output still exists.
+
+    Entries whose artifacts were removed from disk are pruned on the way.
+    """
+
+    with session_scope() as session:
+        statement = (
+            select(ParsedArtifact)
+            .where(
+                ParsedArtifact.sha256 == sha256,
+                ParsedArtifact.scope == scope,
+                ParsedArtifact.engine == engine,
+                ParsedArtifact.parser_version == parser_version,
+            )
+            .order_by(ParsedArtifact.created_at.desc())
+        )
+        for record in session.exec(statement):
+            if exists(record.artifact_id):
+                return IndexedArtifact(
+                    artifact_id=record.artifact_id, object_count=record.object_count
+                )
+            session.delete(record)
+    return None
+
+
+def register_parsed_artifact(
+    sha256: str,
+    *,
+    scope: str,
+    engine: str,
+    parser_version: str,
+    artifact_id: str,
+    object_count: int,
+) -> None:
+    """Record freshly parsed output under its content hash."""
+
+    with session_scope() as session:
+        session.add(
+            ParsedArtifact(
+                sha256=sha256,
+                scope=scope,
+                engine=engine,
+                parser_version=parser_version,
+                artifact_id=artifact_id,
+                object_count=object_count,
+            )
+        )
@@ -0,0 +1,175 @@
+"""Near-duplicate detection for extracted specs using shingling and MinHash/LSH."""
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+from typing import Any, Iterable, Sequence, TypeVar
+
+__all__ = [
+    "DEFAULT_THRESHOLD",
+    "MinHasher",
+    "collapse_spec_records",
+    "collapse_specs",
+    "near_duplicate_groups",
+    "shingles",
+]
+
+DEFAULT_THRESHOLD = 0.8
+"""Minimum shingle Jaccard similarity for two specs to count as duplicates."""
+
+_SHINGLE_SIZE = 3
+_BANDS = 8
+_ROWS = 4
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_WORD_PATTERN = re.compile(r"[^\W_]+(?:[.,/][^\W_]+)*")
+
+_T = TypeVar("_T")
+
+
+def _hash(value: str) -> int:
+    # Stable across processes, unlike ``hash()``, so exports stay deterministic.
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def shingles(text: str, size: int = _SHINGLE_SIZE) -> frozenset[int]:
+    """Return hashed word ``size``-grams of the normalized ``text``.
+
+    Numbers stay whole tokens (``1.5``, ``3/4``), so specs differing only in
+    a value share no shingle around it.
+    """
+
+    words = _WORD_PATTERN.findall(text.casefold())
+    if not words:
+        return frozenset()
+    if len(words) <= size:
+        return frozenset({_hash(" ".join(words))})
+    return frozenset(_hash(" ".join(words[i : i + size])) for i in range(len(words) - size + 1))
+
+
+class MinHasher:
+    """Compute MinHash signatures with ``num_perm`` universal hash functions."""
+
+    def __init__(self, num_perm: int = _BANDS * _ROWS, *, seed: int = 1) -> None:
+        generator = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (generator.randrange(1, _PRIME), generator.randrange(0, _PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Iterable[int]) -> tuple[int, ...]:
+        values = [feature & _MAX_HASH for feature in features]
+        if not values:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min((a * value + b) % _PRIME for value in values) & _MAX_HASH
+            for a, b in self._params
+        )
+
+
+_HASHER = MinHasher()
+
+
+def _find(parents: list[int], index: int) -> int:
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+    return index
+
+
+def near_duplicate_groups(
+    texts: Sequence[str], *, threshold: float = DEFAULT_THRESHOLD
+) -> list[list[int]]:
+    """Cluster the indices of ``texts`` whose shingle sets are near-identical.
+
+    Signatures are banded into LSH buckets so only texts sharing a bucket are
+    compared, keeping the pass roughly linear; candidates are confirmed on
+    their exact Jaccard similarity. Groups and their members keep input order.
+    """
+
+    features = [shingles(text) for text in texts]
+    buckets: dict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    for index, feature in enumerate(features):
+        if not feature:
+            continue
+        signature = _HASHER.signature(feature)
+        for band in range(_BANDS):
+            buckets[(band, signature[band * _ROWS : (band + 1) * _ROWS])].append(index)
+
+    parents = list(range(len(texts)))
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for position, other in enumerate(members[1:], start=1):
+            for earlier in members[:position]:
+                root_earlier, root_other = _find(parents, earlier), _find(parents, other)
+                if root_earlier == root_other:
+                    break
+                left, right = features[earlier], features[other]
+                if len(left & right) / len(left | right) >= threshold:
+                    parents[max(root_earlier, root_other)] = min(root_earlier, root_other)
+                    break
+
+    groups: dict[int, list[int]] = {}
+    for index in range(len(texts)):
+        groups.setdefault(_find(parents, index), []).append(index)
+    return list(groups.values())
+
+
+def _merge_ids(groups: Iterable[Iterable[str] | None]) -> list[str]:
+    merged: dict[str, None] = {}
+    for ids in groups:
+        merged.update(dict.fromkeys(ids or ()))
+    return list(merged)
+
+
+def _max_confidence(values: Iterable[float | None]) -> float | None:
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def collapse_specs(specs: Sequence[_T], *, threshold: float = DEFAULT_THRESHOLD) -> list[_T]:
+    """Keep the first spec of every near-duplicate group.
+
+    The kept spec takes the union of the group's ``source_object_ids`` and its
+    highest confidence, so provenance survives the collapse.
+    """
+
+    groups = near_duplicate_groups([spec.spec_text for spec in specs], threshold=threshold)
+    collapsed: list[_T] = []
+    for group in groups:
+        keeper = specs[group[0]]
+        if len(group) > 1:
+            members = [specs[index] for index in group]
+            keeper = keeper.model_copy(
+                update={
+                    "source_object_ids": _merge_ids(item.source_object_ids for item in members),
+                    "confidence": _max_confidence(item.confidence for item in members),
+                }
+            )
+        collapsed.append(keeper)
+    return collapsed
+
+
+def collapse_spec_records(
+    records: Sequence[dict[str, Any]], *, threshold: float = DEFAULT_THRESHOLD
+) -> list[dict[str, Any]]:
+    """Dictionary counterpart of :func:`collapse_specs` for persisted specs."""
+
+    groups = near_duplicate_groups(
+        [record.get("spec_text") or "" for record in records], threshold=threshold
+    )
+    collapsed: list[dict[str, Any]] = []
+    for group in groups:
+        keeper = records[group[0]]
+        if len(group) > 1:
+            members = [records[index] for index in group]
+            keeper = {
+                **keeper,
+                "source_object_ids": _merge_ids(item.get("source_object_ids") for item in members),
+                "confidence": _max_confidence(item.get("confidence") for item in members),
+            }
+        collapsed.append(keeper)
+    return collapsed
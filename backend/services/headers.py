@@ -1,23 +1,35 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterator, Optional, Sequence
+from typing import Any, Iterator, Optional, Sequence
 
 import httpx
 
 from ..constants import MAX_TOKENS_LIMIT
 
 from ..config import Settings, get_settings
-from ..models import ParsedObject, SectionNode, SectionSpan
-from .llm_client import LLMAdapter
-
-__all__ = ["build_headers_prompt", "parse_nested_list_to_tree"]
+from ..metrics import record_llm_call, stage_timer
+from ..models import DocumentObject, SectionNode, SectionSpan
+from ..profiling import profiled
+from ..store import construct_trusted, read_json
+from .llm_client import LLMAdapter, build_async_adapter
+from .manifest import write_artifact_json
+from .tokens import get_tokenizer, prompt_budget
+
+__all__ = [
+    "arun_header_discovery",
+    "build_headers_prompt",
+    "load_persisted_headers",
+    "parse_nested_list_to_tree",
+    "save_sections",
+    "select_adapter",
+]
 
 _FALLBACK_NESTED_LIST = """1. Introduction\n  1.1 Background\n2. Methods\n3. Results"""
-_MAX_PROMPT_CHARACTERS = 4000
 _INDENT_WIDTH = 2
 _BULLET_PREFIXES = ("- ", "* ", "+ ", "• ", "– ", "— ")
 _ENUM_RE = re.compile(r"^(?:[0-9]+|[A-Za-z]+)(?:\.[0-9A-Za-z]+)*$")
@@ -31,14 +43,30 @@ class _LineItem:
     title: str
 
 
-def build_headers_prompt(objects: list[ParsedObject]) -> str:
-    """Create a concise prompt asking the LLM to list document headers."""
+def build_headers_prompt(
+    objects: list[DocumentObject],
+    *,
+    model: str | None = None,
+    params: dict[str, Any] | None = None,
+) -> str:
+    """Create a prompt asking the LLM to list document headers.
+
+    Document lines are included in order until the prompt budget of
+    ``model`` (its context window minus the completion reservation) is full.
+    """
+
+    intro = (
+        "You are helping to outline a technical document. "
+        "Review the provided excerpts and identify its headers.\n\n"
+        "Document excerpts:\n"
+    )
+    outro = "\n\nPlease show a simple nested list of all headers and subheaders for this document."
+    tokenizer = get_tokenizer(model)
+    budget = prompt_budget(model, template=intro + outro, params=params)
 
     text_fragments: list[str] = []
-    current_length = 0
+    used = 0
     for obj in objects:
-        if current_length >= _MAX_PROMPT_CHARACTERS:
-            break
         content = (obj.text or "").strip()
         if not content:
             continue
@@ -46,19 +74,13 @@ def build_headers_prompt(objects: list[ParsedObject]) -> str:
             stripped = line.strip()
             if not stripped:
                 continue
+            cost = tokenizer.count(stripped) + 1
+            if used + cost > budget:
+                return intro + "\n".join(text_fragments) + outro
             text_fragments.append(stripped)
-            current_length += len(stripped) + 1
-            if current_length >= _MAX_PROMPT_CHARACTERS:
-                break
+            used += cost
 
-    excerpt = "\n".join(text_fragments)
-    prompt = (
-        "You are helping to outline a technical document. "
-        "Review the provided excerpts and identify its headers.\n\n"
-        f"Document excerpts:\n{excerpt}\n\n"
-        "Please show a simple nested list of all headers and subheaders for this document."
-    )
-    return prompt
+    return intro + "\n".join(text_fragments) + outro
 
 
 def parse_nested_list_to_tree(file_id: str, nested_list_text: str) -> SectionNode:
@@ -184,7 +206,7 @@ def _iter_sections(node: SectionNode) -> Iterator[SectionNode]:
         yield from _iter_sections(child)
 
 
-def _prepare_object_lines(objects: Sequence[ParsedObject]) -> list[list[str]]:
+def _prepare_object_lines(objects: Sequence[DocumentObject]) -> list[list[str]]:
     prepared: list[list[str]] = []
     for obj in objects:
         entries: list[str] = []
@@ -215,7 +237,7 @@ def _find_anchor(
 
 
 def _assign_spans(
-    root: SectionNode, objects: Sequence[ParsedObject]
+    root: SectionNode, objects: Sequence[DocumentObject]
 ) -> None:
     object_lines = _prepare_object_lines(objects)
     ordered_nodes = list(_iter_sections(root))
@@ -255,11 +277,8 @@ def _assign_spans(
 
 
 def _persist_sections(file_id: str, root: SectionNode, settings: Settings) -> None:
-    base = Path(settings.ARTIFACTS_DIR) / file_id / "headers"
-    base.mkdir(parents=True, exist_ok=True)
-    target = base / "sections.json"
-    with target.open("w", encoding="utf-8") as handle:
-        json.dump(root.model_dump(mode="json"), handle, indent=2)
+    base = Path(settings.ARTIFACTS_DIR) / file_id
+    write_artifact_json(base, "headers/sections.json", root.model_dump(mode="json"))
 
 
 class _FallbackAdapter:
@@ -334,7 +353,9 @@ class _LlamaCppAdapter:
         return _FALLBACK_NESTED_LIST
 
 
-def _select_adapter(choice: str | None, settings: Settings) -> LLMAdapter:
+def select_adapter(choice: str | None, settings: Settings) -> LLMAdapter:
+    """Return the header/spec LLM adapter for ``choice`` (default OpenRouter)."""
+
     normalized = (choice or "openrouter").lower()
     if normalized == "openrouter":
         return _OpenRouterAdapter(settings)
@@ -343,33 +364,78 @@ def _select_adapter(choice: str | None, settings: Settings) -> LLMAdapter:
     return _FallbackAdapter()
 
 
-def run_header_discovery(file_id: str, llm_choice: str | None) -> SectionNode:
-    settings = get_settings()
+def _load_objects(file_id: str, settings: Settings) -> list[DocumentObject]:
     objects_path = Path(settings.ARTIFACTS_DIR) / file_id / "parsed" / "objects.json"
     if not objects_path.exists():
         raise FileNotFoundError("parsed_objects_missing")
-    with objects_path.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
-    objects = [ParsedObject.model_validate(item) for item in data]
-    prompt = build_headers_prompt(objects)
-    adapter = _select_adapter(llm_choice, settings)
-    try:
-        response_text = adapter.generate(prompt)
-    except Exception:
-        response_text = _FALLBACK_NESTED_LIST
+    data = read_json(objects_path)
+    return construct_trusted(DocumentObject, data)
+
+
+def _build_section_tree(
+    file_id: str, objects: list[DocumentObject], response_text: object, settings: Settings
+) -> SectionNode:
     if not isinstance(response_text, str) or not response_text.strip():
         response_text = _FALLBACK_NESTED_LIST
     root = parse_nested_list_to_tree(file_id, response_text)
-    _assign_spans(root, objects)
+    with stage_timer("span_assignment", file_id) as timing:
+        _assign_spans(root, objects)
+        timing["object_count"] = len(objects)
     _persist_sections(file_id, root, settings)
     return root
 
 
+def run_header_discovery(file_id: str, llm_choice: str | None) -> SectionNode:
+    settings = get_settings()
+    objects = _load_objects(file_id, settings)
+    with stage_timer("header_discovery", file_id, provider=llm_choice):
+        prompt = build_headers_prompt(objects)
+        adapter = select_adapter(llm_choice, settings)
+        started = time.perf_counter()
+        try:
+            response_text = adapter.generate(prompt)
+        except Exception:
+            record_llm_call(llm_choice or "openrouter", time.perf_counter() - started, outcome="error")
+            response_text = _FALLBACK_NESTED_LIST
+        else:
+            record_llm_call(llm_choice or "openrouter", time.perf_counter() - started)
+    return _build_section_tree(file_id, objects, response_text, settings)
+
+
+async def arun_header_discovery(file_id: str, llm_choice: str | None) -> SectionNode:
+    """Non-blocking :func:`run_header_discovery` using the pooled providers.
+
+    File access and span assignment run in a worker thread; the LLM call is
+    awaited on the shared keep-alive client.
+    """
+
+    settings = get_settings()
+    objects = await asyncio.to_thread(profiled(_load_objects), file_id, settings)
+    adapter = build_async_adapter(
+        llm_choice,
+        settings,
+        system_prompt="Return only the nested list of headers.",
+        params={"temperature": 0.0, "max_tokens": MAX_TOKENS_LIMIT},
+    )
+    with stage_timer("header_discovery", file_id, provider=llm_choice, mode="async"):
+        prompt = build_headers_prompt(objects, model=adapter.model if adapter else None)
+        try:
+            response_text = await adapter.agenerate(prompt) if adapter else _FALLBACK_NESTED_LIST
+        except Exception:
+            response_text = _FALLBACK_NESTED_LIST
+    return await asyncio.to_thread(profiled(_build_section_tree), file_id, objects, response_text, settings)
+
+
+def save_sections(file_id: str, root: SectionNode) -> None:
+    """Persist an edited section tree in place of the discovered one."""
+
+    _persist_sections(file_id, root, get_settings())
+
+
 def load_persisted_headers(file_id: str) -> SectionNode:
     settings = get_settings()
     sections_path = Path(settings.ARTIFACTS_DIR) / file_id / "headers" / "sections.json"
     if not sections_path.exists():
         raise FileNotFoundError("sections_missing")
-    with sections_path.open("r", encoding="utf-8") as handle:
-        payload = json.load(handle)
+    payload = read_json(sections_path)
     return SectionNode.model_validate(payload)
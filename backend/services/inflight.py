@@ -0,0 +1,146 @@
+"""Per-process registry of in-flight pipeline jobs used for graceful draining."""
+from __future__ import annotations
+
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from types import FrameType
+from typing import Callable, Iterator
+
+from ..logging import get_logger
+
+__all__ = [
+    "DrainingError",
+    "begin_drain",
+    "in_flight",
+    "install_drain_handler",
+    "is_draining",
+    "reset",
+    "track_job",
+    "wait_until_idle",
+]
+
+
+class DrainingError(RuntimeError):
+    """Raised by :func:`track_job` once the worker has started draining."""
+
+
+_logger = get_logger(__name__)
+_condition = threading.Condition()
+_jobs: dict[str, int] = {}
+_draining = False
+
+
+@contextmanager
+def track_job(job_id: str) -> Iterator[None]:
+    """Register ``job_id`` as running for the duration of the block.
+
+    Raises :class:`DrainingError` instead of starting new work once
+    :func:`begin_drain` has been called.
+    """
+
+    with _condition:
+        if _draining:
+            raise DrainingError("Worker is shutting down; retry the request.")
+        _jobs[job_id] = _jobs.get(job_id, 0) + 1
+    try:
+        yield
+    finally:
+        with _condition:
+            remaining = _jobs.get(job_id, 1) - 1
+            if remaining > 0:
+                _jobs[job_id] = remaining
+            else:
+                _jobs.pop(job_id, None)
+            _condition.notify_all()
+
+
+def in_flight() -> list[str]:
+    """Return the identifiers of jobs currently running in this process."""
+
+    with _condition:
+        return sorted(_jobs)
+
+
+def is_draining() -> bool:
+    """Return whether this process stopped accepting new jobs."""
+
+    return _draining
+
+
+def begin_drain() -> None:
+    """Stop accepting new jobs; running jobs continue to completion."""
+
+    global _draining
+    with _condition:
+        _draining = True
+        _condition.notify_all()
+
+
+def wait_until_idle(timeout: float) -> bool:
+    """Block until no job is running or ``timeout`` seconds pass.
+
+    Returns ``True`` when every job finished in time.
+    """
+
+    deadline = time.monotonic() + max(timeout, 0.0)
+    with _condition:
+        while _jobs:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _condition.wait(remaining)
+        return True
+
+
+def install_drain_handler(timeout: float, sig: int = signal.SIGTERM) -> bool:
+    """Drain running jobs on ``sig`` before the server's own handler sees it.
+
+    Servers close their listeners as soon as they get ``SIGTERM``, so the
+    first signal only calls :func:`begin_drain`: ``/healthz`` answers ``503``
+    while jobs finish, and the previous handler runs once they are done or
+    ``timeout`` seconds passed. A second signal forwards immediately.
+
+    Must be called from the main thread after the server installed its
+    handler; returns ``False`` (and changes nothing) otherwise.
+    """
+
+    if threading.current_thread() is not threading.main_thread():
+        return False
+    previous = signal.getsignal(sig)
+    if not callable(previous):
+        return False
+    forward: Callable[[int, FrameType | None], object] = previous
+
+    def _finish(signum: int, frame: FrameType | None) -> None:
+        if not wait_until_idle(timeout):
+            _logger.warning(
+                "Stopping with %d spec job(s) still running after %.0fs: %s",
+                len(in_flight()),
+                timeout,
+                ", ".join(in_flight()),
+            )
+        forward(signum, frame)
+
+    def _handle(signum: int, frame: FrameType | None) -> None:
+        if is_draining():
+            forward(signum, frame)
+            return
+        begin_drain()
+        threading.Thread(
+            target=_finish, args=(signum, frame), name="spec-drain", daemon=True
+        ).start()
+
+    signal.signal(sig, _handle)
+    return True
+
+
+def reset() -> None:
+    """Forget all jobs and leave draining mode (used by tests)."""
+
+    global _draining
+    with _condition:
+        _jobs.clear()
+        _draining = False
+        _condition.notify_all()
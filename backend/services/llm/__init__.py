@@ -1,4 +1,4 @@
 """LLM provider helpers."""
-from .llm_provider import get_provider, LLMProvider
+from .llm_provider import close_shared_clients, get_provider, LLMProvider, shared_client
 
-__all__ = ["get_provider", "LLMProvider"]
+__all__ = ["close_shared_clients", "get_provider", "LLMProvider", "shared_client"]
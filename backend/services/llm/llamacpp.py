@@ -17,10 +17,12 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
-from .llm_provider import LLMProvider
+from .llm_provider import LLMProvider, shared_client
 
 
 class LlamaCPPProvider(LLMProvider):
+    name = "llamacpp"
+
     def __init__(
         self,
         *,
@@ -72,19 +74,21 @@ class LlamaCPPProvider(LLMProvider):
         if self.params:
             payload.update(self.params)
 
-        async with httpx.AsyncClient(timeout=self.timeout, headers=self.headers) as client:
-            resp = await client.post(url, json=payload)
-            # Raise detailed HTTP errors early
-            try:
-                resp.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                # Include server response text for debugging clarity
-                raise RuntimeError(
-                    f"LLM server returned HTTP {resp.status_code} at {url}: {resp.text}"
-                ) from e
-
-            data = resp.json()
-
+        # Pooled keep-alive client shared with the other providers on this loop.
+        client = shared_client(self.timeout)
+        resp = await client.post(url, json=payload, headers=self.headers)
+        # Raise detailed HTTP errors early
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            # Include server response text for debugging clarity
+            raise RuntimeError(
+                f"LLM server returned HTTP {resp.status_code} at {url}: {resp.text}"
+            ) from e
+
+        data = resp.json()
+
+        self.last_usage = self._extract_usage(data)
         content = self._extract_content(data, endpoint_flavor)
         if isinstance(content, str) and content.strip():
             return content.strip()
@@ -110,6 +114,25 @@ class LlamaCPPProvider(LLMProvider):
         # Ollama typically uses /api/chat. If user wants Ollama, they can pass that explicitly.
         return f"{base_url}/v1/chat/completions", "openai"
 
+    def _extract_usage(self, data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Return token usage in OpenAI shape when the server reports it.
+
+        - OpenAI-compatible (llama.cpp): data["usage"]
+        - Ollama-style (/api/chat):      data["prompt_eval_count"] / data["eval_count"]
+        """
+        if not isinstance(data, dict):
+            return None
+        usage = data.get("usage")
+        if isinstance(usage, dict):
+            return usage
+        if "prompt_eval_count" in data or "eval_count" in data:
+            return {
+                "prompt_tokens": data.get("prompt_eval_count"),
+                "completion_tokens": data.get("eval_count"),
+            }
+        return None
+
     def _extract_content(self, data: Any, flavor: str) -> Optional[str]:
         """
         Normalize and extract text content from varied server responses.
@@ -2,31 +2,91 @@
 from __future__ import annotations
 
 import asyncio
+import time
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any, List
 
+import httpx
 from fastapi import HTTPException, status
 
+from ...metrics import record_llm_call
+from ..tokens import calibrate
+
+_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[float, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def shared_client(timeout: float) -> httpx.AsyncClient:
+    """Return a keep-alive ``AsyncClient`` shared by providers on this event loop.
+
+    Clients are bound to the running loop, so one pool is kept per loop and
+    per timeout; connections are reused across requests and sections.
+    """
+
+    loop = asyncio.get_running_loop()
+    clients = _CLIENTS.setdefault(loop, {})
+    client = clients.get(timeout)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=timeout, limits=_POOL_LIMITS)
+        clients[timeout] = client
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the pooled clients of the running event loop."""
+
+    clients = _CLIENTS.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
 
 class LLMProvider(ABC):
     """Abstract chat completion provider."""
 
+    name = "llm"
+
     def __init__(self, model: str, params: dict[str, Any] | None = None) -> None:
         self.model = model
         self.params = params or {}
+        self.last_usage: dict[str, Any] | None = None
 
     async def chat(self, messages: List[dict[str, str]]) -> str:
         retries = 3
         delay = 1.5
         last_exc: Exception | None = None
+        started = time.perf_counter()
         for attempt in range(1, retries + 1):
             try:
-                return await self._chat(messages)
+                self.last_usage = None
+                content = await self._chat(messages)
             except Exception as exc:  # noqa: BLE001 - we re-raise as HTTPException
                 last_exc = exc
                 if attempt == retries:
                     break
                 await asyncio.sleep(delay * attempt)
+            else:
+                record_llm_call(
+                    self.name,
+                    time.perf_counter() - started,
+                    retries=attempt - 1,
+                    usage=self.last_usage,
+                )
+                if self.last_usage:
+                    calibrate(
+                        self.model,
+                        sum(len(message.get("content", "")) for message in messages),
+                        self.last_usage.get("prompt_tokens"),
+                    )
+                return content
+        record_llm_call(
+            self.name,
+            time.perf_counter() - started,
+            outcome="error",
+            retries=retries - 1,
+        )
         message = "LLM request failed"
         if last_exc:
             message = f"LLM request failed: {last_exc}"  # type: ignore[str-format]
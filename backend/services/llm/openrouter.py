@@ -3,12 +3,12 @@ from __future__ import annotations
 
 from typing import Any, List
 
-import httpx
-
-from .llm_provider import LLMProvider
+from .llm_provider import LLMProvider, shared_client
 
 
 class OpenRouterProvider(LLMProvider):
+    name = "openrouter"
+
     def __init__(self, *, model: str, params: dict[str, Any] | None, api_key: str) -> None:
         super().__init__(model=model, params=params)
         self.api_key = api_key
@@ -21,10 +21,12 @@ class OpenRouterProvider(LLMProvider):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(self.endpoint, json=payload, headers=headers)
+        client = shared_client(30.0)
+        response = await client.post(self.endpoint, json=payload, headers=headers)
         response.raise_for_status()
         data = response.json()
+        usage = data.get("usage") if isinstance(data, dict) else None
+        self.last_usage = usage if isinstance(usage, dict) else None
         try:
             return data["choices"][0]["message"]["content"].strip()
         except (KeyError, IndexError, TypeError) as exc:  # noqa: PERF203 - explicit handling
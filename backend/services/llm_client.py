@@ -1,9 +1,25 @@
 """LLM client abstractions for SimpleSpecs (Phase P0 stubs)."""
 from __future__ import annotations
 
-from typing import Protocol
+import asyncio
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
-__all__ = ["LLMAdapter", "OpenRouterAdapter", "LlamaCppAdapter"]
+from ..profiling import profiled
+
+if TYPE_CHECKING:
+    from ..config import Settings
+    from .llm import LLMProvider
+
+__all__ = [
+    "AsyncLLMAdapter",
+    "LLMAdapter",
+    "LlamaCppAdapter",
+    "OpenRouterAdapter",
+    "ProviderAdapter",
+    "ThreadedAdapter",
+    "as_async_adapter",
+    "build_async_adapter",
+]
 
 
 class LLMAdapter(Protocol):
@@ -13,6 +29,14 @@ class LLMAdapter(Protocol):
         """Generate a response for the given prompt."""
 
 
+@runtime_checkable
+class AsyncLLMAdapter(Protocol):
+    """Protocol describing non-blocking LLM interaction."""
+
+    async def agenerate(self, prompt: str) -> str:
+        """Generate a response for the given prompt without blocking the loop."""
+
+
 class OpenRouterAdapter:
     """Stub adapter representing an OpenRouter-based integration."""
 
@@ -27,6 +51,91 @@ class LlamaCppAdapter:
         return ""
 
 
+class ProviderAdapter:
+    """Async adapter backed by a pooled ``services.llm`` provider.
+
+    Providers retry, time and record their own calls, so callers should not
+    record them again (see ``records_calls``).
+    """
+
+    records_calls = True
+
+    def __init__(self, provider: "LLMProvider", system_prompt: str | None = None) -> None:
+        self.provider = provider
+        self.system_prompt = system_prompt
+
+    @property
+    def name(self) -> str:
+        return self.provider.name
+
+    @property
+    def model(self) -> str:
+        return self.provider.model
+
+    async def agenerate(self, prompt: str) -> str:
+        messages: list[dict[str, str]] = []
+        if self.system_prompt:
+            messages.append({"role": "system", "content": self.system_prompt})
+        messages.append({"role": "user", "content": prompt})
+        return await self.provider.chat(messages)
+
+
+class ThreadedAdapter:
+    """Run a synchronous ``LLMAdapter`` in a worker thread."""
+
+    records_calls = False
+
+    def __init__(self, adapter: LLMAdapter) -> None:
+        self.adapter = adapter
+
+    @property
+    def name(self) -> str:
+        return type(self.adapter).__name__
+
+    async def agenerate(self, prompt: str) -> str:
+        return await asyncio.to_thread(profiled(self.adapter.generate), prompt)
+
+
+def as_async_adapter(adapter: LLMAdapter | AsyncLLMAdapter) -> AsyncLLMAdapter:
+    """Return ``adapter`` unchanged when async, otherwise wrap it in a thread."""
+
+    if isinstance(adapter, AsyncLLMAdapter):
+        return adapter
+    return ThreadedAdapter(adapter)
+
+
+def build_async_adapter(
+    choice: str | None,
+    settings: "Settings",
+    *,
+    system_prompt: str | None = None,
+    params: dict[str, Any] | None = None,
+) -> ProviderAdapter | None:
+    """Return a pooled async adapter for ``choice`` or ``None`` if unconfigured."""
+
+    from .llm import get_provider
+
+    normalized = (choice or "openrouter").lower()
+    if normalized == "openrouter":
+        if not settings.OPENROUTER_API_KEY:
+            return None
+        provider = get_provider(
+            "openrouter",
+            model="openrouter/auto",
+            params=params,
+            api_key=settings.OPENROUTER_API_KEY,
+        )
+    elif normalized == "llamacpp":
+        if not settings.LLAMACPP_URL:
+            return None
+        provider = get_provider(
+            "llamacpp", model="local", params=params, base_url=settings.LLAMACPP_URL
+        )
+    else:
+        return None
+    return ProviderAdapter(provider, system_prompt=system_prompt)
+
+
 def get_llm_client() -> LLMAdapter:
     """Return the default stubbed adapter."""
 
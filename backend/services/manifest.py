@@ -0,0 +1,125 @@
+"""Per-artifact manifests recording content digests at write time."""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from ..store import atomic_writer, dumps_json, file_lock
+
+__all__ = [
+    "MANIFEST_NAME",
+    "ArtifactEntry",
+    "artifact_entry",
+    "etag_for",
+    "etag_matches",
+    "write_artifact_json",
+]
+
+MANIFEST_NAME = "manifest.json"
+_LOCK_NAME = ".manifest.lock"
+
+
+@dataclass(frozen=True)
+class ArtifactEntry:
+    """Digest and size of an artifact file as recorded in the manifest."""
+
+    sha256: str
+    size: int
+    mtime_ns: int
+
+
+def _manifest_path(base: Path) -> Path:
+    return base / MANIFEST_NAME
+
+
+def _load_manifest(base: Path) -> dict[str, dict[str, Any]]:
+    try:
+        with _manifest_path(base).open("r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    artifacts = payload.get("artifacts") if isinstance(payload, dict) else None
+    return artifacts if isinstance(artifacts, dict) else {}
+
+
+def _record(base: Path, relative: str, entry: ArtifactEntry) -> None:
+    # Workers share artifact directories: read-merge-replace under a file lock
+    # so concurrent writers never drop each other's entries.
+    with file_lock(base / _LOCK_NAME):
+        artifacts = _load_manifest(base)
+        artifacts[relative] = asdict(entry)
+        with atomic_writer(_manifest_path(base)) as handle:
+            json.dump({"version": 1, "artifacts": artifacts}, handle, indent=2, sort_keys=True)
+
+
+def write_artifact_json(base: Path, relative: str, payload: Any, *, indent: int | None = None) -> ArtifactEntry:
+    """Serialize ``payload`` to ``base / relative`` and record its digest.
+
+    The digest is computed from the serialized bytes before they hit the disk,
+    so readers never need to hash the file again. Artifacts are compact unless
+    ``indent`` is given, and replace the previous file atomically.
+    """
+
+    target = base / relative
+    data = dumps_json(payload, indent=indent)
+    with atomic_writer(target, "wb") as handle:
+        handle.write(data)
+    stat = target.stat()
+    entry = ArtifactEntry(
+        sha256=hashlib.sha256(data).hexdigest(),
+        size=len(data),
+        mtime_ns=stat.st_mtime_ns,
+    )
+    _record(base, relative, entry)
+    return entry
+
+
+def artifact_entry(base: Path, relative: str) -> ArtifactEntry | None:
+    """Return the manifest entry for ``relative`` or ``None`` when missing.
+
+    Files whose size or mtime no longer match their entry (written by an
+    older version or edited by hand) are hashed here; reads never write the
+    manifest, the next write of the artifact records it again.
+    """
+
+    target = base / relative
+    try:
+        stat = target.stat()
+    except FileNotFoundError:
+        return None
+    recorded = _load_manifest(base).get(relative)
+    if (
+        isinstance(recorded, dict)
+        and recorded.get("size") == stat.st_size
+        and recorded.get("mtime_ns") == stat.st_mtime_ns
+        and isinstance(recorded.get("sha256"), str)
+    ):
+        return ArtifactEntry(
+            sha256=recorded["sha256"], size=stat.st_size, mtime_ns=stat.st_mtime_ns
+        )
+    digest = hashlib.sha256()
+    with target.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return ArtifactEntry(sha256=digest.hexdigest(), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+
+
+def etag_for(*parts: str) -> str:
+    """Return a strong ETag derived from artifact digests and variant labels."""
+
+    if len(parts) == 1:
+        return f'"{parts[0]}"'
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Return whether an ``If-None-Match`` header value matches ``etag``."""
+
+    if not if_none_match:
+        return False
+    candidates = [item.strip() for item in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -0,0 +1,168 @@
+"""Cache of normalized parser output keyed by content hash, engine and options."""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Protocol
+from uuid import uuid4
+
+from ..config import Settings, get_settings
+from ..logging import get_logger
+from ..metrics import increment
+from ..models import DocumentObject
+from ..store import construct_trusted, read_json, write_json
+from .capabilities import is_available
+
+__all__ = [
+    "CACHE_DIR_NAME",
+    "CachingPdfParser",
+    "cached_parse",
+    "engine_options",
+    "load_cached_objects",
+    "parse_cache_key",
+    "store_cached_objects",
+]
+
+CACHE_DIR_NAME = "_parse_cache"
+_FORMAT_VERSION = 1
+_NATIVE_LIBRARIES = ("pdfplumber", "pymupdf", "camelot", "pikepdf")
+
+_logger = get_logger(__name__)
+
+
+class _Parser(Protocol):
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
+        ...
+
+
+def engine_options(engine: str, settings: Settings) -> dict[str, Any]:
+    """Return the settings and installed libraries that shape ``engine``'s output."""
+
+    if engine == "native":
+        # Tables and image blocks only appear when their libraries are installed.
+        return {name: is_available(name) for name in _NATIVE_LIBRARIES}
+    if engine == "mineru":
+        return {"model_opts": settings.MINERU_MODEL_OPTS}
+    return {}
+
+
+def parse_cache_key(sha256: str, engine: str, engine_version: str, options: dict[str, Any]) -> str:
+    """Return the cache key for one document parsed by one engine configuration."""
+
+    canonical = json.dumps(options, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256()
+    for part in (sha256, engine, engine_version, canonical):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cache_path(key: str, settings: Settings) -> Path:
+    return Path(settings.ARTIFACTS_DIR) / CACHE_DIR_NAME / key[:2] / f"{key}.json"
+
+
+def _rebase(item: dict[str, Any], source_id: str | None, file_id: str | None) -> dict[str, Any]:
+    if "line_id" in item:
+        # Upload objects carry random line IDs; a reused parse gets its own.
+        item["line_id"] = str(uuid4())
+    if file_id is None or not source_id or source_id == file_id:
+        return item
+    if "file_id" in item:
+        item["file_id"] = file_id
+    object_id = item.get("object_id")
+    if isinstance(object_id, str) and object_id.startswith(f"{source_id}-"):
+        item["object_id"] = f"{file_id}{object_id[len(source_id):]}"
+    return item
+
+
+def load_cached_objects(
+    key: str, file_id: str | None = None, settings: Settings | None = None
+) -> list[dict[str, Any]] | None:
+    """Return the cached objects for ``key``, or ``None``.
+
+    Identifiers are rebased for the new document: artifact objects are moved
+    onto ``file_id`` and upload objects get fresh ``line_id`` values.
+    """
+
+    path = _cache_path(key, settings or get_settings())
+    try:
+        envelope = read_json(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        _logger.warning("Ignoring unreadable parse cache entry %s: %s", path, exc)
+        return None
+    if not isinstance(envelope, dict) or envelope.get("version") != _FORMAT_VERSION:
+        return None
+    source_id = envelope.get("file_id")
+    return [_rebase(dict(item), source_id, file_id) for item in envelope.get("objects", [])]
+
+
+def store_cached_objects(
+    key: str,
+    objects: list[dict[str, Any]],
+    file_id: str | None = None,
+    settings: Settings | None = None,
+) -> None:
+    """Record ``objects`` parsed from ``file_id`` under ``key``; failures only log."""
+
+    path = _cache_path(key, settings or get_settings())
+    payload = {"version": _FORMAT_VERSION, "file_id": file_id, "objects": objects}
+    try:
+        write_json(path, payload)
+    except (OSError, TypeError, ValueError) as exc:
+        _logger.warning("Parse cache entry %s not written: %s", path, exc)
+
+
+def cached_parse(
+    sha256: str | None,
+    engine: str,
+    engine_version: str,
+    parse: Callable[[], list[dict[str, Any]]],
+    *,
+    file_id: str | None = None,
+    settings: Settings | None = None,
+) -> list[dict[str, Any]]:
+    """Return ``parse()`` for the document hashed ``sha256``, reusing earlier output.
+
+    Without a hash, or with ``PARSE_CACHE`` disabled, this simply parses.
+    """
+
+    settings = settings or get_settings()
+    if sha256 is None or not settings.PARSE_CACHE:
+        return parse()
+    key = parse_cache_key(sha256, engine, engine_version, engine_options(engine, settings))
+    cached = load_cached_objects(key, file_id, settings)
+    if cached is not None:
+        increment("parse_cache_total", engine=engine, result="hit")
+        return cached
+    objects = parse()
+    store_cached_objects(key, objects, file_id, settings)
+    increment("parse_cache_total", engine=engine, result="miss")
+    return objects
+
+
+@dataclass
+class CachingPdfParser:
+    """Wrap a PDF parser so identical input is parsed once per engine configuration."""
+
+    parser: _Parser
+    engine: str
+    engine_version: str
+    sha256: str
+    settings: Settings
+
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
+        # Same derivation as the parsers: ``<file_id>/source/document.pdf``.
+        file_id = Path(file_path).resolve().parent.parent.name
+        items = cached_parse(
+            self.sha256,
+            self.engine,
+            self.engine_version,
+            lambda: [obj.model_dump(mode="json") for obj in self.parser.parse_pdf(file_path)],
+            file_id=file_id,
+            settings=self.settings,
+        )
+        return construct_trusted(DocumentObject, items)
@@ -2,23 +2,20 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from ..models import ParsedObject
+from ..models import DocumentObject
+from .capabilities import optional_import
 
-try:  # pragma: no cover - optional dependency
-    from docx import Document
-except Exception:  # pragma: no cover - dependency missing
-    Document = None  # type: ignore
 
+def parse_docx(file_path: str) -> list[DocumentObject]:
+    """Parse DOCX files into DocumentObject instances."""
 
-def parse_docx(file_path: str) -> list[ParsedObject]:
-    """Parse DOCX files into ParsedObject instances."""
-
-    if Document is None:
+    docx = optional_import("docx")
+    if docx is None:
         return []
 
     file_id = Path(file_path).resolve().parent.parent.name
-    document = Document(file_path)
-    objects: list[ParsedObject] = []
+    document = docx.Document(file_path)
+    objects: list[DocumentObject] = []
     order_index = 0
 
     for paragraph in document.paragraphs:
@@ -26,7 +23,7 @@ def parse_docx(file_path: str) -> list[ParsedObject]:
         if not text:
             continue
         objects.append(
-            ParsedObject(
+            DocumentObject(
                 object_id=f"{file_id}-docx-text-{order_index:06d}",
                 file_id=file_id,
                 kind="text",
@@ -45,7 +42,7 @@ def parse_docx(file_path: str) -> list[ParsedObject]:
             rows.append([cell.text.strip() for cell in row.cells])
         table_text = "\n".join("\t".join(cell for cell in row) for row in rows)
         objects.append(
-            ParsedObject(
+            DocumentObject(
                 object_id=f"{file_id}-docx-table-{table_index:06d}",
                 file_id=file_id,
                 kind="table",
@@ -4,11 +4,11 @@ from pathlib import Path
 
 from charset_normalizer import from_path
 
-from ..models import ParsedObject
+from ..models import DocumentObject
 
 
-def parse_txt(file_path: str) -> list[ParsedObject]:
-    """Parse plain text files into ParsedObject entries."""
+def parse_txt(file_path: str) -> list[DocumentObject]:
+    """Parse plain text files into DocumentObject entries."""
 
     file_id = Path(file_path).resolve().parent.parent.name
     best = from_path(file_path).best()
@@ -17,10 +17,10 @@ def parse_txt(file_path: str) -> list[ParsedObject]:
     else:
         text = str(best)
 
-    objects: list[ParsedObject] = []
+    objects: list[DocumentObject] = []
     for index, line in enumerate(text.splitlines()):
         objects.append(
-            ParsedObject(
+            DocumentObject(
                 object_id=f"{file_id}-txt-{index:06d}",
                 file_id=file_id,
                 kind="text",
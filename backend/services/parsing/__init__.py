@@ -4,10 +4,14 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Callable, Dict, List
 
+from ..parse_cache import cached_parse
 from .docx_parser import parse_docx
 from .pdf_parser import parse_pdf
 from .txt_parser import parse_txt
 
+PARSER_VERSION = "1"
+"""Version of the normalized output; bump when parser output changes."""
+
 _PARSERS: Dict[str, Callable[[Path], List[dict]]] = {
     ".pdf": parse_pdf,
     ".docx": parse_docx,
@@ -15,11 +19,15 @@ _PARSERS: Dict[str, Callable[[Path], List[dict]]] = {
 }
 
 
-def parse_document(path: Path) -> list[dict]:
-    """Parse a document at *path* and return a list of normalized objects."""
+def parse_document(path: Path, *, sha256: str | None = None) -> list[dict]:
+    """Parse a document at *path* and return a list of normalized objects.
+
+    With the document's ``sha256`` the output is read from (or added to) the
+    parse cache, keyed by content, parser and ``PARSER_VERSION``.
+    """
 
     suffix = path.suffix.lower()
     parser = _PARSERS.get(suffix)
     if not parser:
         raise ValueError(f"Unsupported document type: {suffix}")
-    return parser(path)
+    return cached_parse(sha256, suffix.lstrip("."), PARSER_VERSION, lambda: parser(path))
@@ -5,13 +5,13 @@ from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-from docx import Document
+from ..capabilities import require
 
 
 def parse_docx(path: Path) -> list[dict[str, Any]]:
     """Parse a DOCX document into normalized objects."""
 
-    document = Document(path)
+    document = require("docx").Document(path)
     objects: list[dict[str, Any]] = []
 
     for paragraph in document.paragraphs:
@@ -6,12 +6,13 @@ from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
-import pdfplumber
+from ..capabilities import require
 
 
 def parse_pdf(path: Path) -> list[dict[str, Any]]:
     """Parse a PDF document into normalized objects."""
 
+    pdfplumber = require("pdfplumber")
     objects: list[dict[str, Any]] = []
     with pdfplumber.open(path) as pdf:
         for page_index, page in enumerate(pdf.pages, start=1):
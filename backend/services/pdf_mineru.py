@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import importlib
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from ..config import Settings, get_settings
-from ..models import ParsedObject
+from ..models import DocumentObject
+from .capabilities import is_available, optional_import
 from .pdf_native import NativePdfParser
 
 __all__ = ["MinerUPdfParser", "MinerUUnavailableError"]
@@ -18,13 +18,9 @@ class MinerUUnavailableError(RuntimeError):
 
 def _load_mineru_module() -> tuple[Any | None, str | None]:
     for name in ("mineru", "magic_pdf"):
-        try:
-            module = importlib.import_module(name)
-            return module, name
-        except ModuleNotFoundError:
+        if not is_available(name):
             continue
-        except Exception:
-            return None, name
+        return optional_import(name), name
     return None, None
 
 
@@ -42,7 +38,7 @@ class MinerUPdfParser:
         if self._module is None:
             raise MinerUUnavailableError("MinerU client library is not installed.")
 
-    def parse_pdf(self, file_path: str) -> list[ParsedObject]:
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
         file_id = Path(file_path).resolve().parent.parent.name
         if self._module_name == "magic_pdf":  # pragma: no cover - optional dependency
             return self._parse_magic_pdf(file_path, file_id)
@@ -50,7 +46,7 @@ class MinerUPdfParser:
             return self._parse_mineru(file_path, file_id)
         raise MinerUUnavailableError("Unsupported MinerU module.")
 
-    def _parse_magic_pdf(self, file_path: str, file_id: str) -> list[ParsedObject]:
+    def _parse_magic_pdf(self, file_path: str, file_id: str) -> list[DocumentObject]:
         try:
             pipeline = getattr(self._module, "pipeline", None)
             if pipeline is None:
@@ -60,7 +56,7 @@ class MinerUPdfParser:
             raise MinerUUnavailableError(str(exc)) from exc
         return self._normalize_mineru_output(result, file_path, file_id, engine="magic_pdf")
 
-    def _parse_mineru(self, file_path: str, file_id: str) -> list[ParsedObject]:
+    def _parse_mineru(self, file_path: str, file_id: str) -> list[DocumentObject]:
         try:
             result = self._module.parse(file_path)  # type: ignore[attr-defined]
         except Exception as exc:  # pragma: no cover - optional dependency
@@ -69,7 +65,7 @@ class MinerUPdfParser:
 
     def _normalize_mineru_output(
         self, result: Any, file_path: str, file_id: str, engine: str
-    ) -> list[ParsedObject]:
+    ) -> list[DocumentObject]:
         if not result:  # pragma: no cover - optional dependency
             native_fallback = NativePdfParser()
             return [
@@ -81,7 +77,7 @@ class MinerUPdfParser:
                 for obj in native_fallback.parse_pdf(file_path)
             ]
 
-        objects: list[ParsedObject] = []
+        objects: list[DocumentObject] = []
         order_index = 0
         for item in result if isinstance(result, list) else []:
             kind = item.get("kind", "text")
@@ -91,7 +87,7 @@ class MinerUPdfParser:
             metadata = item.get("metadata", {})
             metadata = {**metadata, "engine": engine}
             objects.append(
-                ParsedObject(
+                DocumentObject(
                     object_id=f"{file_id}-mineru-{order_index:06d}",
                     file_id=file_id,
                     kind=kind,
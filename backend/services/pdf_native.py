@@ -4,38 +4,24 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from ..models import ParsedObject
-
-try:  # pragma: no cover - optional dependency
-    import pdfplumber  # type: ignore
-except Exception:  # pragma: no cover - dependency missing
-    pdfplumber = None
-
-try:  # pragma: no cover - optional dependency
-    import fitz  # type: ignore
-except Exception:  # pragma: no cover - dependency missing
-    fitz = None
-
-try:  # pragma: no cover - optional dependency
-    import camelot  # type: ignore
-except Exception:  # pragma: no cover - dependency missing
-    camelot = None
-
-try:  # pragma: no cover - optional dependency
-    import pikepdf  # type: ignore
-except Exception:  # pragma: no cover - dependency missing
-    pikepdf = None
-
+from ..models import DocumentObject
+from .capabilities import optional_import
 
 @dataclass
 class NativePdfParser:
     """Parse PDF files using locally available libraries."""
 
-    def parse_pdf(self, file_path: str) -> list[ParsedObject]:
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
         file_id = Path(file_path).resolve().parent.parent.name
-        objects: list[ParsedObject] = []
+        objects: list[DocumentObject] = []
         order_index = 0
 
+        # Imported on first use: camelot alone pulls in OpenCV and pandas.
+        pdfplumber = optional_import("pdfplumber")
+        fitz = optional_import("pymupdf")
+        camelot = optional_import("camelot")
+        pikepdf = optional_import("pikepdf")
+
         metadata: dict[str, Any] = {"engine": "native"}
         if pikepdf is not None:  # pragma: no branch - metadata enrichment
             try:
@@ -54,7 +40,7 @@ class NativePdfParser:
                     for page_index, page in enumerate(pdf.pages):
                         text = page.extract_text() or ""
                         page_bbox = [0.0, 0.0, float(page.width or 0), float(page.height or 0)]
-                        obj = ParsedObject(
+                        obj = DocumentObject(
                             object_id=f"{file_id}-txt-{order_index:06d}",
                             file_id=file_id,
                             kind="text",
@@ -69,14 +55,14 @@ class NativePdfParser:
             except Exception:
                 metadata.setdefault("warnings", []).append("pdfplumber_failed")
 
-        table_entries: list[tuple[int, ParsedObject]] = []
+        table_entries: list[tuple[int, DocumentObject]] = []
         if camelot is not None:
             try:
                 tables = camelot.read_pdf(file_path, pages="all")
                 for table_idx, table in enumerate(tables):
                     page_index = int(getattr(table, "page", 1)) - 1
                     table_text = table.df.to_csv(index=False)
-                    table_obj = ParsedObject(
+                    table_obj = DocumentObject(
                         object_id=f"{file_id}-tbl-{table_idx:06d}",
                         file_id=file_id,
                         kind="table",
@@ -90,7 +76,7 @@ class NativePdfParser:
             except Exception:
                 metadata.setdefault("warnings", []).append("camelot_failed")
 
-        image_entries: list[tuple[int, ParsedObject]] = []
+        image_entries: list[tuple[int, DocumentObject]] = []
         if fitz is not None:
             try:
                 with fitz.open(file_path) as doc:
@@ -100,7 +86,7 @@ class NativePdfParser:
                         for block_index, block in enumerate(text_dict.get("blocks", [])):
                             if block.get("type") == 1:
                                 bbox = [float(coord) for coord in block.get("bbox", (0, 0, 0, 0))]
-                                image_obj = ParsedObject(
+                                image_obj = DocumentObject(
                                     object_id=f"{file_id}-img-{page_index:03d}-{block_index:03d}",
                                     file_id=file_id,
                                     kind="image",
@@ -5,17 +5,21 @@ from dataclasses import dataclass
 from typing import Protocol
 
 from ..config import Settings, get_settings
-from ..models import ParsedObject
+from ..models import DocumentObject
+from .parse_cache import CachingPdfParser
 from .pdf_mineru import MinerUPdfParser, MinerUUnavailableError
 from .pdf_native import NativePdfParser
 
-__all__ = ["PdfParser", "select_pdf_parser", "MinerUUnavailableError"]
+__all__ = ["ENGINE_VERSIONS", "PdfParser", "select_pdf_parser", "MinerUUnavailableError"]
+
+ENGINE_VERSIONS: dict[str, str] = {"native": "1", "mineru": "1", "auto": "1"}
+"""Output versions per engine; bump an entry when that engine's output changes."""
 
 
 class PdfParser(Protocol):
     """Protocol describing PDF parsing behavior."""
 
-    def parse_pdf(self, file_path: str) -> list[ParsedObject]:
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
         """Parse a PDF into structured parsed objects."""
 
 
@@ -25,17 +29,22 @@ class AutoPdfParser:
 
     settings: Settings
     file_path: str
+    sha256: str | None = None
 
-    def parse_pdf(self, file_path: str) -> list[ParsedObject]:
-        native_parser = NativePdfParser()
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
+        # With a content hash both engines go through the parse cache, so the
+        # native pass is kept for later ``native`` requests even when MinerU wins.
+        native_parser = _with_cache(NativePdfParser(), "native", self.sha256, self.settings)
         native_objects = native_parser.parse_pdf(file_path)
         mineru_needed = self._should_use_mineru(native_objects)
         if mineru_needed:
-            mineru_parser = MinerUPdfParser(self.settings)
+            mineru_parser = _with_cache(
+                MinerUPdfParser(self.settings), "mineru", self.sha256, self.settings
+            )
             return mineru_parser.parse_pdf(file_path)
         return native_objects
 
-    def _should_use_mineru(self, native_objects: list[ParsedObject]) -> bool:
+    def _should_use_mineru(self, native_objects: list[DocumentObject]) -> bool:
         if not self.settings.MINERU_ENABLED:
             return False
         text_chars = sum(len(obj.text or "") for obj in native_objects if obj.kind == "text")
@@ -45,19 +54,37 @@ class AutoPdfParser:
         return (low_density and has_images) or (not has_tables and has_images)
 
 
+def _with_cache(parser: PdfParser, engine: str, sha256: str | None, settings: Settings) -> PdfParser:
+    if sha256 is None:
+        return parser
+    return CachingPdfParser(
+        parser,
+        engine=engine,
+        engine_version=ENGINE_VERSIONS[engine],
+        sha256=sha256,
+        settings=settings,
+    )
+
+
 def select_pdf_parser(
     settings: Settings | None = None,
     file_path: str | None = None,
     override: str | None = None,
+    sha256: str | None = None,
 ) -> PdfParser:
-    """Return a parser instance for the configured engine."""
+    """Return a parser instance for the configured engine.
+
+    Passing the document's ``sha256`` enables the parse cache, so a document
+    already parsed by an engine with the same version and options is not
+    parsed again.
+    """
 
     settings = settings or get_settings()
     engine = (override or settings.PDF_ENGINE).lower()
     if engine == "native":
-        return NativePdfParser()
+        return _with_cache(NativePdfParser(), "native", sha256, settings)
     if engine == "mineru":
-        return MinerUPdfParser(settings)
+        return _with_cache(MinerUPdfParser(settings), "mineru", sha256, settings)
     if file_path is None:
         raise ValueError("file_path is required when selecting auto engine")
-    return AutoPdfParser(settings=settings, file_path=file_path)
+    return AutoPdfParser(settings=settings, file_path=file_path, sha256=sha256)
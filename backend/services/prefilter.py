@@ -0,0 +1,73 @@
+"""Local pre-filter deciding which sections are worth an LLM call."""
+from __future__ import annotations
+
+import re
+
+from .candidates import has_candidates
+
+__all__ = ["BOILERPLATE_TITLES", "skip_reason"]
+
+BOILERPLATE_TITLES = frozenset(
+    {
+        "abbreviations",
+        "acronyms",
+        "acronyms and abbreviations",
+        "amendment record",
+        "approval",
+        "approvals",
+        "change history",
+        "contents",
+        "definitions",
+        "distribution",
+        "distribution list",
+        "document history",
+        "foreword",
+        "glossary",
+        "index",
+        "list of figures",
+        "list of tables",
+        "preface",
+        "record of revisions",
+        "revision history",
+        "revision log",
+        "revisions",
+        "signatures",
+        "table of contents",
+        "terms and definitions",
+    }
+)
+"""Normalized section titles that never carry requirements."""
+
+_MAX_SKIPPABLE_CHARACTERS = 2_000
+"""Longer sections always reach the model; the scanner may miss their phrasing."""
+
+_TITLE_NOISE = re.compile(r"^[\s\d.()\-–—:]*|[\s.:]*$")
+_CROSS_REFERENCE = re.compile(
+    r"^\s*(?:see|refer to|reserved|not used|deleted|intentionally left blank|\(reserved\))\b",
+    re.IGNORECASE,
+)
+
+
+def _normalize_title(title: str) -> str:
+    return " ".join(_TITLE_NOISE.sub("", title or "").casefold().split())
+
+
+def skip_reason(title: str, text: str) -> str | None:
+    """Return why a section can skip extraction, or ``None`` to extract it.
+
+    Reasons are ``boilerplate`` (title in :data:`BOILERPLATE_TITLES`),
+    ``empty``, ``cross_reference`` (a short "see section 4" style stub) and
+    ``no_candidates`` (short text without any unit, tolerance, standard or
+    modal verb).
+    """
+
+    if _normalize_title(title) in BOILERPLATE_TITLES:
+        return "boilerplate"
+    stripped = text.strip()
+    if not stripped:
+        return "empty"
+    if len(stripped) > _MAX_SKIPPABLE_CHARACTERS or has_candidates(stripped):
+        return None
+    if _CROSS_REFERENCE.match(stripped):
+        return "cross_reference"
+    return "no_candidates"
@@ -0,0 +1,105 @@
+"""Cross-document cache of per-section LLM results keyed by normalized content."""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Iterable, Sequence
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from ..database import session_scope
+from ..models_db import SectionResult
+
+__all__ = ["lookup_section_results", "section_content_key", "store_section_results"]
+
+_LIST_MARKER = re.compile(
+    r"^\s*(?:"
+    r"[-•*–]\s+"  # bullets
+    r"|\(?(?:[A-Za-z]|[ivxIVX]+)\)\s+"  # a) (b) iv)
+    r"|\d+(?:\.\d+)*[.)]\s+"  # 3. 3) 4.2.
+    r"|\d+(?:\.\d+){2,}\s+"  # 4.2.1
+    # Two-part numbers only before a word: "1.5 mm" is a value, not numbering.
+    r"|\d+\.\d+\s+(?=[A-Z][a-z]{2,})"
+    r")"
+)
+"""Leading list or section markers; abbreviations such as ``Max.`` are content."""
+
+
+def _normalize(lines: Iterable[str]) -> str:
+    normalized: list[str] = []
+    for line in lines:
+        # Section and list numbering differ between documents sharing a section.
+        text = " ".join(_LIST_MARKER.sub("", line).casefold().split())
+        if text:
+            normalized.append(text)
+    return "\n".join(normalized)
+
+
+def section_content_key(
+    lines: Sequence[str], *, namespace: str, model: str, prompt_version: str
+) -> str | None:
+    """Return the cache key of a section's text, or ``None`` when it is empty.
+
+    The key covers the normalized text, the caller ``namespace`` (which
+    prompt family produced the result), its ``prompt_version`` and the model.
+    """
+
+    text = _normalize(lines)
+    if not text:
+        return None
+    digest = hashlib.sha256()
+    for part in (namespace, prompt_version, model, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def lookup_section_results(keys: Iterable[str]) -> dict[str, list[str]]:
+    """Return the cached results for every known key in ``keys``."""
+
+    wanted = sorted(set(keys))
+    if not wanted:
+        return {}
+    found: dict[str, list[str]] = {}
+    with session_scope() as session:
+        statement = select(SectionResult).where(SectionResult.content_key.in_(wanted))
+        for record in session.exec(statement):
+            found[record.content_key] = json.loads(record.payload)
+            record.hit_count += 1
+            session.add(record)
+    return found
+
+
+def store_section_results(
+    results: dict[str, Sequence[str]], *, namespace: str, model: str, prompt_version: str
+) -> None:
+    """Record per-section LLM ``results`` by key; existing entries are kept."""
+
+    if not results:
+        return
+    try:
+        with session_scope() as session:
+            existing = set(
+                session.exec(
+                    select(SectionResult.content_key).where(
+                        SectionResult.content_key.in_(sorted(results))
+                    )
+                )
+            )
+            for key, values in results.items():
+                if key in existing:
+                    continue
+                session.add(
+                    SectionResult(
+                        content_key=key,
+                        namespace=namespace,
+                        model=model,
+                        prompt_version=prompt_version,
+                        payload=json.dumps(list(values), ensure_ascii=False),
+                    )
+                )
+    except IntegrityError:
+        # A concurrent extraction stored some of the same sections first.
+        return
@@ -0,0 +1,427 @@
+"""Retention of stored artifacts: access tracking, age limits and LRU byte quotas."""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+
+from .. import store
+from ..config import Settings, get_settings
+from ..database import session_scope
+from ..logging import get_logger
+from ..metrics import increment
+from ..models_db import StoredFile
+from . import inflight
+from .parse_cache import CACHE_DIR_NAME
+from .search_index import index_objects, index_specs
+
+__all__ = [
+    "STAGES",
+    "SweepResult",
+    "classify",
+    "heartbeat",
+    "scan",
+    "start_sweeper",
+    "stop_sweeper",
+    "storage_stats",
+    "sweep",
+    "touch",
+]
+
+STAGES = (
+    "source",
+    "parsed",
+    "headers",
+    "chunks",
+    "specs",
+    "manifest",
+    "profiles",
+    "cache",
+    "other",
+)
+"""Stages tracked by the retention index."""
+
+_EVICTION_RANK = {"source": 1, "specs": 1, "manifest": 2}
+"""Quota eviction order; unlisted (intermediate) stages rank ``0`` and go first.
+
+Sources and specs cannot be rebuilt cheaply, and the manifest indexes every
+other stage of its document, so it outlives them all.
+"""
+_MANIFEST_NAME = "manifest.json"
+
+_ARTIFACT_STAGE_DIRS = frozenset({"source", "parsed", "headers", "chunks", "specs"})
+_PROFILES_DIR = "_profiles"
+_GRACE_SECONDS = 300.0
+"""Files touched more recently than this are never evicted (they may be in use)."""
+_HEARTBEAT_SECONDS = _GRACE_SECONDS / 3
+"""How often running jobs refresh their access time so other workers spare them."""
+_LEASE_NAME = ".retention.lock"
+"""Lock file under ``ARTIFACTS_DIR``; only the worker holding it sweeps."""
+
+_logger = get_logger(__name__)
+_last_sweep: "SweepResult | None" = None
+_sweeper: asyncio.Task[None] | None = None
+
+
+@dataclass
+class SweepResult:
+    """Outcome of one retention sweep."""
+
+    started_at: float
+    duration_s: float = 0.0
+    deleted_files: int = 0
+    freed_bytes: int = 0
+    deleted_by_stage: dict[str, int] = field(default_factory=dict)
+    remaining_bytes: int = 0
+    skipped: bool = False
+
+
+def _roots(settings: Settings) -> dict[str, Path]:
+    # Read ``store._TMP_DIR`` at call time so a relocated upload store is honoured.
+    return {"uploads": store._TMP_DIR, "artifacts": Path(settings.ARTIFACTS_DIR)}
+
+
+def classify(root: str, relative: Path) -> tuple[str, str] | None:
+    """Return ``(document_id, stage)`` for a file below a retention root.
+
+    Upload-store files are named ``<id>.jsonl``, ``<id>_headers.json`` and
+    ``<id>_specs.jsonl``; artifact files live under ``<id>/<stage>/`` next to
+    ``<id>/manifest.json``. Unrecognised files are left alone.
+    """
+
+    parts = relative.parts
+    if root == "uploads":
+        if len(parts) != 1:
+            return None
+        name = parts[0]
+        for suffix, stage in (
+            ("_specs.jsonl", "specs"),
+            ("_specs.json", "specs"),
+            ("_headers.json", "headers"),
+            (".jsonl", "parsed"),
+        ):
+            if name.endswith(suffix) and len(name) > len(suffix):
+                return name[: -len(suffix)], stage
+        return None
+    if len(parts) < 2:
+        return None
+    if parts[0] == _PROFILES_DIR:
+        return Path(parts[-1]).stem, "profiles"
+    if parts[0] == CACHE_DIR_NAME:
+        return Path(parts[-1]).stem, "cache"
+    if parts[0].startswith((".", "_")):
+        return None
+    if len(parts) > 2 and parts[1] in _ARTIFACT_STAGE_DIRS:
+        return parts[0], parts[1]
+    if len(parts) == 2 and parts[1] == _MANIFEST_NAME:
+        return parts[0], "manifest"
+    return parts[0], "other"
+
+
+def _walk(base: Path) -> Iterator[tuple[Path, os.stat_result]]:
+    if not base.is_dir():
+        return
+    for directory, _, files in os.walk(base):
+        for name in files:
+            if name.endswith((".tmp", ".lock")):
+                continue
+            path = Path(directory) / name
+            try:
+                yield path, path.stat()
+            except FileNotFoundError:
+                continue
+
+
+def scan(settings: Settings | None = None) -> int:
+    """Synchronise the index with the files on disk and return the file count.
+
+    New files start with their mtime as last access; vanished files are dropped.
+    """
+
+    settings = settings or get_settings()
+    count = 0
+    with session_scope() as session:
+        for root, base in _roots(settings).items():
+            known = {
+                record.path: record
+                for record in session.exec(select(StoredFile).where(StoredFile.root == root))
+            }
+            for path, stat in _walk(base):
+                identity = classify(root, path.relative_to(base))
+                if identity is None:
+                    continue
+                count += 1
+                record = known.pop(str(path), None)
+                if record is None:
+                    session.add(
+                        StoredFile(
+                            path=str(path),
+                            root=root,
+                            document_id=identity[0],
+                            stage=identity[1],
+                            size_bytes=stat.st_size,
+                            modified_ts=stat.st_mtime,
+                            accessed_ts=stat.st_mtime,
+                        )
+                    )
+                elif record.size_bytes != stat.st_size or record.modified_ts != stat.st_mtime:
+                    record.size_bytes = stat.st_size
+                    record.modified_ts = stat.st_mtime
+                    record.accessed_ts = max(record.accessed_ts, stat.st_mtime)
+                    session.add(record)
+            for record in known.values():
+                session.delete(record)
+    return count
+
+
+def touch(document_id: str) -> None:
+    """Record that the artifacts of ``document_id`` were just read.
+
+    Best effort: a failure to update the index never fails the request.
+    """
+
+    try:
+        with session_scope() as session:
+            session.execute(
+                update(StoredFile)
+                .where(StoredFile.document_id == document_id)
+                .values(accessed_ts=time.time())
+            )
+    except SQLAlchemyError as exc:
+        _logger.warning("Retention access for %s not recorded: %s", document_id, exc)
+
+
+def heartbeat() -> None:
+    """Refresh the access time of every document with a job running in this process.
+
+    ``inflight`` only sees this worker's jobs; the refreshed access time keeps
+    them inside the eviction grace period for sweeps run by other workers.
+    """
+
+    for document_id in inflight.in_flight():
+        touch(document_id)
+
+
+def _max_age_seconds(settings: Settings, stage: str) -> float | None:
+    limits = settings.RETENTION_MAX_AGE_DAYS
+    days = limits.get(stage, limits.get("*"))
+    return float(days) * 86_400 if days else None
+
+
+def _stage_quota(settings: Settings, stage: str) -> int:
+    limits = settings.RETENTION_STAGE_MAX_BYTES
+    return int(limits.get(stage, limits.get("*", 0)))
+
+
+def _delete(record: StoredFile, result: SweepResult) -> bool:
+    path = Path(record.path)
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as exc:
+        _logger.warning("Retention could not delete %s: %s", path, exc)
+        return False
+    result.deleted_files += 1
+    result.freed_bytes += record.size_bytes
+    result.deleted_by_stage[record.stage] = result.deleted_by_stage.get(record.stage, 0) + 1
+    increment("retention_deleted_files_total", stage=record.stage)
+    increment("retention_freed_bytes_total", record.size_bytes, stage=record.stage)
+    return True
+
+
+def _prune_empty_dirs(paths: list[Path], roots: list[Path]) -> None:
+    stops = {root.resolve() for root in roots}
+    for path in paths:
+        parent = path.parent
+        while parent.exists() and parent.resolve() not in stops:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+
+def sweep(settings: Settings | None = None, *, now: float | None = None) -> SweepResult:
+    """Apply the retention policy once.
+
+    Files past their stage's ``RETENTION_MAX_AGE_DAYS`` (``*`` sets a default)
+    are removed first. Each stage over its ``RETENTION_STAGE_MAX_BYTES`` quota
+    (``*`` again sets a default) then loses its least recently used files.
+    While the total still exceeds ``RETENTION_MAX_BYTES``, files are evicted
+    least recently used first, intermediate stages before ``source`` and
+    ``specs`` and manifests last. Documents with running spec jobs and files
+    used within the last few minutes are never touched.
+
+    Only one process sweeps at a time: when another worker holds the lease the
+    call returns at once with ``skipped`` set.
+    """
+
+    global _last_sweep
+    settings = settings or get_settings()
+    now = time.time() if now is None else now
+    result = SweepResult(started_at=now)
+    heartbeat()
+    lease = Path(settings.ARTIFACTS_DIR) / _LEASE_NAME
+    with store.file_lock(lease, blocking=False) as leased:
+        if not leased:
+            result.skipped = True
+            return result
+        started = time.perf_counter()
+        scan(settings)
+        busy = set(inflight.in_flight())
+        removed: list[Path] = []
+        evicted_stages: set[tuple[str, str]] = set()
+        with session_scope() as session:
+            records = list(session.exec(select(StoredFile)))
+            total = sum(record.size_bytes for record in records)
+
+            def _evictable(record: StoredFile) -> bool:
+                return (
+                    record.document_id not in busy
+                    and now - record.accessed_ts >= _GRACE_SECONDS
+                )
+
+            def _evict(record: StoredFile) -> bool:
+                nonlocal total
+                if not _delete(record, result):
+                    return False
+                total -= record.size_bytes
+                removed.append(Path(record.path))
+                evicted_stages.add((record.document_id, record.stage))
+                session.delete(record)
+                return True
+
+            survivors: list[StoredFile] = []
+            for record in records:
+                limit = _max_age_seconds(settings, record.stage)
+                if limit is not None and now - record.accessed_ts > limit and _evictable(record):
+                    _evict(record)
+                else:
+                    survivors.append(record)
+
+            survivors.sort(key=lambda item: item.accessed_ts)
+            stage_totals: dict[str, int] = {}
+            for record in survivors:
+                stage_totals[record.stage] = stage_totals.get(record.stage, 0) + record.size_bytes
+            kept: list[StoredFile] = []
+            for record in survivors:
+                stage_quota = _stage_quota(settings, record.stage)
+                if (
+                    stage_quota
+                    and stage_totals[record.stage] > stage_quota
+                    and _evictable(record)
+                    and _evict(record)
+                ):
+                    stage_totals[record.stage] -= record.size_bytes
+                else:
+                    kept.append(record)
+
+            quota = settings.RETENTION_MAX_BYTES
+            if quota and total > quota:
+                kept.sort(key=lambda item: (_EVICTION_RANK.get(item.stage, 0), item.accessed_ts))
+                for record in kept:
+                    if total <= quota:
+                        break
+                    if _evictable(record):
+                        _evict(record)
+            result.remaining_bytes = max(total, 0)
+
+        _prune_empty_dirs(removed, list(_roots(settings).values()))
+        # Evicted specs and parsed text must not linger in search results.
+        for document_id, stage in sorted(evicted_stages):
+            if stage == "specs":
+                index_specs(document_id, [])
+            elif stage == "parsed":
+                index_objects(document_id, [])
+        result.duration_s = time.perf_counter() - started
+        _last_sweep = result
+    if result.deleted_files:
+        _logger.info(
+            "Retention sweep removed %d files (%d bytes)", result.deleted_files, result.freed_bytes
+        )
+    return result
+
+
+def storage_stats(settings: Settings | None = None, *, refresh: bool = False) -> dict[str, Any]:
+    """Summarise indexed storage per stage together with the active policy."""
+
+    settings = settings or get_settings()
+    if refresh:
+        scan(settings)
+    stages: dict[str, dict[str, Any]] = {}
+    documents: set[str] = set()
+    with session_scope() as session:
+        for record in session.exec(select(StoredFile)):
+            entry = stages.setdefault(
+                record.stage, {"files": 0, "bytes": 0, "oldest_access": None}
+            )
+            entry["files"] += 1
+            entry["bytes"] += record.size_bytes
+            if entry["oldest_access"] is None or record.accessed_ts < entry["oldest_access"]:
+                entry["oldest_access"] = record.accessed_ts
+            documents.add(record.document_id)
+    return {
+        "roots": {name: str(path) for name, path in _roots(settings).items()},
+        "total_files": sum(entry["files"] for entry in stages.values()),
+        "total_bytes": sum(entry["bytes"] for entry in stages.values()),
+        "documents": len(documents),
+        "stages": stages,
+        "policy": {
+            "max_bytes": settings.RETENTION_MAX_BYTES,
+            "stage_max_bytes": dict(settings.RETENTION_STAGE_MAX_BYTES),
+            "max_age_days": dict(settings.RETENTION_MAX_AGE_DAYS),
+            "sweep_interval_s": settings.RETENTION_SWEEP_INTERVAL_S,
+        },
+        "last_sweep": asdict(_last_sweep) if _last_sweep is not None else None,
+    }
+
+
+async def _sweep_forever(interval: float) -> None:
+    # Every worker runs this loop; the lease in ``sweep`` keeps passes exclusive
+    # while the heartbeat between passes protects this worker's running jobs.
+    tick = min(interval, _HEARTBEAT_SECONDS)
+    elapsed = 0.0
+    while True:
+        await asyncio.sleep(tick)
+        elapsed += tick
+        try:
+            if elapsed >= interval:
+                elapsed = 0.0
+                await run_in_threadpool(sweep)
+            else:
+                await run_in_threadpool(heartbeat)
+        except Exception:  # noqa: BLE001 - the sweeper must outlive one bad pass
+            _logger.exception("Retention sweep failed")
+
+
+def start_sweeper(settings: Settings | None = None) -> None:
+    """Start the periodic background sweep unless its interval is ``0``."""
+
+    global _sweeper
+    interval = (settings or get_settings()).RETENTION_SWEEP_INTERVAL_S
+    if interval <= 0 or (_sweeper is not None and not _sweeper.done()):
+        return
+    _sweeper = asyncio.get_running_loop().create_task(_sweep_forever(interval))
+
+
+async def stop_sweeper() -> None:
+    """Cancel the background sweep started by :func:`start_sweeper`."""
+
+    global _sweeper
+    if _sweeper is None:
+        return
+    _sweeper.cancel()
+    try:
+        await _sweeper
+    except asyncio.CancelledError:
+        pass
+    _sweeper = None
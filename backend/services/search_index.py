@@ -0,0 +1,290 @@
+"""SQLite FTS5 full-text index over extracted specs and parsed text."""
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database import get_engine
+from ..logging import get_logger
+
+__all__ = [
+    "SearchHit",
+    "SearchPage",
+    "SearchUnavailableError",
+    "index_objects",
+    "index_specs",
+    "match_expression",
+    "remove_document",
+    "search",
+]
+
+_TABLE = "search_fts"
+_ROWS = "search_rows"
+"""Maps ``(document_id, kind)`` to FTS rowids; FTS5 cannot index UNINDEXED columns."""
+_SNIPPET_TOKENS = 16
+# Private-use characters delimit matches so the snippet can be escaped before
+# the ``<mark>`` tags are put in.
+_MARK_OPEN = "\ue000"
+_MARK_CLOSE = "\ue001"
+# bm25 weights per column: kind, document_id, ref, section_number, section_name, body.
+_WEIGHTS = (0.0, 0.0, 0.0, 4.0, 2.0, 1.0)
+_TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_PATTERN = re.compile(r"[^\W_]")
+
+_logger = get_logger(__name__)
+_ready: set[tuple[int, str]] = set()
+
+
+class SearchUnavailableError(RuntimeError):
+    """Raised when the configured database cannot host an FTS5 index."""
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One ranked match with a highlighted excerpt.
+
+    ``snippet`` is HTML-escaped with matches wrapped in ``<mark>``; ``text``
+    is the raw indexed text.
+    """
+
+    kind: str
+    document_id: str
+    ref: str | None
+    section_number: str | None
+    section_name: str | None
+    text: str
+    snippet: str
+    score: float
+
+
+@dataclass(frozen=True)
+class SearchPage:
+    """A page of hits together with the total number of matches."""
+
+    total: int
+    items: list[SearchHit]
+
+
+def _ensure_schema(engine: Engine) -> None:
+    key = (id(engine), str(engine.url))
+    if key in _ready:
+        return
+    if engine.dialect.name != "sqlite":
+        raise SearchUnavailableError("Full-text search requires a SQLite database.")
+    try:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {_TABLE} USING fts5("
+                "kind UNINDEXED, document_id UNINDEXED, ref UNINDEXED, "
+                "section_number, section_name, body, "
+                "tokenize = 'porter unicode61')"
+            )
+            exists = connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (_ROWS,)
+            ).first()
+            if exists is None:
+                connection.exec_driver_sql(
+                    f"CREATE TABLE {_ROWS} (fts_rowid INTEGER PRIMARY KEY, "
+                    "document_id TEXT NOT NULL, kind TEXT NOT NULL)"
+                )
+                connection.exec_driver_sql(
+                    f"CREATE INDEX {_ROWS}_document ON {_ROWS} (document_id, kind)"
+                )
+                # Indexes built before the side table existed are adopted once.
+                connection.exec_driver_sql(
+                    f"INSERT INTO {_ROWS} (fts_rowid, document_id, kind) "
+                    f"SELECT rowid, document_id, kind FROM {_TABLE}"
+                )
+    except SQLAlchemyError as exc:
+        raise SearchUnavailableError("SQLite was built without FTS5 support.") from exc
+    _ready.add(key)
+
+
+def _replace_rows(kind: str, document_id: str, rows: list[tuple[Any, ...]]) -> bool:
+    try:
+        engine = get_engine()
+        _ensure_schema(engine)
+        with engine.begin() as connection:
+            # Delete by rowid: filtering the FTS table on UNINDEXED columns
+            # would scan every indexed document.
+            connection.exec_driver_sql(
+                f"DELETE FROM {_TABLE} WHERE rowid IN "
+                f"(SELECT fts_rowid FROM {_ROWS} WHERE document_id = ? AND kind = ?)",
+                (document_id, kind),
+            )
+            connection.exec_driver_sql(
+                f"DELETE FROM {_ROWS} WHERE document_id = ? AND kind = ?", (document_id, kind)
+            )
+            if rows:
+                # The DELETEs above hold SQLite's write lock, so the next rowid is stable.
+                start = connection.exec_driver_sql(
+                    f"SELECT coalesce(max(fts_rowid), 0) + 1 FROM {_ROWS}"
+                ).scalar_one()
+                numbered = [(start + offset, *row) for offset, row in enumerate(rows)]
+                connection.exec_driver_sql(
+                    f"INSERT INTO {_TABLE} "
+                    "(rowid, kind, document_id, ref, section_number, section_name, body) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    numbered,
+                )
+                connection.exec_driver_sql(
+                    f"INSERT INTO {_ROWS} (fts_rowid, document_id, kind) VALUES (?, ?, ?)",
+                    [(rowid, document_id, kind) for rowid, *_ in numbered],
+                )
+    except (SearchUnavailableError, SQLAlchemyError) as exc:
+        # Indexing is best effort; persisting artifacts must not fail on it.
+        _logger.warning("Search indexing of %s %s skipped: %s", kind, document_id, exc)
+        return False
+    return True
+
+
+def index_specs(document_id: str, specs: Iterable[dict[str, Any]]) -> bool:
+    """Replace the indexed specs of ``document_id``.
+
+    Accepts both the upload spec shape (``specification``/``section_name``)
+    and the artifact shape (``spec_text``/``section_title``/``spec_id``).
+    Returns ``False`` when the index is unavailable.
+    """
+
+    rows = []
+    for spec in specs:
+        body = spec.get("specification") or spec.get("spec_text") or ""
+        if not body.strip():
+            continue
+        rows.append(
+            (
+                "spec",
+                document_id,
+                spec.get("spec_id"),
+                spec.get("section_number"),
+                spec.get("section_name") or spec.get("section_title"),
+                body,
+            )
+        )
+    return _replace_rows("spec", document_id, rows)
+
+
+def index_objects(document_id: str, objects: Iterable[dict[str, Any]]) -> bool:
+    """Replace the indexed parsed text of ``document_id``.
+
+    Accepts upload objects (``line_id``/``content``) and artifact objects
+    (``object_id``/``text``). Returns ``False`` when the index is unavailable.
+    """
+
+    rows = []
+    for obj in objects:
+        body = obj.get("content") or obj.get("text") or ""
+        if not body.strip():
+            continue
+        rows.append(("object", document_id, obj.get("line_id") or obj.get("object_id"), None, None, body))
+    return _replace_rows("object", document_id, rows)
+
+
+def remove_document(document_id: str) -> None:
+    """Drop every indexed row of ``document_id``."""
+
+    for kind in ("spec", "object"):
+        _replace_rows(kind, document_id, [])
+
+
+def match_expression(query: str) -> str:
+    """Translate free text into a safe FTS5 ``MATCH`` expression.
+
+    Every term (or ``"quoted phrase"``) becomes a quoted phrase, so input such
+    as ``ASME B31.3`` or ``316L`` never trips the FTS5 query syntax; terms are
+    ANDed and a trailing ``*`` keeps prefix matching.
+    """
+
+    terms: list[str] = []
+    for phrase, word in _TERM_PATTERN.findall(query):
+        term = (phrase if phrase else word.replace('"', "")).strip()
+        prefix = bool(word) and term.endswith("*")
+        term = term.rstrip("*").strip()
+        if not _WORD_PATTERN.search(term):
+            # Punctuation-only terms tokenize to nothing and would match nothing.
+            continue
+        terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms)
+
+
+def _filters(
+    kind: str | None, document_ids: list[str] | None, section: str | None
+) -> tuple[str, list[Any]]:
+    clauses = [f"{_TABLE} MATCH ?"]
+    params: list[Any] = []
+    if kind:
+        clauses.append("kind = ?")
+        params.append(kind)
+    if document_ids:
+        clauses.append(f"document_id IN ({', '.join('?' for _ in document_ids)})")
+        params.extend(document_ids)
+    if section:
+        clauses.append("(section_number = ? OR section_number LIKE ? ESCAPE '\\')")
+        escaped = section.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.extend([section, f"{escaped}.%"])
+    return " AND ".join(clauses), params
+
+
+def _highlight(snippet: str) -> str:
+    """Escape an FTS snippet for HTML and turn the match delimiters into ``<mark>``."""
+
+    return html.escape(snippet).replace(_MARK_OPEN, "<mark>").replace(_MARK_CLOSE, "</mark>")
+
+
+def _run(connection: Connection, sql: str, params: list[Any]) -> list[Any]:
+    return list(connection.exec_driver_sql(sql, tuple(params)))
+
+
+def search(
+    query: str,
+    *,
+    kind: str | None = None,
+    document_ids: list[str] | None = None,
+    section: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> SearchPage:
+    """Return BM25-ranked matches for ``query``.
+
+    ``section`` keeps specs of that section number and its subsections
+    (``3`` matches ``3`` and ``3.1.2``). Section names and numbers weigh more
+    than body text. An empty expression matches nothing.
+    """
+
+    expression = match_expression(query)
+    if not expression:
+        return SearchPage(total=0, items=[])
+    engine = get_engine()
+    _ensure_schema(engine)
+    where, params = _filters(kind, document_ids, section)
+    weights = ", ".join(str(weight) for weight in _WEIGHTS)
+    with engine.connect() as connection:
+        total = _run(connection, f"SELECT count(*) FROM {_TABLE} WHERE {where}", [expression, *params])[0][0]
+        rows = _run(
+            connection,
+            f"SELECT kind, document_id, ref, section_number, section_name, body, "
+            f"snippet({_TABLE}, 5, '{_MARK_OPEN}', '{_MARK_CLOSE}', '…', {_SNIPPET_TOKENS}), "
+            f"bm25({_TABLE}, {weights}) AS score "
+            f"FROM {_TABLE} WHERE {where} ORDER BY score LIMIT ? OFFSET ?",
+            [expression, *params, limit, offset],
+        )
+    items = [
+        SearchHit(
+            kind=row[0],
+            document_id=row[1],
+            ref=row[2],
+            section_number=row[3],
+            section_name=row[4],
+            text=row[5],
+            snippet=_highlight(row[6]),
+            # bm25 is lower-is-better; expose a higher-is-better score.
+            score=-float(row[7]),
+        )
+        for row in rows
+    ]
+    return SearchPage(total=total, items=items)
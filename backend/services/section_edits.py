@@ -0,0 +1,72 @@
+"""Incremental refresh of chunks and specs after section headers are edited."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from ..config import Settings, get_settings
+from ..models import SectionNode, SectionSpec
+from ..profiling import profiled
+from .chunker import ChunkUpdate, load_parsed_objects, run_incremental_chunking
+from .headers import load_persisted_headers, save_sections
+from .llm_client import AsyncLLMAdapter, LLMAdapter
+from .specs import areextract_specs_for_sections
+
+__all__ = ["SectionEditResult", "apply_section_edits"]
+
+
+def _replace_sections(file_id: str, root: SectionNode, settings: Settings) -> ChunkUpdate:
+    try:
+        previous_root: SectionNode | None = load_persisted_headers(file_id)
+    except FileNotFoundError:
+        previous_root = None
+    save_sections(file_id, root)
+    return run_incremental_chunking(file_id, previous_root, root, settings)
+
+
+@dataclass(frozen=True)
+class SectionEditResult:
+    """Outcome of applying an edited section tree."""
+
+    chunks: dict[str, list[str]]
+    changed_sections: list[str]
+    removed_sections: list[str]
+    specs: list[SectionSpec] | None
+
+
+async def apply_section_edits(
+    file_id: str,
+    root: SectionNode,
+    adapter: LLMAdapter | AsyncLLMAdapter | None = None,
+    *,
+    reextract: bool = True,
+) -> SectionEditResult:
+    """Persist ``root`` and refresh only what the edit invalidated.
+
+    Chunks are re-assigned for the leaves whose spans moved, and with
+    ``reextract`` specs are re-extracted only for leaves whose object list
+    changed (concurrently, through ``adapter`` or the heuristic fallback).
+    Leaves without a chunk are re-extracted whenever anything changed,
+    because their fallback text depends on neighbouring leaves. File and
+    chunking work runs in worker threads.
+    """
+
+    settings = get_settings()
+    update = await asyncio.to_thread(profiled(_replace_sections), file_id, root, settings)
+
+    specs: list[SectionSpec] | None = None
+    if reextract:
+        stale = set(update.changed_sections)
+        if stale:
+            stale.update(
+                section_id for section_id, object_ids in update.mapping.items() if not object_ids
+            )
+        objects = await asyncio.to_thread(profiled(load_parsed_objects), file_id, settings)
+        specs = await areextract_specs_for_sections(file_id, root, objects, adapter, stale)
+
+    return SectionEditResult(
+        chunks=update.mapping,
+        changed_sections=sorted(update.changed_sections),
+        removed_sections=sorted(update.removed_sections),
+        specs=specs,
+    )
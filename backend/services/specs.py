@@ -1,42 +1,65 @@
 """Specification extraction loop for phase P4."""
 from __future__ import annotations
 
+import asyncio
 import hashlib
-import json
 import re
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable
+from typing import Collection, Iterable
 
 from ..config import Settings, get_settings
-from ..models import ParsedObject, SectionNode, SpecItem
-from .llm_client import LLMAdapter
-
-__all__ = ["build_specs_prompt", "extract_specs_for_sections"]
-
-_MAX_SECTION_TEXT = 10_000
-_UNIT_PATTERN = re.compile(
-    r"\b\d+(?:\.\d+)?\s?(?:mm|cm|m|in|ft|N|kN|MPa|GPa|°C|°F)\b",
-    re.IGNORECASE,
-)
-_STANDARD_PATTERN = re.compile(r"\b(?:ASME|ISO|DIN|ASTM)\b", re.IGNORECASE)
-_BULLET_PATTERN = re.compile(r"^\s*(?:[-\u2022*]|\d+(?:\.\d+)*[.)]?)")
+from ..metrics import increment, record_llm_call, stage_timer
+from ..models import DocumentObject, SectionNode, SectionSpec
+from ..profiling import profiled
+from ..store import iter_json_array, read_json
+from .candidates import top_candidates
+from .dedup import collapse_specs
+from .llm_client import AsyncLLMAdapter, LLMAdapter, as_async_adapter
+from .manifest import write_artifact_json
+from .prefilter import skip_reason
+from .result_cache import lookup_section_results, section_content_key, store_section_results
+from .search_index import index_specs
+from .tokens import fit_text, get_tokenizer, prompt_budget, split_windows
+
+__all__ = [
+    "aextract_specs_for_sections",
+    "areextract_specs_for_sections",
+    "build_specs_prompt",
+    "extract_specs_for_sections",
+    "reextract_specs_for_sections",
+]
+
+_WINDOW_OVERLAP = 0.1
+_PROMPT_VERSION = "1"
+"""Bump whenever ``build_specs_prompt`` changes so cached section results expire."""
+_CACHE_NAMESPACE = "artifact-specs"
 
 
 def _load_chunks(file_id: str, settings: Settings) -> dict[str, list[str]]:
     target = Path(settings.ARTIFACTS_DIR) / file_id / "chunks" / "chunks.json"
     if not target.exists():
         raise FileNotFoundError("chunks_missing")
-    with target.open("r", encoding="utf-8") as handle:
-        data = json.load(handle)
+    data = read_json(target)
     return {key: list(value) for key, value in data.items()}
 
 
-def _persist_specs(file_id: str, specs: Iterable[SpecItem], settings: Settings) -> None:
-    base = Path(settings.ARTIFACTS_DIR) / file_id / "specs"
-    base.mkdir(parents=True, exist_ok=True)
-    payload = [item.model_dump(mode="json") for item in specs]
-    with (base / "specs.json").open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
+def _persist_specs(
+    file_id: str,
+    specs: Iterable[SectionSpec],
+    settings: Settings,
+    skipped: list[dict[str, str]] | None = None,
+) -> None:
+    base = Path(settings.ARTIFACTS_DIR) / file_id
+    # Written before the specs so the QA report never pairs new specs with
+    # a stale skip list.
+    write_artifact_json(base, "specs/skipped.json", skipped or [])
+    # Persist in export order so exports can stream specs straight from disk.
+    ordered = sorted(specs, key=lambda item: (item.section_title, item.spec_id))
+    payload = [item.model_dump(mode="json") for item in ordered]
+    write_artifact_json(base, "specs/specs.json", payload)
+    index_specs(file_id, payload)
 
 
 def _iter_leaves(root: SectionNode) -> Iterable[SectionNode]:
@@ -47,7 +70,7 @@ def _iter_leaves(root: SectionNode) -> Iterable[SectionNode]:
         yield from _iter_leaves(child)
 
 
-def _sorted_objects(objects: Iterable[ParsedObject]) -> list[ParsedObject]:
+def _sorted_objects(objects: Iterable[DocumentObject]) -> list[DocumentObject]:
     return sorted(objects, key=lambda obj: ((obj.page_index or 0), obj.order_index))
 
 
@@ -72,28 +95,7 @@ def _parse_llm_response(payload: str) -> list[str]:
     return lines
 
 
-def _fallback_candidates(section_text: str) -> list[str]:
-    matches: list[str] = []
-    for raw in section_text.splitlines():
-        stripped = raw.strip()
-        if not stripped:
-            continue
-        if (
-            _UNIT_PATTERN.search(stripped)
-            or _STANDARD_PATTERN.search(stripped)
-            or _BULLET_PATTERN.match(stripped)
-        ):
-            normalized = _normalize_line(stripped)
-            if normalized:
-                matches.append(normalized)
-        if len(matches) >= 5:
-            break
-    return matches
-
-
-
-
-def _find_heading_index(section: SectionNode, objects: list[ParsedObject]) -> int | None:
+def _find_heading_index(section: SectionNode, objects: list[DocumentObject]) -> int | None:
     target = _normalize_line(section.title).lower()
     if not target:
         return None
@@ -110,7 +112,7 @@ def _find_heading_index(section: SectionNode, objects: list[ParsedObject]) -> in
 def _build_fallback_mapping(
     leaves: list[SectionNode],
     chunk_map: dict[str, list[str]],
-    ordered_objects: list[ParsedObject],
+    ordered_objects: list[DocumentObject],
     order_index: dict[str, int],
 ) -> dict[str, list[str]]:
     start_positions: list[tuple[str, int, bool]] = []
@@ -142,41 +144,270 @@ def _build_fallback_mapping(
         if not has_chunks and leaves:
             fallback[leaves[0].section_id] = [obj.object_id for obj in ordered_objects]
     return fallback
-def build_specs_prompt(section: SectionNode, text: str) -> str:
-    """Construct the deterministic prompt for a section."""
 
+
+def _specs_prompt_header(section: SectionNode) -> str:
     section_number = section.number or "N/A"
-    truncated_text = text[:_MAX_SECTION_TEXT]
     return (
         "You are extracting mechanical engineering specifications.\n"
         f'Section: "{section.title}" (Number: {section_number})\n'
         "Provide a concise bullet list of each mechanical engineering specification found in this section.\n"
         "Return each spec on its own line; do not include commentary.\n\n"
-        f"{truncated_text}"
     )
 
 
+def _section_budget(section: SectionNode, model: str | None) -> int:
+    return prompt_budget(model, template=_specs_prompt_header(section))
+
+
+def build_specs_prompt(section: SectionNode, text: str, *, model: str | None = None) -> str:
+    """Construct the deterministic prompt for a section.
+
+    ``text`` is cut to the token budget left in ``model``'s context window;
+    callers split oversize sections beforehand so nothing is dropped.
+    """
+
+    budget = _section_budget(section, model)
+    return _specs_prompt_header(section) + fit_text(text, budget, get_tokenizer(model))
+
+
 def extract_specs_for_sections(
     file_id: str,
     root: SectionNode,
-    objects: list[ParsedObject],
+    objects: list[DocumentObject],
     adapter: LLMAdapter,
-) -> list[SpecItem]:
+) -> list[SectionSpec]:
     """Iterate document leaves, run the adapter, and persist specs."""
 
-    settings = get_settings()
+    with stage_timer("spec_extraction", file_id) as timing:
+        specs = _extract_specs(file_id, root, objects, adapter)
+        timing["spec_count"] = len(specs)
+    return specs
+
+
+async def aextract_specs_for_sections(
+    file_id: str,
+    root: SectionNode,
+    objects: list[DocumentObject],
+    adapter: LLMAdapter | AsyncLLMAdapter | None,
+    *,
+    concurrency: int | None = None,
+) -> list[SectionSpec]:
+    """Async counterpart of :func:`extract_specs_for_sections`.
+
+    Sections are sent to the adapter concurrently, at most ``concurrency``
+    (default ``LLM_CONCURRENCY``) at a time, and the results are assembled in
+    document order so the output matches the serial loop. Synchronous
+    adapters run in worker threads; without an adapter the heuristic
+    fallback is used for every section.
+    """
+
+    with stage_timer("spec_extraction", file_id, mode="async") as timing:
+        specs = await _aextract_specs(file_id, root, objects, adapter, concurrency=concurrency)
+        timing["spec_count"] = len(specs)
+    return specs
+
+
+def _reused_specs(
+    file_id: str, root: SectionNode, section_ids: Collection[str], settings: Settings
+) -> list[SectionSpec] | None:
+    existing_path = Path(settings.ARTIFACTS_DIR) / file_id / "specs" / "specs.json"
+    if not existing_path.exists():
+        return None
+    leaves = {leaf.section_id: leaf for leaf in _iter_leaves(root)}
+    reused: list[SectionSpec] = []
+    for item in iter_json_array(existing_path):
+        # Written by ``_persist_specs`` from validated specs.
+        spec = SectionSpec.model_construct(**item)
+        leaf = leaves.get(spec.section_id)
+        if leaf is None or spec.section_id in section_ids:
+            continue
+        reused.append(
+            spec.model_copy(update={"section_number": leaf.number, "section_title": leaf.title})
+        )
+    return reused
+
+
+def reextract_specs_for_sections(
+    file_id: str,
+    root: SectionNode,
+    objects: list[DocumentObject],
+    adapter: LLMAdapter,
+    section_ids: Collection[str],
+) -> list[SectionSpec]:
+    """Re-run extraction for ``section_ids`` only and keep all other specs.
+
+    Persisted specs of untouched leaves are reused with their spec IDs; only
+    their section number and title are refreshed from ``root``. Specs of
+    leaves that no longer exist are dropped. Without persisted specs this is
+    a full extraction.
+    """
+
+    reused = _reused_specs(file_id, root, section_ids, get_settings())
+    if reused is None:
+        return extract_specs_for_sections(file_id, root, objects, adapter)
+    with stage_timer("spec_extraction", file_id, mode="incremental") as timing:
+        specs = _extract_specs(
+            file_id, root, objects, adapter, only=set(section_ids), reused=reused
+        )
+        timing["spec_count"] = len(specs)
+        timing["reused_count"] = len(reused)
+    return specs
+
+
+async def areextract_specs_for_sections(
+    file_id: str,
+    root: SectionNode,
+    objects: list[DocumentObject],
+    adapter: LLMAdapter | AsyncLLMAdapter | None,
+    section_ids: Collection[str],
+    *,
+    concurrency: int | None = None,
+) -> list[SectionSpec]:
+    """Async counterpart of :func:`reextract_specs_for_sections`."""
+
+    reused = await asyncio.to_thread(profiled(_reused_specs), file_id, root, section_ids, get_settings())
+    if reused is None:
+        return await aextract_specs_for_sections(
+            file_id, root, objects, adapter, concurrency=concurrency
+        )
+    with stage_timer("spec_extraction", file_id, mode="incremental") as timing:
+        specs = await _aextract_specs(
+            file_id,
+            root,
+            objects,
+            adapter,
+            concurrency=concurrency,
+            only=set(section_ids),
+            reused=reused,
+        )
+        timing["spec_count"] = len(specs)
+        timing["reused_count"] = len(reused)
+    return specs
+
+
+@dataclass(frozen=True)
+class _SectionJob:
+    section: SectionNode
+    object_ids: list[str]
+    text: str
+    content_key: str | None = None
+
+
+def _cache_identity(adapter: object | None, settings: Settings) -> str | None:
+    """Return the model identity cached results are keyed on, if cacheable.
+
+    Only adapters that name their model take part; stub and test adapters
+    without one never read or write the shared cache.
+    """
+
+    model = getattr(adapter, "model", None)
+    if adapter is None or not model or not settings.SPEC_RESULT_CACHE:
+        return None
+    return f"{getattr(adapter, 'name', type(adapter).__name__)}:{model}"
+
+
+def _cached_results(jobs: list[_SectionJob]) -> dict[str, list[str]]:
+    keys = {job.content_key for job in jobs if job.content_key}
+    if not keys:
+        return {}
+    cached = lookup_section_results(keys)
+    increment("section_cache_total", len(cached), scope="specs", outcome="hit")
+    increment("section_cache_total", len(keys) - len(cached), scope="specs", outcome="miss")
+    return cached
+
+
+def _merge_cached(
+    jobs: list[_SectionJob], responses: list[str], cached: dict[str, list[str]]
+) -> list[tuple[_SectionJob, str]]:
+    """Pair jobs with responses, replaying cached sections in their place.
+
+    Cached results carry no object IDs; replayed specs take the object IDs of
+    the section in this document.
+    """
+
+    results: list[tuple[_SectionJob, str]] = []
+    replayed: set[str] = set()
+    for job, response in zip(jobs, responses):
+        if job.content_key in cached:
+            if job.section.section_id not in replayed:
+                replayed.add(job.section.section_id)
+                results.extend((job, value) for value in cached[job.content_key])
+            continue
+        results.append((job, response))
+    return results
+
+
+def _remember_results(
+    jobs: list[_SectionJob],
+    responses: list[str],
+    cached: dict[str, list[str]],
+    identity: str | None,
+) -> None:
+    """Cache the responses of fully answered sections for other documents."""
+
+    if identity is None:
+        return
+    owners: dict[str, str] = {}
+    collected: dict[str, list[str]] = {}
+    failed: set[str] = set()
+    for job, response in zip(jobs, responses):
+        key = job.content_key
+        if not key or key in cached:
+            continue
+        # Identical sections within one document are stored once.
+        if owners.setdefault(key, job.section.section_id) != job.section.section_id:
+            continue
+        if not response.strip():
+            failed.add(key)
+            continue
+        collected.setdefault(key, []).append(response)
+    store_section_results(
+        {key: values for key, values in collected.items() if key not in failed},
+        namespace=_CACHE_NAMESPACE,
+        model=identity,
+        prompt_version=_PROMPT_VERSION,
+    )
+
+
+def _section_jobs(
+    file_id: str,
+    root: SectionNode,
+    objects: list[DocumentObject],
+    settings: Settings,
+    only: set[str] | None,
+    model: str | None = None,
+    cache_identity: str | None = None,
+) -> tuple[list[_SectionJob], list[dict[str, str]]]:
+    """Return the leaves to extract, in document order, with their text.
+
+    Sections whose text exceeds the prompt budget of ``model`` become several
+    overlapping windows cut at object boundaries; the windows share the
+    section's ``source_object_ids`` so specs repeated in an overlap collapse
+    in :func:`_assemble_specs`.
+
+    With ``SPEC_PREFILTER`` every leaf (not only those in ``only``) is also
+    classified locally; the second value lists the leaves that need no LLM
+    call and why. With a ``cache_identity`` every job carries the content key
+    of its whole section for the cross-document result cache.
+    """
+
+    tokenizer = get_tokenizer(model)
+
     chunk_map = _load_chunks(file_id, settings)
     indexed_objects = {obj.object_id: obj for obj in objects}
     ordered_objects = _sorted_objects(objects)
     order_index = {obj.object_id: idx for idx, obj in enumerate(ordered_objects)}
 
-    specs: list[SpecItem] = []
-    seen_pairs: set[tuple[tuple[str, ...], str]] = set()
-
     leaves = list(_iter_leaves(root))
     fallback_map = _build_fallback_mapping(leaves, chunk_map, ordered_objects, order_index)
 
+    jobs: list[_SectionJob] = []
+    skipped: list[dict[str, str]] = []
     for section in leaves:
+        selected = only is None or section.section_id in only
+        if not selected and not settings.SPEC_PREFILTER:
+            continue
         object_ids = chunk_map.get(section.section_id, [])
         if not object_ids:
             object_ids = fallback_map.get(section.section_id, [])
@@ -196,28 +427,67 @@ def extract_specs_for_sections(
             text = (obj.text or "").strip()
             if text:
                 section_lines.append(text)
-        if not section_lines:
+        if settings.SPEC_PREFILTER:
+            reason = skip_reason(section.title, "\n".join(section_lines))
+            if reason is not None:
+                skipped.append(
+                    {
+                        "section_id": section.section_id,
+                        "section_number": section.number or "",
+                        "section_title": section.title,
+                        "reason": reason,
+                    }
+                )
+                continue
+        if not section_lines or not selected:
             continue
-        section_text = "\n".join(section_lines)
-        prompt = build_specs_prompt(section, section_text)
-        try:
-            response = adapter.generate(prompt)
-        except Exception:
-            response = ""
+        content_key = None
+        if cache_identity is not None:
+            content_key = section_content_key(
+                section_lines,
+                namespace=_CACHE_NAMESPACE,
+                model=cache_identity,
+                prompt_version=_PROMPT_VERSION,
+            )
+        windows = split_windows(
+            section_lines, _section_budget(section, model), tokenizer, overlap=_WINDOW_OVERLAP
+        )
+        for window in windows:
+            jobs.append(_SectionJob(section, sorted_ids, window, content_key))
+    return jobs, skipped
+
+
+def _assemble_specs(
+    file_id: str,
+    results: Iterable[tuple[_SectionJob, str]],
+    reused: Iterable[SectionSpec],
+) -> list[SectionSpec]:
+    """Turn adapter responses into specs near-deduplicated within each section."""
+
+    specs: list[SectionSpec] = list(reused)
+    seen_pairs: set[tuple[tuple[str, ...], str]] = {
+        (tuple(item.source_object_ids), item.spec_text.lower()) for item in specs
+    }
+    next_index: dict[str, int] = {}
+    for job, response in results:
+        section = job.section
         response_lines = _parse_llm_response(response) if response.strip() else []
-        candidates = response_lines or _fallback_candidates(section_text)
-        for index, candidate in enumerate(candidates):
+        candidates = response_lines or top_candidates(job.text)
+        # Split sections keep numbering candidates across their parts.
+        first_index = next_index.get(section.section_id, 0)
+        next_index[section.section_id] = first_index + len(candidates)
+        for index, candidate in enumerate(candidates, start=first_index):
             spec_text = candidate
             if not spec_text:
                 continue
             spec_id_seed = f"{file_id}|{section.section_id}|{index}|{spec_text}"
             spec_id = hashlib.sha1(spec_id_seed.encode("utf-8")).hexdigest()
-            dedup_key = (tuple(sorted_ids), spec_text.lower())
+            dedup_key = (tuple(job.object_ids), spec_text.lower())
             if dedup_key in seen_pairs:
                 continue
             seen_pairs.add(dedup_key)
             specs.append(
-                SpecItem(
+                SectionSpec(
                     spec_id=spec_id,
                     file_id=file_id,
                     section_id=section.section_id,
@@ -225,9 +495,95 @@ def extract_specs_for_sections(
                     section_title=section.title,
                     spec_text=spec_text,
                     confidence=None,
-                    source_object_ids=list(sorted_ids),
+                    source_object_ids=list(job.object_ids),
                 )
             )
+    # Window overlaps and paraphrase leave near-duplicates that the exact key
+    # above misses. Collapse per section: a requirement repeated in another
+    # section belongs there too, with that section's provenance.
+    by_section: dict[str, list[SectionSpec]] = {}
+    for spec in specs:
+        by_section.setdefault(spec.section_id, []).append(spec)
+    return [kept for section_specs in by_section.values() for kept in collapse_specs(section_specs)]
+
 
-    _persist_specs(file_id, specs, settings)
+def _extract_specs(
+    file_id: str,
+    root: SectionNode,
+    objects: list[DocumentObject],
+    adapter: LLMAdapter,
+    *,
+    only: set[str] | None = None,
+    reused: Iterable[SectionSpec] = (),
+) -> list[SectionSpec]:
+    settings = get_settings()
+    provider_name = type(adapter).__name__
+    model = getattr(adapter, "model", None)
+    identity = _cache_identity(adapter, settings)
+    jobs, skipped = _section_jobs(file_id, root, objects, settings, only, model, identity)
+    cached = _cached_results(jobs)
+    responses: list[str] = []
+    for job in jobs:
+        if job.content_key in cached:
+            responses.append("")
+            continue
+        prompt = build_specs_prompt(job.section, job.text, model=model)
+        started = time.perf_counter()
+        try:
+            response = adapter.generate(prompt)
+        except Exception:
+            record_llm_call(provider_name, time.perf_counter() - started, outcome="error")
+            response = ""
+        else:
+            record_llm_call(provider_name, time.perf_counter() - started)
+        responses.append(response)
+
+    _remember_results(jobs, responses, cached, identity)
+    specs = _assemble_specs(file_id, _merge_cached(jobs, responses, cached), reused)
+    _persist_specs(file_id, specs, settings, skipped)
+    return specs
+
+
+async def _aextract_specs(
+    file_id: str,
+    root: SectionNode,
+    objects: list[DocumentObject],
+    adapter: LLMAdapter | AsyncLLMAdapter | None,
+    *,
+    concurrency: int | None = None,
+    only: set[str] | None = None,
+    reused: Iterable[SectionSpec] = (),
+) -> list[SectionSpec]:
+    settings = get_settings()
+    async_adapter = as_async_adapter(adapter) if adapter is not None else None
+    model = getattr(async_adapter, "model", None)
+    identity = _cache_identity(async_adapter, settings)
+    jobs, skipped = await asyncio.to_thread(
+        profiled(_section_jobs), file_id, root, objects, settings, only, model, identity
+    )
+    cached = await asyncio.to_thread(profiled(_cached_results), jobs)
+    provider_name = getattr(async_adapter, "name", type(async_adapter).__name__)
+    record = not getattr(async_adapter, "records_calls", False)
+    semaphore = asyncio.Semaphore(concurrency or settings.LLM_CONCURRENCY)
+
+    async def _generate(job: _SectionJob) -> str:
+        if async_adapter is None or job.content_key in cached:
+            return ""
+        prompt = build_specs_prompt(job.section, job.text, model=model)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await async_adapter.agenerate(prompt)
+            except Exception:
+                if record:
+                    record_llm_call(provider_name, time.perf_counter() - started, outcome="error")
+                return ""
+        if record:
+            record_llm_call(provider_name, time.perf_counter() - started)
+        return response if isinstance(response, str) else ""
+
+    responses = list(await asyncio.gather(*(_generate(job) for job in jobs)))
+    await asyncio.to_thread(profiled(_remember_results), jobs, responses, cached, identity)
+    specs = _assemble_specs(file_id, _merge_cached(jobs, responses, cached), reused)
+    await asyncio.to_thread(profiled(_persist_specs), file_id, specs, settings, skipped)
     return specs
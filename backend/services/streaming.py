@@ -0,0 +1,52 @@
+"""Helpers for streaming large responses chunk by chunk."""
+from __future__ import annotations
+
+import zlib
+from typing import Iterable, Iterator
+
+__all__ = ["accepts_gzip", "batch_chunks", "gzip_chunks"]
+
+_FLUSH_BYTES = 64 * 1024
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Return whether an ``Accept-Encoding`` header allows gzip."""
+
+    if not accept_encoding:
+        return False
+    for token in accept_encoding.split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() not in {"gzip", "*"}:
+            continue
+        quality = params.strip()
+        if quality.startswith("q=") and quality[2:].strip() in {"0", "0.0", "0.00", "0.000"}:
+            return False
+        return True
+    return False
+
+
+def batch_chunks(chunks: Iterable[bytes], size: int = _FLUSH_BYTES) -> Iterator[bytes]:
+    """Coalesce small chunks into writes of roughly ``size`` bytes."""
+
+    pending: list[bytes] = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= size:
+            yield b"".join(pending)
+            pending.clear()
+            pending_size = 0
+    if pending:
+        yield b"".join(pending)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-compress ``chunks`` incrementally with flat memory."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
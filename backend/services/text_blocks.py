@@ -64,8 +64,16 @@ def _find_line_index(lines: Sequence[str], header: HeaderItem) -> int:
 def section_text(lines: Sequence[str], headers: Sequence[HeaderItem], header: HeaderItem) -> str:
     """Return the best-effort text for a header section."""
 
+    return "\n".join(section_lines(lines, headers, header)).strip()
+
+
+def section_lines(
+    lines: Sequence[str], headers: Sequence[HeaderItem], header: HeaderItem
+) -> list[str]:
+    """Return the document lines belonging to a header section."""
+
     if not lines:
-        return ""
+        return []
 
     start_index = _find_line_index(lines, header)
     try:
@@ -86,5 +94,4 @@ def section_text(lines: Sequence[str], headers: Sequence[HeaderItem], header: He
     if next_index <= start_index:
         next_index = len(lines)
 
-    extracted = lines[start_index:next_index]
-    return "\n".join(extracted).strip()
+    return list(lines[start_index:next_index])
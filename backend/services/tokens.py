@@ -0,0 +1,321 @@
+"""Token counting and prompt budgeting against model context windows."""
+from __future__ import annotations
+
+import math
+import threading
+from typing import Any, Protocol, Sequence
+
+from ..config import get_settings
+from ..constants import MAX_TOKENS_LIMIT
+from ..logging import get_logger
+from .capabilities import optional_import
+
+__all__ = [
+    "DEFAULT_CONTEXT_WINDOW",
+    "EstimatingTokenizer",
+    "Tokenizer",
+    "calibrate",
+    "context_window",
+    "fit_text",
+    "get_tokenizer",
+    "prompt_budget",
+    "register_tokenizer",
+    "split_text",
+    "split_windows",
+]
+
+DEFAULT_CONTEXT_WINDOW = 8_192
+"""Context window assumed for models missing from the table below."""
+
+_CONTEXT_WINDOWS: tuple[tuple[str, int], ...] = (
+    ("gpt-4o", 128_000),
+    ("gpt-4.1", 1_000_000),
+    ("gpt-4-turbo", 128_000),
+    ("gpt-3.5", 16_385),
+    ("claude", 200_000),
+    ("gemini", 1_000_000),
+    ("llama-3.1", 128_000),
+    ("llama3.1", 128_000),
+    ("llama-3", 8_192),
+    ("llama3", 8_192),
+    ("mistral", 32_768),
+    ("mixtral", 32_768),
+    ("qwen", 32_768),
+    ("deepseek", 64_000),
+    ("gemma", 8_192),
+    ("phi", 4_096),
+)
+"""Known context windows matched by substring of the lowercased model name."""
+
+_CHARS_PER_TOKEN: tuple[tuple[str, float], ...] = (
+    ("gpt", 4.0),
+    ("claude", 3.5),
+    ("llama", 3.6),
+    ("mistral", 3.5),
+    ("mixtral", 3.5),
+    ("qwen", 3.7),
+)
+_DEFAULT_CHARS_PER_TOKEN = 3.5
+_PROMPT_MARGIN = 0.05
+"""Fraction of the window held back to absorb estimation error and chat framing."""
+
+
+class Tokenizer(Protocol):
+    """Counts the tokens a model would see for ``text``."""
+
+    def count(self, text: str) -> int:
+        """Return the number of tokens in ``text``."""
+
+
+class EstimatingTokenizer:
+    """Character-ratio estimator refined from provider-reported usage."""
+
+    def __init__(self, chars_per_token: float = _DEFAULT_CHARS_PER_TOKEN) -> None:
+        self.chars_per_token = chars_per_token
+        self._lock = threading.Lock()
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def calibrate(self, characters: int, tokens: int, *, weight: float = 0.2) -> None:
+        """Blend an observed characters-per-token ratio into the estimate."""
+
+        if characters <= 0 or tokens <= 0:
+            return
+        observed = characters / tokens
+        with self._lock:
+            self.chars_per_token += weight * (observed - self.chars_per_token)
+
+
+class _TiktokenTokenizer:
+    def __init__(self, encoding: Any) -> None:
+        self._encoding = encoding
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+_logger = get_logger(__name__)
+_UNKNOWN_WINDOW_WARNED: set[str] = set()
+
+_REGISTERED: dict[str, Tokenizer] = {}
+_ESTIMATORS: dict[str, EstimatingTokenizer] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _family(model: str | None) -> str:
+    return (model or "").lower()
+
+
+def register_tokenizer(model_prefix: str, tokenizer: Tokenizer) -> None:
+    """Use ``tokenizer`` for every model whose name starts with ``model_prefix``."""
+
+    with _REGISTRY_LOCK:
+        _REGISTERED[model_prefix.lower()] = tokenizer
+
+
+def _tiktoken_for(model: str) -> Tokenizer | None:
+    if "gpt" not in model:
+        return None
+    tiktoken = optional_import("tiktoken")
+    if tiktoken is None:
+        return None
+    name = model.rsplit("/", 1)[-1]
+    try:
+        encoding = tiktoken.encoding_for_model(name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return _TiktokenTokenizer(encoding)
+
+
+def get_tokenizer(model: str | None) -> Tokenizer:
+    """Return the tokenizer for ``model``.
+
+    Registered tokenizers win, then ``tiktoken`` for OpenAI models when it is
+    installed, then a per-family estimator calibrated from observed usage.
+    """
+
+    key = _family(model)
+    with _REGISTRY_LOCK:
+        for prefix, tokenizer in _REGISTERED.items():
+            if key.startswith(prefix):
+                return tokenizer
+        estimator = _ESTIMATORS.get(key)
+        if estimator is not None:
+            return estimator
+    exact = _tiktoken_for(key)
+    if exact is not None:
+        register_tokenizer(key, exact)
+        return exact
+    ratio = next((value for name, value in _CHARS_PER_TOKEN if name in key), _DEFAULT_CHARS_PER_TOKEN)
+    with _REGISTRY_LOCK:
+        return _ESTIMATORS.setdefault(key, EstimatingTokenizer(ratio))
+
+
+def calibrate(model: str | None, characters: int, prompt_tokens: int | None) -> None:
+    """Feed a provider-reported prompt token count back into the estimator."""
+
+    if not prompt_tokens:
+        return
+    tokenizer = get_tokenizer(model)
+    if isinstance(tokenizer, EstimatingTokenizer):
+        tokenizer.calibrate(characters, int(prompt_tokens))
+
+
+def context_window(model: str | None, params: dict[str, Any] | None = None) -> int:
+    """Return the context window for ``model`` in tokens.
+
+    ``num_ctx``/``context_window`` request parameters win over the
+    ``LLM_CONTEXT_WINDOW`` setting, which wins over the built-in table.
+    """
+
+    for key in ("context_window", "num_ctx"):
+        value = (params or {}).get(key)
+        if isinstance(value, int) and value > 0:
+            return value
+    configured = get_settings().LLM_CONTEXT_WINDOW
+    if configured:
+        return configured
+    name = _family(model)
+    size = next((size for key, size in _CONTEXT_WINDOWS if key in name), None)
+    if size is not None:
+        return size
+    if name and name not in _UNKNOWN_WINDOW_WARNED:
+        # A too-small window silently turns one LLM call into many.
+        _UNKNOWN_WINDOW_WARNED.add(name)
+        _logger.warning(
+            "Unknown context window for model %r; budgeting prompts for %d tokens. "
+            "Set LLM_CONTEXT_WINDOW (or pass num_ctx) for this model.",
+            model,
+            DEFAULT_CONTEXT_WINDOW,
+        )
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def prompt_budget(
+    model: str | None,
+    *,
+    template: str = "",
+    params: dict[str, Any] | None = None,
+) -> int:
+    """Return the tokens left for variable prompt text.
+
+    The window is reduced by the completion reservation (``max_tokens`` or
+    ``MAX_TOKENS_LIMIT``, capped at half the window), the fixed
+    ``template`` and a small safety margin.
+    """
+
+    window = context_window(model, params)
+    requested = (params or {}).get("max_tokens") or MAX_TOKENS_LIMIT
+    reserved = min(int(requested), window // 2)
+    margin = int(window * _PROMPT_MARGIN)
+    fixed = get_tokenizer(model).count(template)
+    return max(window - reserved - margin - fixed, 0)
+
+
+def fit_text(text: str, budget: int, tokenizer: Tokenizer) -> str:
+    """Return the longest prefix of ``text`` within ``budget`` tokens.
+
+    The cut falls on a line boundary whenever one exists in the kept part.
+    """
+
+    if tokenizer.count(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if tokenizer.count(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = text[:low]
+    newline = prefix.rfind("\n")
+    return prefix[:newline] if newline > 0 else prefix
+
+
+def split_text(text: str, budget: int, tokenizer: Tokenizer) -> list[str]:
+    """Split ``text`` on line boundaries into parts of at most ``budget`` tokens.
+
+    A single line longer than the budget is cut into budget-sized pieces.
+    """
+
+    if budget <= 0:
+        return [text] if text else []
+    if tokenizer.count(text) <= budget:
+        return [text] if text else []
+    parts: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+    for line in text.splitlines():
+        line_tokens = tokenizer.count(line) + 1
+        if line_tokens > budget:
+            if current:
+                parts.append("\n".join(current))
+                current, current_tokens = [], 0
+            remainder = line
+            while remainder:
+                piece = fit_text(remainder, budget, tokenizer) or remainder[:1]
+                parts.append(piece)
+                remainder = remainder[len(piece):]
+            continue
+        if current and current_tokens + line_tokens > budget:
+            parts.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        parts.append("\n".join(current))
+    return parts
+
+
+def split_windows(
+    units: Sequence[str],
+    budget: int,
+    tokenizer: Tokenizer,
+    *,
+    overlap: float = 0.1,
+) -> list[str]:
+    """Pack consecutive ``units`` (objects, paragraphs) into token-bounded windows.
+
+    Windows never cut inside a unit unless the unit alone exceeds ``budget``,
+    in which case it is split on line boundaries. Each window after the first
+    repeats trailing units of its predecessor worth up to ``overlap`` of the
+    budget, so statements spanning a cut are seen whole at least once.
+    Text that fits the budget comes back as a single window.
+    """
+
+    pieces: list[tuple[str, int]] = []
+    for unit in units:
+        if not unit:
+            continue
+        cost = tokenizer.count(unit) + 1
+        if budget > 0 and cost > budget:
+            pieces.extend((part, tokenizer.count(part) + 1) for part in split_text(unit, budget - 1, tokenizer))
+        else:
+            pieces.append((unit, cost))
+    if not pieces:
+        return []
+    if budget <= 0 or sum(cost for _, cost in pieces) <= budget:
+        return ["\n".join(text for text, _ in pieces)]
+
+    overlap_budget = int(budget * overlap)
+    windows: list[str] = []
+    start = 0
+    while start < len(pieces):
+        end = start
+        used = 0
+        while end < len(pieces) and (end == start or used + pieces[end][1] <= budget):
+            used += pieces[end][1]
+            end += 1
+        windows.append("\n".join(text for text, _ in pieces[start:end]))
+        if end >= len(pieces):
+            break
+        carried = 0
+        next_start = end
+        while next_start - 1 > start and carried + pieces[next_start - 1][1] <= overlap_budget:
+            next_start -= 1
+            carried += pieces[next_start][1]
+        start = next_start
+    return windows
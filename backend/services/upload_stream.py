@@ -0,0 +1,141 @@
+"""Streaming receiver shared by the upload endpoints."""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import Settings, get_settings
+
+__all__ = ["ReceivedUpload", "UploadLimitMiddleware", "max_upload_bytes", "receive_upload"]
+
+_CHUNK_SIZE = 1024 * 1024
+_LIMITED_PATHS = frozenset({"/api/upload", "/ingest"})
+"""Single-file upload routes; batch uploads enforce the limit per file instead."""
+_MULTIPART_OVERHEAD = 64 * 1024
+"""Allowance for multipart boundaries, part headers and small form fields."""
+_TOO_LARGE = "File exceeds maximum allowed size."
+
+
+@dataclass(frozen=True)
+class ReceivedUpload:
+    """Location, size and content hash of a streamed upload."""
+
+    path: Path
+    size: int
+    sha256: str
+
+
+def max_upload_bytes(settings: Settings) -> int:
+    """Return the configured upload limit in bytes."""
+
+    return settings.MAX_FILE_MB * 1024 * 1024
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadLimitMiddleware:
+    """Reject oversize single-file uploads before Starlette spools them.
+
+    A declared ``Content-Length`` above the limit is answered with ``413``
+    without reading the body; otherwise the body is counted as it arrives and
+    the transfer is cut off once it exceeds the limit.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in _LIMITED_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_upload_bytes(get_settings()) + _MULTIPART_OVERHEAD
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await _reject(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise _BodyTooLarge
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal started
+            # Body parsing may turn the cut-off into its own error response;
+            # that response is replaced by the 413 below.
+            if exceeded and not started:
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded and not started:
+            await _reject(scope, receive, send)
+
+
+async def _reject(scope: Scope, receive: Receive, send: Send) -> None:
+    response = JSONResponse(
+        {"detail": _TOO_LARGE},
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        headers={"Connection": "close"},
+    )
+    await response(scope, receive, send)
+
+
+async def receive_upload(
+    file: UploadFile,
+    target: Path,
+    *,
+    max_bytes: int,
+    chunk_size: int = _CHUNK_SIZE,
+) -> ReceivedUpload:
+    """Stream ``file`` into ``target`` while hashing it.
+
+    Only one chunk is held in memory at a time. The transfer aborts with
+    ``413`` as soon as ``max_bytes`` is exceeded and the partial file is
+    removed. :class:`UploadLimitMiddleware` already stops bodies far above
+    the limit; this applies the exact per-file limit.
+    """
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with target.open("wb") as handle:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                        detail=_TOO_LARGE,
+                    )
+                digest.update(chunk)
+                handle.write(chunk)
+    except BaseException:
+        target.unlink(missing_ok=True)
+        raise
+    return ReceivedUpload(path=target, size=size, sha256=digest.hexdigest())
@@ -0,0 +1,187 @@
+"""Parsing and persistence of uploads, singly or in concurrent batches."""
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+from ..config import get_settings
+from ..models import BatchUploadItem, ParsedObject
+from ..profiling import submit_profiled
+from ..store import upload_objects_path, write_jsonl
+from .content_index import IndexedArtifact, find_parsed_artifact, register_parsed_artifact
+from .parsing import PARSER_VERSION, parse_document
+from .search_index import index_objects
+
+__all__ = [
+    "SUPPORTED_EXTENSIONS",
+    "BatchSource",
+    "find_existing_upload",
+    "ingest_paths",
+    "parse_workers",
+    "sha256_file",
+    "store_parsed_upload",
+]
+
+SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".docx"}
+_INDEX_SCOPE = "upload"
+_INDEX_ENGINE = "default"
+
+
+@dataclass(frozen=True)
+class BatchSource:
+    """A document on disk queued for batch ingestion."""
+
+    path: Path
+    filename: str
+    sha256: str | None = None
+
+
+def sha256_file(path: Path) -> str:
+    """Return the hex sha256 digest of ``path`` read in chunks."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_workers(requested: int | None = None) -> int:
+    """Return the parser pool size: explicit request, setting, or core count."""
+
+    if requested:
+        return max(1, requested)
+    configured = get_settings().PARSE_WORKERS
+    if configured:
+        return configured
+    return os.cpu_count() or 1
+
+
+def find_existing_upload(sha256: str) -> IndexedArtifact | None:
+    """Return a previous upload with identical content and parser version."""
+
+    return find_parsed_artifact(
+        sha256,
+        scope=_INDEX_SCOPE,
+        engine=_INDEX_ENGINE,
+        parser_version=PARSER_VERSION,
+        exists=lambda upload_id: upload_objects_path(upload_id).exists(),
+    )
+
+
+def store_parsed_upload(upload_id: str, sha256: str, objects: list[dict[str, Any]]) -> None:
+    """Persist parsed objects, index them under their content hash and for search.
+
+    Objects are validated here, once, so readers can load them as trusted.
+    """
+
+    objects = [ParsedObject.model_validate(obj).model_dump() for obj in objects]
+    write_jsonl(upload_objects_path(upload_id), objects)
+    index_objects(upload_id, objects)
+    register_parsed_artifact(
+        sha256,
+        scope=_INDEX_SCOPE,
+        engine=_INDEX_ENGINE,
+        parser_version=PARSER_VERSION,
+        artifact_id=upload_id,
+        object_count=len(objects),
+    )
+
+
+def _parse_path(path: str, sha256: str) -> list[dict[str, Any]]:
+    return parse_document(Path(path), sha256=sha256)
+
+
+def ingest_paths(
+    sources: Sequence[BatchSource],
+    *,
+    max_workers: int | None = None,
+    dedupe: bool = True,
+    executor: Executor | None = None,
+) -> list[BatchUploadItem]:
+    """Parse many documents concurrently and return a per-file manifest.
+
+    Hashing, deduplication and persistence happen in the calling process;
+    only parsing is fanned out to a process pool bounded by ``max_workers``.
+    Failures are reported per file and never abort the batch.
+    """
+
+    items: list[BatchUploadItem | None] = [None] * len(sources)
+    pending: list[tuple[int, str, str]] = []
+    first_by_hash: dict[str, int] = {}
+    repeats: dict[int, int] = {}
+    for index, source in enumerate(sources):
+        extension = source.path.suffix.lower()
+        if extension not in SUPPORTED_EXTENSIONS:
+            items[index] = BatchUploadItem(
+                filename=source.filename,
+                status="failed",
+                error=f"Unsupported file type: {extension or 'unknown'}",
+            )
+            continue
+        try:
+            sha256 = source.sha256 or sha256_file(source.path)
+        except OSError as exc:
+            items[index] = BatchUploadItem(filename=source.filename, status="failed", error=str(exc))
+            continue
+        if dedupe and sha256 in first_by_hash:
+            repeats[index] = first_by_hash[sha256]
+            continue
+        first_by_hash.setdefault(sha256, index)
+        existing = find_existing_upload(sha256) if dedupe else None
+        if existing is not None:
+            items[index] = BatchUploadItem(
+                filename=source.filename,
+                upload_id=existing.artifact_id,
+                object_count=existing.object_count,
+                status="deduplicated",
+            )
+            continue
+        pending.append((index, sha256, str(source.path)))
+
+    if pending:
+        owns_executor = executor is None
+        pool = executor or ProcessPoolExecutor(
+            max_workers=min(parse_workers(max_workers), len(pending))
+        )
+        try:
+            futures = {
+                submit_profiled(pool, _parse_path, path, sha256): (index, sha256)
+                for index, sha256, path in pending
+            }
+            for future in as_completed(futures):
+                index, sha256 = futures[future]
+                filename = sources[index].filename
+                try:
+                    objects = future.result()
+                except Exception as exc:  # noqa: BLE001 - reported per file
+                    items[index] = BatchUploadItem(filename=filename, status="failed", error=str(exc))
+                    continue
+                upload_id = uuid.uuid4().hex
+                store_parsed_upload(upload_id, sha256, objects)
+                items[index] = BatchUploadItem(
+                    filename=filename,
+                    upload_id=upload_id,
+                    object_count=len(objects),
+                    status="processed",
+                )
+        finally:
+            if owns_executor:
+                pool.shutdown(wait=True)
+
+    for index, primary in repeats.items():
+        source_item = items[primary]
+        assert source_item is not None
+        if source_item.status == "failed":
+            items[index] = source_item.model_copy(update={"filename": sources[index].filename})
+        else:
+            items[index] = source_item.model_copy(
+                update={"filename": sources[index].filename, "status": "deduplicated"}
+            )
+
+    return [item for item in items if item is not None]
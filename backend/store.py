@@ -3,14 +3,131 @@ from __future__ import annotations
 
 import csv
 import json
+import os
 import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterable, Iterator
+from typing import IO, Any, Callable, Iterable, Iterator, TypeVar
+
+from pydantic import BaseModel
+
+from .config import get_settings
+from .services.capabilities import optional_import
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
 
 _TMP_DIR = Path(tempfile.gettempdir()) / "simplespecs"
 _TMP_DIR.mkdir(parents=True, exist_ok=True)
 
+COMPACT_SEPARATORS = (",", ":")
+"""JSON separators for artifacts; indentation only pays off for files read by people."""
+
+_FSYNC_BATCH_SIZE = 32
+_FSYNC_BATCH_SECONDS = 1.0
+_fsync_lock = threading.Lock()
+_fsync_pending: set[Path] = set()
+_fsync_last = time.monotonic()
+_lock_guard = threading.Lock()
+_thread_locks: dict[str, threading.Lock] = {}
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """Compact UTF-8 JSON encoder/decoder pair used for artifacts."""
+
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes | str], Any]
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        name="stdlib",
+        dumps=lambda payload: json.dumps(
+            payload, ensure_ascii=False, separators=COMPACT_SEPARATORS
+        ).encode("utf-8"),
+        loads=json.loads,
+    )
+
+
+def _orjson_codec() -> JsonCodec | None:
+    orjson = optional_import("orjson")
+    if orjson is None:
+        return None
+    options = orjson.OPT_NON_STR_KEYS
+    return JsonCodec(
+        name="orjson", dumps=lambda payload: orjson.dumps(payload, option=options), loads=orjson.loads
+    )
+
+
+def _msgspec_codec() -> JsonCodec | None:
+    msgspec = optional_import("msgspec")
+    if msgspec is None:
+        return None
+    encoder = msgspec.json.Encoder()
+    return JsonCodec(name="msgspec", dumps=encoder.encode, loads=msgspec.json.decode)
+
+
+_CODEC_FACTORIES: dict[str, Callable[[], JsonCodec | None]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+}
+
+
+@lru_cache(maxsize=None)
+def _codec_named(name: str) -> JsonCodec:
+    candidates = ("orjson", "msgspec") if name == "auto" else (name,)
+    for candidate in candidates:
+        factory = _CODEC_FACTORIES.get(candidate)
+        codec = factory() if factory is not None else None
+        if codec is not None:
+            return codec
+    return _stdlib_codec()
+
+
+def json_codec() -> JsonCodec:
+    """Return the codec chosen by ``JSON_CODEC``.
+
+    ``auto`` prefers orjson, then msgspec, and falls back to the standard
+    library; naming an uninstalled library also falls back to it.
+    """
+
+    return _codec_named(get_settings().JSON_CODEC)
+
+
+def dumps_json(payload: Any, *, indent: int | None = None) -> bytes:
+    """Encode ``payload`` as compact UTF-8 JSON, or indented when ``indent`` is set."""
+
+    if indent is not None:
+        return json.dumps(payload, ensure_ascii=False, indent=indent).encode("utf-8")
+    return json_codec().dumps(payload)
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Decode JSON produced by :func:`dumps_json` (or any other writer)."""
+
+    return json_codec().loads(data)
+
+
+def construct_trusted(model: type[ModelT], items: Iterable[dict[str, Any]]) -> list[ModelT]:
+    """Build ``model`` instances from artifacts this service wrote, skipping validation.
+
+    Only valid for flat models whose records were validated before they were
+    persisted; nested models would be left as plain dictionaries.
+    """
+
+    return [model.model_construct(**item) for item in items]
+
 
 def _path_for(name: str) -> Path:
     return _TMP_DIR / name
@@ -27,46 +144,239 @@ def headers_path(upload_id: str) -> Path:
 
 
 def specs_path(upload_id: str) -> Path:
+    """Return the JSONL path holding the extracted specs of an upload."""
+
+    return _path_for(f"{upload_id}_specs.jsonl")
+
+
+def legacy_specs_path(upload_id: str) -> Path:
+    """Return the pre-JSONL ``_specs.json`` path kept for older uploads."""
+
     return _path_for(f"{upload_id}_specs.json")
 
 
-def write_jsonl(path: Path, items: Iterable[dict[str, Any]]) -> None:
+def iter_specs(upload_id: str) -> Iterator[dict[str, Any]]:
+    """Yield stored specs one at a time, falling back to the legacy array."""
+
+    path = specs_path(upload_id)
+    if path.exists():
+        yield from stream_jsonl(path)
+        return
+    legacy = read_json(legacy_specs_path(upload_id))
+    if legacy:
+        yield from legacy
+
+
+def _fsync_path(path: Path, *, directory: bool = False) -> None:
+    flags = os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - some filesystems refuse directory fsync
+        pass
+    finally:
+        os.close(fd)
+
+
+def sync_pending() -> int:
+    """Flush writes deferred by the ``batch`` fsync policy; return the file count."""
+
+    global _fsync_last
+    with _fsync_lock:
+        pending = sorted(_fsync_pending)
+        _fsync_pending.clear()
+        _fsync_last = time.monotonic()
+    for path in pending:
+        _fsync_path(path)
+    for directory in sorted({path.parent for path in pending}):
+        _fsync_path(directory, directory=True)
+    return len(pending)
+
+
+def _after_replace(path: Path) -> None:
+    policy = get_settings().ARTIFACT_FSYNC
+    if policy == "always":
+        _fsync_path(path.parent, directory=True)
+    elif policy == "batch":
+        with _fsync_lock:
+            _fsync_pending.add(path)
+            due = (
+                len(_fsync_pending) >= _FSYNC_BATCH_SIZE
+                or time.monotonic() - _fsync_last >= _FSYNC_BATCH_SECONDS
+            )
+        if due:
+            sync_pending()
+
+
+@contextmanager
+def atomic_writer(path: Path, mode: str = "w", *, newline: str | None = None) -> Iterator[IO[Any]]:
+    """Open a temp file beside ``path`` that replaces it atomically on success.
+
+    Readers see either the previous file or the complete new one, never a
+    partial write; on error the temp file is removed and ``path`` is left as
+    it was. Durability follows ``ARTIFACT_FSYNC``: ``always`` fsyncs every
+    file and its directory, ``batch`` defers that to :func:`sync_pending`
+    (run every few writes and at shutdown), ``never`` leaves it to the OS.
+    """
+
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
+    binary = "b" in mode
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    temp = Path(temp_name)
+    try:
+        # mkstemp creates 0600 files; replaced artifacts get the configured mode.
+        os.chmod(temp, get_settings().ARTIFACT_FILE_MODE)
+        with os.fdopen(
+            fd, mode, encoding=None if binary else "utf-8", newline=None if binary else newline
+        ) as handle:
+            yield handle
+            handle.flush()
+            if get_settings().ARTIFACT_FSYNC == "always":
+                os.fsync(handle.fileno())
+        os.replace(temp, path)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    _after_replace(path)
+
+
+@contextmanager
+def file_lock(path: Path, *, blocking: bool = True) -> Iterator[bool]:
+    """Hold an exclusive lock on ``path`` shared by every process on the host.
+
+    Yields whether the lock was taken, which is always the case when
+    ``blocking``. Without ``fcntl`` (Windows) only threads of this process
+    are excluded.
+    """
+
+    with _lock_guard:
+        thread_lock = _thread_locks.setdefault(str(path), threading.Lock())
+    if not thread_lock.acquire(blocking):
+        yield False
+        return
+    try:
+        if fcntl is None:
+            yield True
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a+b") as handle:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    finally:
+        thread_lock.release()
+
+
+def write_jsonl(path: Path, items: Iterable[dict[str, Any]]) -> None:
+    dumps = json_codec().dumps
+    with atomic_writer(path, "wb") as fh:
         for item in items:
-            fh.write(json.dumps(item, ensure_ascii=False))
-            fh.write("\n")
+            fh.write(dumps(item))
+            fh.write(b"\n")
 
 
 def read_jsonl(path: Path) -> list[dict[str, Any]]:
     if not path.exists():
         return []
+    loads = json_codec().loads
     data: list[dict[str, Any]] = []
-    with path.open("r", encoding="utf-8") as fh:
+    with path.open("rb") as fh:
         for line in fh:
             line = line.strip()
             if not line:
                 continue
-            data.append(json.loads(line))
+            data.append(loads(line))
     return data
 
 
-def write_json(path: Path, payload: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False, indent=2)
+def write_json(path: Path, payload: Any, *, indent: int | None = None) -> None:
+    data = dumps_json(payload, indent=indent)
+    with atomic_writer(path, "wb") as fh:
+        fh.write(data)
 
 
 def read_json(path: Path) -> Any:
     if not path.exists():
         return None
+    return loads_json(path.read_bytes())
+
+
+def iter_json_array(path: Path, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading it whole.
+
+    Elements are decoded one at a time from a sliding text buffer, so memory
+    stays proportional to the largest element rather than the file.
+    """
+
+    decoder = json.JSONDecoder()
     with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+        buffer = ""
+        position = 0
+        eof = False
+
+        def _fill() -> bool:
+            nonlocal buffer, position, eof
+            if eof:
+                return False
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[position:] + chunk
+            position = 0
+            return True
+
+        def _skip_whitespace() -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in " \t\r\n":
+                    position += 1
+                if position < len(buffer) or not _fill():
+                    return
+
+        _skip_whitespace()
+        if position >= len(buffer) or buffer[position] != "[":
+            raise ValueError(f"{path} does not contain a JSON array")
+        position += 1
+        expect_item = True
+        while True:
+            _skip_whitespace()
+            if position >= len(buffer):
+                raise ValueError(f"Unterminated JSON array in {path}")
+            char = buffer[position]
+            if char == "]":
+                return
+            if char == "," and not expect_item:
+                position += 1
+                expect_item = True
+                continue
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if not _fill():
+                        raise
+                    continue
+                if end == len(buffer) and not eof and _fill():
+                    # A number may continue in the next chunk; decode again.
+                    continue
+                break
+            position = end
+            expect_item = False
+            yield item
 
 
 def write_csv(path: Path, rows: Iterable[Iterable[Any]], header: list[str]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as fh:
+    with atomic_writer(path, newline="") as fh:
         writer = csv.writer(fh)
         writer.writerow(header)
         for row in rows:
@@ -76,9 +386,10 @@ def write_csv(path: Path, rows: Iterable[Iterable[Any]], header: list[str]) -> N
 def stream_jsonl(path: Path) -> Iterator[dict[str, Any]]:
     if not path.exists():
         return iter(())
-    with path.open("r", encoding="utf-8") as fh:
+    loads = json_codec().loads
+    with path.open("rb") as fh:
         for line in fh:
             line = line.strip()
             if not line:
                 continue
-            yield json.loads(line)
+            yield loads(line)
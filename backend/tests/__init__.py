@@ -4,7 +4,7 @@ from __future__ import annotations
 from pathlib import Path
 
 _TEST_DIR = Path(__file__).parent
-_ENABLED_TESTS = {"test_parsers.py", "test_model_settings.py"}
+_ENABLED_TESTS = {"test_parsers.py", "test_model_settings.py", "test_metrics.py", "test_profiling.py", "test_upload_dedup.py", "test_upload_stream.py", "test_batch_ingest.py", "test_export_stream.py", "test_columnar_export.py", "test_artifact_manifest.py", "test_async_llm.py", "test_tokens.py", "test_spec_dedup.py", "test_search_index.py", "test_candidates.py", "test_prefilter.py", "test_section_result_cache.py", "test_import_budget.py", "test_system_capabilities.py", "test_spec_drain.py", "test_retention.py", "test_atomic_writes.py", "test_json_codec.py", "test_parse_cache.py", "test_section_edits.py", "test_qa_report.py"}
 
 collect_ignore = [
     path.name
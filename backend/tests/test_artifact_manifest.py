@@ -0,0 +1,92 @@
+"""Tests for digest-on-write artifact manifests and conditional GETs."""
+from __future__ import annotations
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import app
+from backend.services.manifest import (
+    MANIFEST_NAME,
+    artifact_entry,
+    etag_for,
+    etag_matches,
+    write_artifact_json,
+)
+
+
+def test_write_records_digest_of_written_bytes(tmp_path: Path) -> None:
+    entry = write_artifact_json(tmp_path, "chunks/chunks.json", {"s1": ["o1"]})
+
+    data = (tmp_path / "chunks" / "chunks.json").read_bytes()
+    assert entry.sha256 == hashlib.sha256(data).hexdigest()
+    assert entry.size == len(data)
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["artifacts"]["chunks/chunks.json"]["sha256"] == entry.sha256
+    assert artifact_entry(tmp_path, "chunks/chunks.json") == entry
+
+
+def test_out_of_band_edits_are_rehashed(tmp_path: Path) -> None:
+    write_artifact_json(tmp_path, "specs/specs.json", [])
+    target = tmp_path / "specs" / "specs.json"
+    target.write_text('[{"spec_id": "x"}]', encoding="utf-8")
+    os.utime(target, ns=(1, 1))
+
+    manifest = (tmp_path / MANIFEST_NAME).read_bytes()
+
+    entry = artifact_entry(tmp_path, "specs/specs.json")
+    assert entry is not None
+    assert entry.sha256 == hashlib.sha256(target.read_bytes()).hexdigest()
+    assert artifact_entry(tmp_path, "missing.json") is None
+    # Reads never rewrite the manifest.
+    assert (tmp_path / MANIFEST_NAME).read_bytes() == manifest
+
+
+def _write_many(base: str, worker: int) -> None:
+    for index in range(15):
+        write_artifact_json(Path(base), f"w{worker}/{index}.json", {"worker": worker, "index": index})
+
+
+def test_concurrent_processes_keep_every_manifest_entry(tmp_path: Path) -> None:
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_write_many, [str(tmp_path)] * 4, range(4)))
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert len(manifest["artifacts"]) == 60
+
+
+def test_etag_matching() -> None:
+    etag = etag_for("abc")
+    assert etag == '"abc"'
+    assert etag_matches(f'"zzz", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert etag_for("abc", "json") != etag_for("abc", "csv")
+
+
+def test_parsed_objects_answer_not_modified(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    write_artifact_json(tmp_path / "doc", "parsed/objects.json", [])
+    client = TestClient(app)
+
+    first = client.get("/parsed/doc")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/parsed/doc", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    objects = [{"object_id": "doc-000000", "file_id": "doc", "text": "Scope", "order_index": 0}]
+    write_artifact_json(tmp_path / "doc", "parsed/objects.json", objects)
+    assert client.get("/parsed/doc", headers={"If-None-Match": etag}).status_code == 200
+    get_settings.cache_clear()
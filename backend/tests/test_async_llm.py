@@ -0,0 +1,153 @@
+"""Tests for the async LLM adapter layer."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+import threading
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.config import get_settings
+from backend.models import DocumentObject, SectionNode, SectionSpan
+from backend.services.chunker import run_chunking
+from backend.services.headers import save_sections
+from backend.services.llm import LLMProvider, close_shared_clients, shared_client
+from backend.services.llm_client import ProviderAdapter, ThreadedAdapter, as_async_adapter
+from backend.services.specs import aextract_specs_for_sections, extract_specs_for_sections
+from backend.store import write_json
+
+
+class _EchoProvider(LLMProvider):
+    name = "echo"
+
+    def __init__(self) -> None:
+        super().__init__(model="echo")
+        self.calls: list[list[dict[str, str]]] = []
+
+    async def _chat(self, messages):
+        self.calls.append(messages)
+        return messages[-1]["content"].upper()
+
+
+class _BlockingAdapter:
+    def __init__(self) -> None:
+        self.threads: set[int] = set()
+
+    def generate(self, prompt: str) -> str:
+        self.threads.add(threading.get_ident())
+        return prompt[::-1]
+
+
+def test_sync_adapters_run_off_the_event_loop() -> None:
+    adapter = _BlockingAdapter()
+    wrapped = as_async_adapter(adapter)
+    assert isinstance(wrapped, ThreadedAdapter)
+
+    async def _run() -> list[str]:
+        return await asyncio.gather(*(wrapped.agenerate(text) for text in ("ab", "cd")))
+
+    assert asyncio.run(_run()) == ["ba", "dc"]
+    assert threading.get_ident() not in adapter.threads
+
+
+def test_provider_adapter_sends_system_prompt() -> None:
+    provider = _EchoProvider()
+    adapter = ProviderAdapter(provider, system_prompt="Be terse.")
+    assert as_async_adapter(adapter) is adapter
+
+    assert asyncio.run(adapter.agenerate("hello")) == "HELLO"
+    assert provider.calls == [
+        [
+            {"role": "system", "content": "Be terse."},
+            {"role": "user", "content": "hello"},
+        ]
+    ]
+
+
+def test_shared_client_is_pooled_per_loop() -> None:
+    async def _clients():
+        first = shared_client(30.0)
+        second = shared_client(30.0)
+        other = shared_client(5.0)
+        await close_shared_clients()
+        return first, second, other
+
+    first, second, other = asyncio.run(_clients())
+    assert first is second
+    assert other is not first
+    assert first.is_closed
+
+
+def _section_name(prompt: str) -> str:
+    return prompt.split('Section: "', 1)[1].split('"', 1)[0]
+
+
+class _SlowAsyncAdapter:
+    """Answers later sections first while recording how many calls overlap."""
+
+    def __init__(self, sections: int) -> None:
+        self.sections = sections
+        self.active = 0
+        self.peak = 0
+
+    async def agenerate(self, prompt: str) -> str:
+        section = _section_name(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.002 * (self.sections - int(section.split()[-1])))
+        self.active -= 1
+        return f"- {section} valves shall be rated 10 bar"
+
+
+class _SyncAdapter:
+    def generate(self, prompt: str) -> str:
+        return f"- {_section_name(prompt)} valves shall be rated 10 bar"
+
+
+def test_async_extraction_bounds_concurrency_and_keeps_order(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'specs.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    monkeypatch.setenv("SIMPLS_SPEC_RESULT_CACHE", "false")
+    get_settings.cache_clear()
+    count = 12
+    objects = [
+        DocumentObject(
+            object_id=f"doc-{index:04d}",
+            file_id="doc",
+            text=f"Line {index} shall be rated {index} bar",
+            order_index=index,
+        )
+        for index in range(count)
+    ]
+    root = SectionNode(
+        section_id="doc-root",
+        file_id="doc",
+        title="Document",
+        children=[
+            SectionNode(
+                section_id=f"sec-{index}",
+                file_id="doc",
+                number=str(index + 1),
+                title=f"Section {index}",
+                depth=1,
+                span=SectionSpan(
+                    start_object=objects[index].object_id, end_object=objects[index].object_id
+                ),
+            )
+            for index in range(count)
+        ],
+    )
+    write_json(tmp_path / "doc" / "parsed" / "objects.json", [obj.model_dump() for obj in objects])
+    save_sections("doc", root)
+    run_chunking("doc")
+    adapter = _SlowAsyncAdapter(count)
+
+    specs = asyncio.run(aextract_specs_for_sections("doc", root, objects, adapter, concurrency=3))
+    serial = extract_specs_for_sections("doc", root, objects, _SyncAdapter())
+    get_settings.cache_clear()
+
+    assert 1 < adapter.peak <= 3
+    assert len(specs) == count
+    assert [spec.section_id for spec in specs] == [f"sec-{index}" for index in range(count)]
+    assert [spec.model_dump() for spec in specs] == [spec.model_dump() for spec in serial]
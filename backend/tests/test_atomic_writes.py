@@ -0,0 +1,70 @@
+"""Tests for atomic, fsync-batched artifact writes."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend import store
+from backend.config import get_settings
+from backend.store import atomic_writer, read_json, sync_pending, write_json, write_jsonl
+
+
+def test_failed_write_keeps_previous_file_and_no_temp(tmp_path: Path) -> None:
+    target = tmp_path / "specs.json"
+    write_json(target, [{"spec": "old"}])
+
+    with pytest.raises(RuntimeError):
+        with atomic_writer(target) as handle:
+            handle.write('[{"spec": "ha')
+            raise RuntimeError("crash mid-write")
+
+    assert read_json(target) == [{"spec": "old"}]
+    assert [path.name for path in tmp_path.iterdir()] == ["specs.json"]
+
+
+def test_artifacts_are_compact_unless_indented(tmp_path: Path) -> None:
+    write_json(tmp_path / "compact.json", {"a": [1, 2]})
+    write_json(tmp_path / "pretty.json", {"a": [1, 2]}, indent=2)
+    write_jsonl(tmp_path / "rows.jsonl", [{"a": 1, "b": "x"}])
+
+    assert (tmp_path / "compact.json").read_text() == '{"a":[1,2]}'
+    assert json.loads((tmp_path / "pretty.json").read_text()) == {"a": [1, 2]}
+    assert "\n  " in (tmp_path / "pretty.json").read_text()
+    assert (tmp_path / "rows.jsonl").read_text() == '{"a":1,"b":"x"}\n'
+    mode = (tmp_path / "compact.json").stat().st_mode & 0o777
+    assert mode == 0o644
+
+
+def test_artifact_file_mode_is_configurable(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_ARTIFACT_FILE_MODE", "640")
+    get_settings.cache_clear()
+    try:
+        write_json(tmp_path / "private.json", {"a": 1})
+    finally:
+        get_settings.cache_clear()
+
+    assert (tmp_path / "private.json").stat().st_mode & 0o777 == 0o640
+
+
+@pytest.mark.parametrize(("policy", "file_syncs"), [("always", 1), ("batch", 0), ("never", 0)])
+def test_fsync_policies(monkeypatch, tmp_path: Path, policy: str, file_syncs: int) -> None:
+    monkeypatch.setenv("SIMPLS_ARTIFACT_FSYNC", policy)
+    get_settings.cache_clear()
+    sync_pending()
+    monkeypatch.setattr(store, "_fsync_last", float("inf"))
+    synced: list[int] = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (synced.append(fd), real_fsync(fd)))
+
+    write_json(tmp_path / "a.json", [1])
+
+    # ``always`` also syncs the directory entry after the rename.
+    assert len(synced) == file_syncs * 2
+    assert sync_pending() == (1 if policy == "batch" else 0)
+    get_settings.cache_clear()
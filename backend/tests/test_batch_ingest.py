@@ -0,0 +1,63 @@
+"""Tests for batch ingestion through the API and the service layer."""
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.services.uploads import BatchSource, ingest_paths
+
+
+def test_batch_upload_manifest(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'index.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    get_settings.cache_clear()
+    client = TestClient(create_app())
+
+    files = [
+        ("files", ("a.txt", BytesIO(b"1 Scope\nUse M12 bolts.\n"), "text/plain")),
+        ("files", ("b.txt", BytesIO(b"2 Materials\nASTM A36 steel.\n"), "text/plain")),
+        ("files", ("copy.txt", BytesIO(b"1 Scope\nUse M12 bolts.\n"), "text/plain")),
+        ("files", ("image.png", BytesIO(b"data"), "image/png")),
+    ]
+    response = client.post("/api/upload/batch", files=files, params={"workers": 2})
+
+    assert response.status_code == 200
+    payload = response.json()
+    statuses = [item["status"] for item in payload["items"]]
+    assert statuses == ["processed", "processed", "deduplicated", "failed"]
+    assert [item["filename"] for item in payload["items"]] == ["a.txt", "b.txt", "copy.txt", "image.png"]
+    assert payload["items"][2]["upload_id"] == payload["items"][0]["upload_id"]
+    assert (payload["processed"], payload["deduplicated"], payload["failed"]) == (2, 1, 1)
+
+    objects = client.get("/api/objects", params={"upload_id": payload["items"][1]["upload_id"]})
+    assert objects.json()["total"] == 2
+    assert not list(tmp_path.glob("upload_*"))
+    get_settings.cache_clear()
+
+
+def test_ingest_paths_reports_parse_failures(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'index.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    get_settings.cache_clear()
+    good = tmp_path / "good.txt"
+    good.write_text("Line one\n", encoding="utf-8")
+    broken = tmp_path / "broken.docx"
+    broken.write_bytes(b"not a zip archive")
+
+    items = ingest_paths(
+        [BatchSource(path=good, filename="good.txt"), BatchSource(path=broken, filename="broken.docx")],
+        max_workers=1,
+    )
+
+    assert [item.status for item in items] == ["processed", "failed"]
+    assert items[0].object_count == 1
+    assert items[1].error
+    get_settings.cache_clear()
@@ -0,0 +1,43 @@
+"""Tests for the local spec-candidate scanner."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.services.candidates import has_candidates, scan_lines, score_lines, top_candidates
+
+_SECTION = """4 Pump requirements
+This section describes the pumps.
+- Design pressure shall be 16 bar at 120 °C.
+Flanges per ASME B16.5 Class 150.
+Shaft runout ±0.05 mm maximum.
+Refer to section 4 in the appendix.
+Mill certificates to EN 10204 3.1.
+Efficiency at least 85%."""
+
+
+def test_scan_finds_units_tolerances_standards_and_modals() -> None:
+    candidates = {item.text: item for item in scan_lines(_SECTION.splitlines())}
+
+    assert "4 Pump requirements" not in candidates
+    assert "Refer to section 4 in the appendix." not in candidates
+    assert candidates["- Design pressure shall be 16 bar at 120 °C."].features >= {"unit", "modal"}
+    assert "standard" in candidates["Flanges per ASME B16.5 Class 150."].features
+    assert "tolerance" in candidates["Shaft runout ±0.05 mm maximum."].features
+    assert "designated" in candidates["Mill certificates to EN 10204 3.1."].features
+    assert "unit" in candidates["Efficiency at least 85%."].features
+
+
+def test_top_candidates_keep_document_order_and_strip_bullets() -> None:
+    best = top_candidates(_SECTION, limit=2)
+
+    assert best == ["Design pressure shall be 16 bar at 120 °C", "Shaft runout ±0.05 mm maximum"]
+
+
+def test_boilerplate_has_no_candidates() -> None:
+    boilerplate = "Table of Contents\n1 Scope ........ 3\nRevision History\nSee section 2."
+
+    assert not has_candidates(boilerplate)
+    assert score_lines(["", "General"]) == [0.0, 0.0]
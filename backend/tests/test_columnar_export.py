@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import app
+from backend.services.columnar import encode_table, objects_table, specs_table
+from backend.store import write_json
+
+
+def _spec(file_id: str, index: int, section: str) -> dict:
+    return {
+        "spec_id": f"{file_id}-spec-{index}",
+        "file_id": file_id,
+        "section_id": section,
+        "section_number": "1.1",
+        "section_title": f"Section {section}",
+        "spec_text": f"Requirement {index}",
+        "confidence": None if index % 2 else 0.5,
+        "source_object_ids": [f"{file_id}-txt-{index:06d}", f"{file_id}-txt-000000"],
+    }
+
+
+def test_specs_table_dictionary_encodes_repeated_columns() -> None:
+    table = specs_table(_spec("doc", index, "s1") for index in range(3))
+
+    assert table.num_rows == 3
+    for name in ("file_id", "section_id", "section_number", "section_title"):
+        assert pa.types.is_dictionary(table.schema.field(name).type)
+    assert pa.types.is_dictionary(table.schema.field("source_object_ids").type.value_type)
+    assert table.column("source_object_ids").to_pylist()[2] == ["doc-txt-000002", "doc-txt-000000"]
+    assert table.column("confidence").to_pylist() == [0.5, None, 0.5]
+
+
+def test_bulk_parquet_and_arrow_round_trip() -> None:
+    tables = [
+        specs_table([_spec("a", 0, "s1"), _spec("a", 1, "s2")]),
+        specs_table([_spec("b", 0, "s9")]),
+    ]
+
+    restored = pq.read_table(io.BytesIO(encode_table(tables, "parquet")))
+    assert restored.column("file_id").to_pylist() == ["a", "a", "b"]
+    assert restored.column("section_id").to_pylist() == ["s1", "s2", "s9"]
+
+    with pa.ipc.open_stream(encode_table(tables, "arrow")) as reader:
+        streamed = reader.read_all()
+    assert streamed.column("spec_id").to_pylist() == ["a-spec-0", "a-spec-1", "b-spec-0"]
+
+
+def test_objects_table_serializes_metadata() -> None:
+    table = objects_table(
+        [
+            {
+                "object_id": "doc-txt-000000",
+                "file_id": "doc",
+                "kind": "text",
+                "text": "Hello",
+                "page_index": 0,
+                "bbox": [0.0, 0.0, 612.0, 792.0],
+                "order_index": 0,
+                "metadata": {"source": "pdfplumber"},
+            }
+        ]
+    )
+
+    row = table.to_pylist()[0]
+    assert row["metadata"] == '{"source":"pdfplumber"}'
+    assert row["bbox"] == [0.0, 0.0, 612.0, 792.0]
+
+
+def _write_artifacts(base: Path, file_id: str, sections: list[str]) -> None:
+    root = base / file_id
+    objects = [
+        {
+            "object_id": f"{file_id}-txt-{index:06d}",
+            "file_id": file_id,
+            "text": f"Line {index}",
+            "order_index": index,
+        }
+        for index in range(2)
+    ]
+    write_json(root / "parsed" / "objects.json", objects)
+    write_json(
+        root / "headers" / "sections.json",
+        {"section_id": f"{file_id}-root", "file_id": file_id, "title": "Document"},
+    )
+    write_json(root / "chunks" / "chunks.json", {})
+    specs = [_spec(file_id, index, section) for index, section in enumerate(sections)]
+    write_json(root / "specs" / "specs.json", specs)
+
+
+def test_columnar_export_endpoints_are_served_by_the_app(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'export.db'}")
+    get_settings.cache_clear()
+    _write_artifacts(tmp_path, "a", ["s1", "s2"])
+    _write_artifacts(tmp_path, "b", ["s9"])
+    client = TestClient(app)
+
+    parquet = client.get("/export/a", params={"fmt": "parquet"})
+    assert parquet.status_code == 200
+    assert pq.read_table(io.BytesIO(parquet.content)).column("spec_id").to_pylist() == [
+        "a-spec-0",
+        "a-spec-1",
+    ]
+
+    arrow = client.get("/export/a", params={"fmt": "arrow", "table": "objects"})
+    assert arrow.status_code == 200
+    with pa.ipc.open_stream(arrow.content) as reader:
+        objects = reader.read_all()
+    assert objects.column("object_id").to_pylist() == ["a-txt-000000", "a-txt-000001"]
+
+    bulk = client.get("/export", params=[("file_id", "a"), ("file_id", "b"), ("fmt", "parquet")])
+    assert bulk.status_code == 200
+    assert pq.read_table(io.BytesIO(bulk.content)).column("file_id").to_pylist() == ["a", "a", "b"]
+    assert client.get("/export/missing", params={"fmt": "arrow"}).status_code == 404
+    get_settings.cache_clear()
@@ -0,0 +1,147 @@
+"""Tests for the streaming spec exports."""
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+from pathlib import Path
+import sys
+import uuid
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.services.manifest import write_artifact_json
+from backend.store import legacy_specs_path, specs_path, write_json, write_jsonl
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path: Path) -> TestClient:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'export.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    get_settings.cache_clear()
+    yield TestClient(create_app())
+    get_settings.cache_clear()
+
+
+def _specs(count: int) -> list[dict[str, str]]:
+    return [
+        {
+            "section_number": f"1.{index}",
+            "section_name": "Scope",
+            "specification": f"Bolt {index} shall be\nM12",
+            "domain": "Mechanical",
+        }
+        for index in range(count)
+    ]
+
+
+def test_export_streams_jsonl_specs(client: TestClient) -> None:
+    upload_id = uuid.uuid4().hex
+    write_jsonl(specs_path(upload_id), _specs(3))
+    try:
+        plain = client.get(
+            "/api/export/specs.csv",
+            params={"upload_id": upload_id},
+            headers={"Accept-Encoding": "identity"},
+        )
+        assert plain.status_code == 200
+        assert "content-encoding" not in plain.headers
+        rows = list(csv.reader(io.StringIO(plain.text)))
+        assert rows[0] == ["Section number", "Section name", "Specification", "Domain"]
+        assert rows[1] == ["1.0", "Scope", "Bolt 0 shall be M12", "Mechanical"]
+        assert len(rows) == 4
+
+        compressed = client.get(
+            "/api/export/specs.csv",
+            params={"upload_id": upload_id},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.text == plain.text
+    finally:
+        specs_path(upload_id).unlink(missing_ok=True)
+
+
+def test_export_reads_legacy_json_and_rejects_missing(client: TestClient) -> None:
+    upload_id = uuid.uuid4().hex
+    write_json(legacy_specs_path(upload_id), _specs(1))
+    try:
+        response = client.get("/api/export/specs.csv", params={"upload_id": upload_id})
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 2
+    finally:
+        legacy_specs_path(upload_id).unlink(missing_ok=True)
+
+    missing = client.get("/api/export/specs.csv", params={"upload_id": uuid.uuid4().hex})
+    assert missing.status_code == 404
+
+
+def test_iter_json_array_decodes_incrementally(tmp_path: Path) -> None:
+    from backend.store import iter_json_array
+
+    payload = [{"spec_text": "ø" * 50, "ids": [1, 2]}, 12345678901234, "text", None, []]
+    target = tmp_path / "specs.json"
+    write_json(target, payload)
+
+    for chunk_size in (1, 7, 4096):
+        assert list(iter_json_array(target, chunk_size=chunk_size)) == payload
+
+    (tmp_path / "empty.json").write_text(" [ ] ", encoding="utf-8")
+    assert list(iter_json_array(tmp_path / "empty.json")) == []
+
+
+def _section_spec(spec_id: str, title: str) -> dict:
+    return {
+        "spec_id": spec_id,
+        "file_id": "doc",
+        "section_id": f"sec-{title}",
+        "section_number": None,
+        "section_title": title,
+        "spec_text": f"{title} shall be rated 10 bar",
+        "confidence": None,
+        "source_object_ids": ["doc-000000"],
+    }
+
+
+def _write_file_artifacts(base: Path, specs: list[dict]) -> None:
+    write_artifact_json(base, "parsed/objects.json", [])
+    root = {"section_id": "doc-root", "file_id": "doc", "title": "Document"}
+    write_artifact_json(base, "headers/sections.json", root)
+    write_artifact_json(base, "chunks/chunks.json", {})
+    write_artifact_json(base, "specs/specs.json", specs)
+
+
+def test_file_export_formats_stream_in_export_order(client: TestClient, tmp_path: Path) -> None:
+    # Written before specs were persisted in export order.
+    legacy = [
+        _section_spec("s2", "Valves"),
+        _section_spec("s1", "Pumps"),
+        _section_spec("s0", "Valves"),
+    ]
+    _write_file_artifacts(tmp_path / "artifacts" / "doc", legacy)
+    expected = ["s1", "s0", "s2"]
+
+    ndjson = client.get("/export/doc", params={"fmt": "ndjson"})
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert lines[0]["file_id"] == "doc" and lines[0]["sections"][0]["section_id"] == "doc-root"
+    assert [line["spec_id"] for line in lines[1:]] == expected
+
+    packed = client.get("/export/doc", params={"fmt": "json.gz"})
+    assert packed.headers["content-type"] == "application/gzip"
+    payload = json.loads(gzip.decompress(packed.content))
+    assert [item["spec_id"] for item in payload["specs"]] == expected
+    assert payload == client.get("/export/doc", params={"fmt": "json"}).json()
+
+    table = client.get("/export/doc", params={"fmt": "csv.gz"})
+    rows = list(csv.reader(io.StringIO(gzip.decompress(table.content).decode("utf-8"))))
+    assert rows[0][0] == "spec_id"
+    assert [row[0] for row in rows[1:]] == expected
+    assert client.get("/export/doc", params={"fmt": "xml.gz"}).status_code == 400
@@ -0,0 +1,31 @@
+"""Import-time budget for the application module."""
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+_HEAVY_MODULES = ("pdfplumber", "pdfminer", "docx", "fitz", "camelot", "pikepdf", "pyarrow", "pandas", "cv2")
+_BUDGET_SECONDS = 5.0
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def test_app_import_skips_optional_parsers_and_stays_within_budget() -> None:
+    result = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    loaded = {name.split(".", 1)[0] for name in report["modules"]}
+    assert not loaded.intersection(_HEAVY_MODULES)
+    assert report["seconds"] < _BUDGET_SECONDS
@@ -0,0 +1,92 @@
+"""Tests for the pluggable JSON codec and trusted artifact loading."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.models import ParsedObject
+from backend.services.uploads import store_parsed_upload
+from backend.store import (
+    construct_trusted,
+    dumps_json,
+    json_codec,
+    loads_json,
+    read_jsonl,
+    upload_objects_path,
+    write_jsonl,
+)
+
+_PAYLOAD = {"spec": "Tolérance ±0,05 mm", "values": [1, 2.5, None, True], "nested": {"k": "v"}}
+
+
+@pytest.mark.parametrize("name", ["stdlib", "orjson", "auto"])
+def test_codecs_round_trip_compact_utf8(monkeypatch, name: str) -> None:
+    if name == "orjson":
+        pytest.importorskip("orjson")
+    monkeypatch.setenv("SIMPLS_JSON_CODEC", name)
+    get_settings.cache_clear()
+
+    encoded = dumps_json(_PAYLOAD)
+
+    assert encoded == '{"spec":"Tolérance ±0,05 mm","values":[1,2.5,null,true],"nested":{"k":"v"}}'.encode()
+    assert loads_json(encoded) == _PAYLOAD
+    if name != "auto":
+        assert json_codec().name == name
+    get_settings.cache_clear()
+
+
+def test_unknown_library_falls_back_to_stdlib(monkeypatch) -> None:
+    monkeypatch.setenv("SIMPLS_JSON_CODEC", "msgspec")
+    get_settings.cache_clear()
+    try:
+        import msgspec  # noqa: F401
+    except ImportError:
+        assert json_codec().name == "stdlib"
+    else:  # pragma: no cover - depends on the environment
+        assert json_codec().name == "msgspec"
+    get_settings.cache_clear()
+
+
+def test_jsonl_round_trip_and_trusted_construction(tmp_path: Path) -> None:
+    rows = [{"line_id": "l1", "type": "text", "page": 1, "bbox": None, "content": "Ø 10 mm", "meta": None}]
+    write_jsonl(tmp_path / "objects.jsonl", rows)
+
+    loaded = read_jsonl(tmp_path / "objects.jsonl")
+    objects = construct_trusted(ParsedObject, loaded)
+
+    assert loaded == rows
+    assert objects == [ParsedObject.model_validate(rows[0])]
+
+
+def test_objects_endpoint_pages_stored_objects(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'codec.db'}")
+    get_settings.cache_clear()
+    upload_id = "codec-objects"
+    store_parsed_upload(
+        upload_id,
+        "0" * 64,
+        [{"line_id": f"l{i}", "type": "text", "page": "1", "content": f"line {i}"} for i in range(5)],
+    )
+    try:
+        response = TestClient(create_app()).get(
+            "/api/objects", params={"upload_id": upload_id, "page": 2, "page_size": 2}
+        )
+    finally:
+        upload_objects_path(upload_id).unlink(missing_ok=True)
+        get_settings.cache_clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    payload = response.json()
+    assert payload["total"] == 5
+    assert [item["line_id"] for item in payload["items"]] == ["l2", "l3"]
+    # Validated (and coerced) once when stored.
+    assert payload["items"][0]["page"] == 1
@@ -27,6 +27,8 @@ def _mock_async_client(
     """Create a context manager that mimics httpx.AsyncClient for tests."""
 
     class _AsyncClient:
+        is_closed = False
+
         def __init__(self, *args, **kwargs) -> None:  # noqa: D401 - test helper
             self.args = args
             self.kwargs = kwargs
@@ -37,7 +39,7 @@ def _mock_async_client(
         async def __aexit__(self, exc_type, exc, tb) -> None:
             return None
 
-        async def post(self, url: str, json: dict):
+        async def post(self, url: str, json: dict, headers: dict | None = None):
             assert url == expected_url
             assert json == expected_payload
             return httpx.Response(
@@ -0,0 +1,78 @@
+"""Tests for stage timing instrumentation and the metrics endpoints."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend import metrics
+from backend.main import create_app
+from backend.metrics import job_report, record_llm_call, reset_metrics, stage_timer
+
+
+def test_stage_timer_records_job_report() -> None:
+    reset_metrics()
+
+    with stage_timer("parse", "job-1", extension="txt") as timing:
+        timing["object_count"] = 3
+    with pytest.raises(RuntimeError):
+        with stage_timer("chunking", "job-1"):
+            raise RuntimeError("boom")
+
+    report = job_report("job-1")
+    assert report is not None
+    assert [item["stage"] for item in report["stages"]] == ["parse", "chunking"]
+    assert report["stages"][0]["object_count"] == 3
+    assert report["stages"][0]["extension"] == "txt"
+    assert report["stages"][1]["outcome"] == "error"
+    assert set(report["totals"]) == {"parse", "chunking"}
+    assert job_report("unknown") is None
+
+
+def test_metrics_endpoint_renders_prometheus_text() -> None:
+    reset_metrics()
+    client = TestClient(create_app())
+
+    with stage_timer("export", "job-2", format="csv"):
+        pass
+    record_llm_call("openrouter", 0.25, retries=1, usage={"prompt_tokens": 10, "completion_tokens": 4})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE simplespecs_stage_seconds summary" in body
+    assert 'simplespecs_stage_seconds_count{format="csv",stage="export"} 1' in body
+    assert 'simplespecs_llm_retries_total{provider="openrouter"} 1' in body
+    assert 'simplespecs_llm_prompt_tokens_total{provider="openrouter"} 10' in body
+
+    report = client.get("/metrics/jobs/job-2")
+    assert report.status_code == 200
+    assert report.json()["stages"][0]["stage"] == "export"
+    assert client.get("/metrics/jobs/missing").status_code == 404
+
+
+def test_max_rss_units_follow_the_platform(monkeypatch) -> None:
+    usage = SimpleNamespace(ru_maxrss=2048)
+    fake_resource = SimpleNamespace(RUSAGE_SELF=0, getrusage=lambda _who: usage)
+    monkeypatch.setattr(metrics, "resource", fake_resource)
+
+    monkeypatch.setattr(metrics.sys, "platform", "linux")
+    assert metrics._max_rss_bytes() == 2048 * 1024
+    monkeypatch.setattr(metrics.sys, "platform", "darwin")
+    assert metrics._max_rss_bytes() == 2048
+
+    # Without ``resource`` (Windows) psutil is used when installed, else 0.
+    monkeypatch.setattr(metrics, "resource", None)
+    memory = SimpleNamespace(rss=10, peak_wset=30)
+    fake_psutil = SimpleNamespace(Process=lambda: SimpleNamespace(memory_info=lambda: memory))
+    monkeypatch.setattr(metrics, "optional_import", lambda name: fake_psutil)
+    assert metrics._max_rss_bytes() == 30
+    monkeypatch.setattr(metrics, "optional_import", lambda name: None)
+    assert metrics._max_rss_bytes() == 0
@@ -0,0 +1,140 @@
+"""Tests for the per-engine parser output cache."""
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.models import DocumentObject
+from backend.services import parsing, pdf_parser
+from backend.services.parsing.txt_parser import parse_txt
+from backend.services.parse_cache import (
+    engine_options,
+    load_cached_objects,
+    parse_cache_key,
+    store_cached_objects,
+)
+from backend.store import read_jsonl, upload_objects_path
+
+_SHA = "a" * 64
+
+
+class _CountingParser:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def parse_pdf(self, file_path: str) -> list[DocumentObject]:
+        self.calls += 1
+        file_id = Path(file_path).parent.parent.name
+        return [_object(file_id)]
+
+
+def _object(file_id: str) -> DocumentObject:
+    return DocumentObject(
+        object_id=f"{file_id}-txt-000000",
+        file_id=file_id,
+        text="Flanges shall be ASME B16.5.",
+        order_index=0,
+    )
+
+
+def _document(root: Path, file_id: str) -> str:
+    path = root / file_id / "source" / "document.pdf"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"%PDF-1.4")
+    return str(path)
+
+
+def _configure(monkeypatch, tmp_path: Path, **env: str) -> None:
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    for key, value in env.items():
+        monkeypatch.setenv(f"SIMPLS_{key}", value)
+    get_settings.cache_clear()
+
+
+def test_key_covers_engine_version_and_options() -> None:
+    base = parse_cache_key(_SHA, "native", "1", {"camelot": True})
+
+    assert base == parse_cache_key(_SHA, "native", "1", {"camelot": True})
+    assert base != parse_cache_key(_SHA, "mineru", "1", {"camelot": True})
+    assert base != parse_cache_key(_SHA, "native", "2", {"camelot": True})
+    assert base != parse_cache_key(_SHA, "native", "1", {"camelot": False})
+    assert base != parse_cache_key("b" * 64, "native", "1", {"camelot": True})
+
+
+def test_cached_artifact_objects_are_rebased_onto_the_new_file(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path)
+    store_cached_objects("k" * 64, [_object("old").model_dump(mode="json")], "old")
+
+    cached = load_cached_objects("k" * 64, "new")
+
+    assert cached is not None
+    assert [DocumentObject.model_validate(item) for item in cached] == [_object("new")]
+    assert load_cached_objects("m" * 64, "new") is None
+    get_settings.cache_clear()
+
+
+def test_upload_reparse_is_served_from_the_cache(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'index.db'}")
+    _configure(monkeypatch, tmp_path)
+    calls: list[Path] = []
+
+    def _counting_txt(path: Path) -> list[dict]:
+        calls.append(path)
+        return parse_txt(path)
+
+    monkeypatch.setitem(parsing._PARSERS, ".txt", _counting_txt)
+    client = TestClient(create_app())
+    content = b"1 Scope\nBolts shall be torqued to 40 Nm.\n"
+
+    uploads = [
+        client.post(
+            "/api/upload",
+            files={"file": ("sample.txt", BytesIO(content), "text/plain")},
+            params={"dedupe": "false"},
+        ).json()["upload_id"]
+        for _ in range(2)
+    ]
+    first, second = (read_jsonl(upload_objects_path(upload_id)) for upload_id in uploads)
+
+    assert len(calls) == 1
+    assert [item["content"] for item in second] == [item["content"] for item in first]
+    # Reused output gets line IDs of its own.
+    assert not {item["line_id"] for item in first} & {item["line_id"] for item in second}
+    assert len({item["line_id"] for item in second}) == len(second)
+    get_settings.cache_clear()
+
+
+def test_engine_switches_and_auto_reuse_parsed_output(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path, PDF_ENGINE="native")
+    native = _CountingParser()
+    monkeypatch.setattr(pdf_parser, "NativePdfParser", lambda: native)
+    settings = get_settings()
+
+    first = pdf_parser.select_pdf_parser(settings, override="native", sha256=_SHA)
+    assert first.parse_pdf(_document(tmp_path, "upload1"))[0] == _object("upload1")
+    auto = pdf_parser.select_pdf_parser(
+        settings, file_path=_document(tmp_path, "upload2"), override="auto", sha256=_SHA
+    )
+    reused = auto.parse_pdf(_document(tmp_path, "upload2"))
+
+    assert native.calls == 1
+    assert reused == [_object("upload2")]
+    # Without a content hash, or with the cache disabled, every call parses.
+    pdf_parser.select_pdf_parser(settings, override="native").parse_pdf(_document(tmp_path, "upload3"))
+    assert native.calls == 2
+    assert set(engine_options("native", settings)) == {"pdfplumber", "pymupdf", "camelot", "pikepdf"}
+    get_settings.cache_clear()
+
+    _configure(monkeypatch, tmp_path, PARSE_CACHE="false")
+    pdf_parser.select_pdf_parser(get_settings(), override="native", sha256=_SHA).parse_pdf(
+        _document(tmp_path, "upload4")
+    )
+    assert native.calls == 3
+    get_settings.cache_clear()
@@ -0,0 +1,26 @@
+"""Tests for the section pre-filter that avoids needless LLM calls."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.services.prefilter import skip_reason
+
+
+def test_boilerplate_titles_are_skipped_whatever_their_text() -> None:
+    assert skip_reason("1. Table of Contents", "4 Pumps ........ 12 mm") == "boilerplate"
+    assert skip_reason("Revision History:", "Rev B changed 10 bar to 16 bar") == "boilerplate"
+
+
+def test_empty_stub_and_candidate_free_sections_are_skipped() -> None:
+    assert skip_reason("Piping", "   ") == "empty"
+    assert skip_reason("Valves", "See section 7 for valve requirements.") == "cross_reference"
+    assert skip_reason("Introduction", "This document describes the pump package.") == "no_candidates"
+
+
+def test_spec_bearing_or_long_sections_reach_the_model() -> None:
+    assert skip_reason("Valves", "See section 7. Bodies shall be ASTM A216 WCB.") is None
+    assert skip_reason("Design", "Design pressure 16 bar.") is None
+    assert skip_reason("Background", "Narrative text. " * 200) is None
@@ -0,0 +1,80 @@
+"""Tests for opt-in request profiling."""
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+import pstats
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend import store
+from backend.config import get_settings
+from backend.main import create_app
+
+
+def _isolate(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'profiling.db'}")
+    monkeypatch.setattr(store, "_TMP_DIR", tmp_path / "uploads")
+    store._TMP_DIR.mkdir()
+    get_settings.cache_clear()
+
+
+def test_profile_captured_when_requested(monkeypatch, tmp_path: Path) -> None:
+    _isolate(monkeypatch, tmp_path)
+    client = TestClient(create_app())
+    files = {"file": ("sample.txt", BytesIO(b"1 Scope\nBolts shall be M12.\n"), "text/plain")}
+
+    plain = client.post("/api/upload", files=files)
+    assert plain.status_code == 201
+    assert "x-profile-id" not in plain.headers
+
+    files = {"file": ("sample.txt", BytesIO(b"1 Scope\nBolts shall be M12.\n"), "text/plain")}
+    profiled = client.post("/api/upload", files=files, headers={"X-SimpleSpecs-Profile": "1"})
+    assert profiled.status_code == 201
+    profile_id = profiled.headers["x-profile-id"]
+    assert (tmp_path / "_profiles" / f"{profile_id}.prof").exists()
+
+    listing = client.get("/api/profiles")
+    assert [item["profile_id"] for item in listing.json()] == [profile_id]
+    assert listing.json()[0]["path"] == "/api/upload"
+
+    raw = client.get(f"/api/profiles/{profile_id}")
+    assert raw.status_code == 200
+    assert raw.content
+
+    summary = client.get(f"/api/profiles/{profile_id}", params={"fmt": "text"})
+    assert summary.status_code == 200
+    assert "cumulative" in summary.text
+
+    assert client.get("/api/profiles/../../etc").status_code == 404
+    assert client.get(f"/api/profiles/{'0' * 32}").status_code == 404
+    get_settings.cache_clear()
+
+
+def test_profile_includes_worker_threads_and_processes(monkeypatch, tmp_path: Path) -> None:
+    _isolate(monkeypatch, tmp_path)
+    client = TestClient(create_app())
+    files = [
+        ("files", ("a.txt", BytesIO(b"1 Scope\nBolts shall be M12.\n"), "text/plain")),
+        ("files", ("b.txt", BytesIO(b"1 Scope\nNuts shall be M10.\n"), "text/plain")),
+    ]
+
+    response = client.post(
+        "/api/upload/batch",
+        files=files,
+        params={"workers": 2},
+        headers={"X-SimpleSpecs-Profile": "1"},
+    )
+    assert response.status_code == 200
+    profile_id = response.headers["x-profile-id"]
+
+    stats = pstats.Stats(str(tmp_path / "_profiles" / f"{profile_id}.prof"))
+    functions = {name for _, _, name in stats.stats}
+    # ``ingest_paths`` runs in the threadpool, ``_parse_path`` in parser processes.
+    assert "ingest_paths" in functions
+    assert "_parse_path" in functions
+    get_settings.cache_clear()
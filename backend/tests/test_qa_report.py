@@ -0,0 +1,73 @@
+"""Tests for the memoized QA report."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.routers import files
+from backend.services.manifest import write_artifact_json
+
+
+def _spec(spec_id: str) -> dict:
+    return {
+        "spec_id": spec_id,
+        "file_id": "doc",
+        "section_id": "sec-1",
+        "section_title": "Scope",
+        "spec_text": "Valves shall be rated 10 bar",
+        "source_object_ids": ["doc-000000"],
+    }
+
+
+def test_qa_report_is_memoized_until_specs_change(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'qa.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    files._structure_qa.cache_clear()
+    files._qa_payload.cache_clear()
+    base = tmp_path / "doc"
+    objects = [{"object_id": "doc-000000", "file_id": "doc", "text": "Scope", "order_index": 0}]
+    write_artifact_json(base, "parsed/objects.json", objects)
+    sections = {
+        "section_id": "doc-root",
+        "file_id": "doc",
+        "title": "Document",
+        "children": [{"section_id": "sec-1", "file_id": "doc", "title": "Scope", "depth": 1}],
+    }
+    write_artifact_json(base, "headers/sections.json", sections)
+    write_artifact_json(base, "chunks/chunks.json", {"sec-1": ["doc-000000"]})
+    write_artifact_json(base, "specs/specs.json", [_spec("spec-1")])
+
+    loaded: list[str] = []
+    real_load = files._load_json
+
+    def _counting_load(path: Path):
+        loaded.append(path.name)
+        return real_load(path)
+
+    monkeypatch.setattr(files, "_load_json", _counting_load)
+    client = TestClient(create_app())
+
+    first = client.get("/qa/doc").json()
+    assert first["qa"]["coverage"]["specs_count"] == 1
+    assert sorted(loaded) == ["chunks.json", "objects.json", "sections.json"]
+
+    # Unchanged artifacts: answered from the cache without reading any file.
+    assert client.get("/qa/doc").json() == first
+    assert len(loaded) == 3
+    assert files._qa_payload.cache_info().hits == 1
+
+    # Only the specs changed: the structure summary is reused, the specs re-read.
+    write_artifact_json(base, "specs/specs.json", [_spec("spec-1"), _spec("spec-2")])
+    second = client.get("/qa/doc").json()
+    assert second["qa"]["coverage"]["specs_count"] == 2
+    assert second["qa"]["determinism"]["specs_sha256"] != first["qa"]["determinism"]["specs_sha256"]
+    assert len(loaded) == 3
+    assert files._structure_qa.cache_info().hits == 1
+    get_settings.cache_clear()
@@ -0,0 +1,177 @@
+"""Tests for artifact retention, quotas and the storage endpoint."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import store
+from backend.config import get_settings
+from backend.main import create_app
+from backend.services import inflight
+from backend.services.retention import classify, heartbeat, sweep, touch
+
+
+def _write(path: Path, size: int, age_days: float) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age_days * 86_400
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def _configure(monkeypatch, tmp_path: Path, **env: str) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'retention.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    for key, value in env.items():
+        monkeypatch.setenv(f"SIMPLS_{key}", value)
+    monkeypatch.setattr(store, "_TMP_DIR", tmp_path / "uploads")
+    get_settings.cache_clear()
+
+
+def test_classify_maps_files_to_documents_and_stages() -> None:
+    assert classify("uploads", Path("abc.jsonl")) == ("abc", "parsed")
+    assert classify("uploads", Path("abc_headers.json")) == ("abc", "headers")
+    assert classify("uploads", Path("abc_specs.jsonl")) == ("abc", "specs")
+    assert classify("artifacts", Path("f1/source/document.pdf")) == ("f1", "source")
+    assert classify("artifacts", Path("f1/chunks/chunks.json")) == ("f1", "chunks")
+    assert classify("artifacts", Path("f1/manifest.json")) == ("f1", "manifest")
+    assert classify("artifacts", Path("f1/notes.txt")) == ("f1", "other")
+    assert classify("artifacts", Path("_profiles/p1.prof")) == ("p1", "profiles")
+    assert classify("uploads", Path("notes.txt")) is None
+
+
+def test_quota_evicts_intermediates_before_source_and_specs(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path, RETENTION_MAX_BYTES="2500")
+    artifacts = tmp_path / "artifacts"
+    source = _write(artifacts / "old" / "source" / "document.pdf", 1000, age_days=9)
+    chunks = _write(artifacts / "old" / "chunks" / "chunks.json", 1000, age_days=9)
+    parsed = _write(artifacts / "new" / "parsed" / "objects.json", 1000, age_days=2)
+    specs = _write(tmp_path / "uploads" / "up_specs.jsonl", 1000, age_days=8)
+
+    result = sweep()
+
+    assert result.deleted_files == 2
+    assert not chunks.exists() and not parsed.exists()
+    assert source.exists() and specs.exists()
+    assert not (artifacts / "old" / "chunks").exists()
+    assert result.remaining_bytes == 2000
+    get_settings.cache_clear()
+
+
+def test_quota_evicts_manifest_after_every_other_stage(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path, RETENTION_MAX_BYTES="1500")
+    artifacts = tmp_path / "artifacts"
+    manifest = _write(artifacts / "f" / "manifest.json", 1000, age_days=9)
+    source = _write(artifacts / "f" / "source" / "document.pdf", 1000, age_days=2)
+
+    result = sweep()
+
+    assert result.deleted_by_stage == {"source": 1}
+    assert manifest.exists() and not source.exists()
+    get_settings.cache_clear()
+
+
+def test_stage_quotas_evict_within_each_stage(monkeypatch, tmp_path: Path) -> None:
+    _configure(
+        monkeypatch, tmp_path, RETENTION_STAGE_MAX_BYTES='{"*": 1500, "specs": 5000}'
+    )
+    artifacts = tmp_path / "artifacts"
+    old_chunks = _write(artifacts / "a" / "chunks" / "chunks.json", 1000, age_days=9)
+    new_chunks = _write(artifacts / "b" / "chunks" / "chunks.json", 1000, age_days=2)
+    parsed = _write(artifacts / "a" / "parsed" / "objects.json", 1000, age_days=9)
+    old_specs = _write(artifacts / "a" / "specs" / "specs.json", 1000, age_days=9)
+    new_specs = _write(artifacts / "b" / "specs" / "specs.json", 1000, age_days=2)
+
+    result = sweep()
+
+    assert result.deleted_by_stage == {"chunks": 1}
+    assert not old_chunks.exists()
+    assert new_chunks.exists() and parsed.exists()
+    assert old_specs.exists() and new_specs.exists()
+    get_settings.cache_clear()
+
+
+def test_age_limits_respect_access_and_running_jobs(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path, RETENTION_MAX_AGE_DAYS='{"*": 5, "specs": 30}')
+    uploads = tmp_path / "uploads"
+    stale = _write(uploads / "a.jsonl", 10, age_days=10)
+    kept_specs = _write(uploads / "a_specs.jsonl", 10, age_days=10)
+    read_recently = _write(uploads / "b.jsonl", 10, age_days=10)
+    running = _write(uploads / "c.jsonl", 10, age_days=10)
+
+    sweep(now=time.time() - 86_400 * 30)  # index everything without deleting
+    touch("b")
+    inflight.reset()
+    try:
+        with inflight.track_job("c"):
+            result = sweep(now=time.time() + 600)
+    finally:
+        inflight.reset()
+
+    assert result.deleted_by_stage == {"parsed": 1}
+    assert not stale.exists()
+    assert kept_specs.exists() and read_recently.exists() and running.exists()
+    get_settings.cache_clear()
+
+
+def test_sweep_skips_while_another_process_holds_the_lease(monkeypatch, tmp_path: Path) -> None:
+    fcntl = pytest.importorskip("fcntl")
+    _configure(monkeypatch, tmp_path, RETENTION_MAX_AGE_DAYS='{"*": 1}')
+    stale = _write(tmp_path / "uploads" / "a.jsonl", 10, age_days=10)
+    lease = tmp_path / "artifacts" / ".retention.lock"
+    lease.parent.mkdir(parents=True)
+
+    # A separate open file description conflicts like another worker would.
+    with lease.open("a+b") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        result = sweep()
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    assert result.skipped and result.deleted_files == 0
+    assert stale.exists()
+    assert sweep().deleted_files == 1
+    get_settings.cache_clear()
+
+
+def test_heartbeat_protects_jobs_from_other_workers_sweeps(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path, RETENTION_MAX_AGE_DAYS='{"*": 1}')
+    running = _write(tmp_path / "uploads" / "c.jsonl", 10, age_days=10)
+    sweep(now=time.time() - 86_400 * 30)  # index without deleting
+    inflight.reset()
+    try:
+        with inflight.track_job("c"):
+            heartbeat()
+    finally:
+        inflight.reset()
+
+    # The sweeping worker does not see job "c"; only its access time spares it.
+    result = sweep(now=time.time() + 60)
+
+    assert result.deleted_files == 0
+    assert running.exists()
+    get_settings.cache_clear()
+
+
+def test_storage_endpoint_reports_stages(monkeypatch, tmp_path: Path) -> None:
+    _configure(monkeypatch, tmp_path)
+    _write(tmp_path / "uploads" / "a.jsonl", 5, age_days=1)
+    _write(tmp_path / "artifacts" / "f" / "source" / "document.pdf", 7, age_days=1)
+    client = TestClient(create_app())
+
+    payload = client.get("/system/storage", params={"refresh": "true"}).json()
+
+    assert payload["total_bytes"] == 12
+    assert payload["documents"] == 2
+    assert payload["stages"]["source"]["files"] == 1
+    assert payload["policy"]["max_bytes"] == 0
+    assert payload["policy"]["stage_max_bytes"] == {}
+    swept = client.post("/system/storage/sweep").json()
+    assert swept["last_sweep"]["deleted_files"] == 0
+    get_settings.cache_clear()
@@ -0,0 +1,108 @@
+"""Tests for the FTS5 search index and the search endpoint."""
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.database import get_engine
+from backend.services.search_index import index_specs, match_expression, search
+
+
+def test_match_expression_quotes_terms() -> None:
+    assert match_expression('ASME B31.3 "stainless steel" flange*') == '"ASME" "B31.3" "stainless steel" "flange"*'
+    assert match_expression('" * "') == ""
+
+
+def test_search_ranks_filters_and_paginates(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'search.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    get_settings.cache_clear()
+    client = TestClient(create_app())
+
+    content = b"1 Scope\nPiping shall comply with ASME B31.3.\nValves are 316L stainless steel.\n"
+    upload = client.post("/api/upload", files={"file": ("doc.txt", BytesIO(content), "text/plain")})
+    upload_id = upload.json()["upload_id"]
+    index_specs(
+        upload_id,
+        [
+            {"section_number": "3.1", "section_name": "Piping", "specification": "Piping shall comply with ASME B31.3."},
+            {"section_number": "4", "section_name": "Valves", "specification": "Valve bodies shall be 316L stainless steel."},
+            {"section_number": "3.2", "section_name": "Supports", "specification": "Supports per ASME B31.3 spacing table."},
+        ],
+    )
+
+    response = client.get("/api/search", params={"q": "ASME B31.3", "kind": "spec"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert {hit["section_number"] for hit in body["items"]} == {"3.1", "3.2"}
+    assert "<mark>" in body["items"][0]["snippet"]
+
+    objects = client.get("/api/search", params={"q": "316L", "kind": "object", "upload_id": upload_id})
+    assert objects.json()["total"] == 1
+    assert objects.json()["items"][0]["upload_id"] == upload_id
+
+    section = client.get("/api/search", params={"q": "ASME", "section": "3"})
+    assert section.json()["total"] == 2
+    paged = client.get("/api/search", params={"q": "ASME", "section": "3", "page": 2, "page_size": 1})
+    assert len(paged.json()["items"]) == 1 and paged.json()["total"] == 2
+
+    # Re-indexing replaces the previous specs of the upload.
+    index_specs(upload_id, [{"section_number": "4", "section_name": "Valves", "specification": "Gaskets are PTFE."}])
+    assert client.get("/api/search", params={"q": "ASME", "kind": "spec"}).json()["total"] == 0
+    assert client.get("/api/search", params={"q": "*"}).status_code == 400
+    get_settings.cache_clear()
+
+
+def test_reindex_deletes_by_rowid_and_adopts_existing_rows(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'search.db'}")
+    get_settings.cache_clear()
+    engine = get_engine()
+    # An index written before row tracking existed.
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE search_fts USING fts5(kind UNINDEXED, document_id UNINDEXED, "
+            "ref UNINDEXED, section_number, section_name, body, tokenize = 'porter unicode61')"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO search_fts (kind, document_id, body) "
+            "VALUES ('spec', 'old', 'Flanges are ASME B16.5.')"
+        )
+    index_specs("new", [{"specification": "Bolts are ASTM A193."}])
+
+    index_specs("old", [{"specification": "Flanges are PN16."}])
+    with engine.connect() as connection:
+        plan = " ".join(
+            str(row[-1])
+            for row in connection.exec_driver_sql(
+                "EXPLAIN QUERY PLAN DELETE FROM search_fts WHERE rowid IN "
+                "(SELECT fts_rowid FROM search_rows WHERE document_id = 'old' AND kind = 'spec')"
+            )
+        )
+        tracked = connection.exec_driver_sql("SELECT count(*) FROM search_rows").scalar_one()
+
+    assert "search_rows_document" in plan
+    assert tracked == 2
+    assert search("ASME").total == 0
+    assert search("PN16").total == 1 and search("A193").total == 1
+    get_settings.cache_clear()
+
+
+def test_snippets_escape_indexed_text(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'search.db'}")
+    get_settings.cache_clear()
+    index_specs("doc", [{"specification": 'Valves <img src=x onerror="alert(1)"> rated PN40'}])
+
+    hit = search("PN40").items[0]
+
+    assert "<img" not in hit.snippet
+    assert "&lt;img" in hit.snippet and "<mark>PN40</mark>" in hit.snippet
+    assert hit.text.startswith("Valves <img")
+    get_settings.cache_clear()
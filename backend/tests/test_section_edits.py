@@ -0,0 +1,175 @@
+"""Tests for incremental re-chunking after section edits."""
+from __future__ import annotations
+
+import asyncio
+import random
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.config import get_settings
+from backend.models import DocumentObject, SectionNode, SectionSpan
+from backend.services.chunker import compute_section_spans, run_chunking, update_section_spans
+from backend.services.headers import save_sections
+from backend.services.section_edits import apply_section_edits
+from backend.services.specs import extract_specs_for_sections
+from backend.store import write_json
+
+_FILE_ID = "doc"
+
+
+def _objects(count: int) -> list[DocumentObject]:
+    return [
+        DocumentObject(
+            object_id=f"{_FILE_ID}-{index:04d}",
+            file_id=_FILE_ID,
+            text=f"Line {index}",
+            page_index=index // 10,
+            order_index=index,
+        )
+        for index in range(count)
+    ]
+
+
+def _leaf(number: int, objects: list[DocumentObject], start: int, end: int, depth: int) -> SectionNode:
+    return SectionNode(
+        section_id=f"sec-{number}",
+        file_id=_FILE_ID,
+        number=str(number),
+        title=f"Section {number}",
+        depth=depth,
+        span=SectionSpan(start_object=objects[start].object_id, end_object=objects[end].object_id),
+    )
+
+
+def _leaf_ids(node: SectionNode) -> list[str]:
+    if not node.children:
+        return [node.section_id]
+    return [section_id for child in node.children for section_id in _leaf_ids(child)]
+
+
+def _random_tree(rng: random.Random, objects: list[DocumentObject], ids: list[int]) -> SectionNode:
+    root = SectionNode(section_id=f"{_FILE_ID}-root", file_id=_FILE_ID, title="Document")
+    parent = SectionNode(section_id="sec-parent", file_id=_FILE_ID, title="Parent", depth=1)
+    root.children.append(parent)
+    last = len(objects) - 1
+    for number in ids:
+        start = rng.randint(0, last)
+        end = min(last, start + rng.randint(0, 12))
+        leaf = _leaf(number, objects, start, end, depth=rng.randint(1, 3))
+        (parent.children if rng.random() < 0.5 else root.children).append(leaf)
+    return root
+
+
+def _edit(rng: random.Random, root: SectionNode, objects: list[DocumentObject]) -> SectionNode:
+    edited = root.model_copy(deep=True)
+    last = len(objects) - 1
+    containers = [edited, edited.children[0]]
+    for _ in range(rng.randint(1, 4)):
+        container = rng.choice(containers)
+        leaves = [child for child in container.children if not child.children]
+        action = rng.choice(("move", "depth", "remove", "add", "rename"))
+        if action == "add" or not leaves:
+            start = rng.randint(0, last)
+            container.children.append(
+                _leaf(rng.randint(100, 999), objects, start, min(last, start + 5), depth=2)
+            )
+            continue
+        leaf = rng.choice(leaves)
+        if action == "move":
+            start = rng.randint(0, last)
+            leaf.span = SectionSpan(
+                start_object=objects[start].object_id,
+                end_object=objects[min(last, start + rng.randint(0, 12))].object_id,
+            )
+        elif action == "depth":
+            leaf.depth = rng.randint(1, 3)
+        elif action == "remove":
+            container.children.remove(leaf)
+        else:
+            leaf.title = f"{leaf.title} (edited)"
+    return edited
+
+
+def test_incremental_chunks_match_full_recompute_on_random_edits() -> None:
+    rng = random.Random(36)
+    objects = _objects(80)
+
+    for _ in range(200):
+        previous = _random_tree(rng, objects, rng.sample(range(1, 60), rng.randint(1, 8)))
+        previous_mapping = compute_section_spans(previous, objects)
+        edited = _edit(rng, previous, objects)
+
+        update = update_section_spans(previous, edited, previous_mapping, objects)
+
+        assert update.mapping == compute_section_spans(edited, objects)
+        assert update.changed_sections == {
+            section_id
+            for section_id in _leaf_ids(edited)
+            if update.mapping[section_id] != previous_mapping.get(section_id)
+        }
+
+
+def test_title_only_edit_changes_no_chunks() -> None:
+    objects = _objects(20)
+    previous = SectionNode(
+        section_id=f"{_FILE_ID}-root",
+        file_id=_FILE_ID,
+        title="Document",
+        children=[_leaf(1, objects, 0, 9, 1), _leaf(2, objects, 10, 19, 1)],
+    )
+    mapping = compute_section_spans(previous, objects)
+    edited = previous.model_copy(deep=True)
+    edited.children[1].title = "Renamed"
+
+    update = update_section_spans(previous, edited, mapping, objects)
+
+    assert update.mapping == mapping
+    assert update.changed_sections == frozenset()
+    assert update.removed_sections == frozenset()
+
+
+class _RecordingAdapter:
+    def __init__(self) -> None:
+        self.sections: list[str] = []
+
+    def generate(self, prompt: str) -> str:
+        section = prompt.split('Section: "', 1)[1].split('"', 1)[0]
+        self.sections.append(section)
+        return f"- {section} shall be rated 10 bar"
+
+
+def test_apply_section_edits_reextracts_only_changed_leaves(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'edits.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    objects = _objects(30)
+    for obj in objects:
+        obj.text = f"Valve {obj.order_index} shall be rated {obj.order_index} bar"
+    write_json(tmp_path / _FILE_ID / "parsed" / "objects.json", [obj.model_dump() for obj in objects])
+    root = SectionNode(
+        section_id=f"{_FILE_ID}-root",
+        file_id=_FILE_ID,
+        title="Document",
+        children=[_leaf(1, objects, 0, 9, 1), _leaf(2, objects, 10, 19, 1), _leaf(3, objects, 20, 29, 1)],
+    )
+    save_sections(_FILE_ID, root)
+    run_chunking(_FILE_ID)
+    initial = extract_specs_for_sections(_FILE_ID, root, objects, _RecordingAdapter())
+
+    edited = root.model_copy(deep=True)
+    edited.children[0].title = "Renamed"
+    edited.children[2].span = SectionSpan(
+        start_object=objects[15].object_id, end_object=objects[29].object_id
+    )
+    adapter = _RecordingAdapter()
+    result = asyncio.run(apply_section_edits(_FILE_ID, edited, adapter))
+    get_settings.cache_clear()
+
+    assert sorted(adapter.sections) == ["Section 2", "Section 3"]
+    assert result.changed_sections == ["sec-2", "sec-3"]
+    assert result.chunks == compute_section_spans(edited, objects)
+    untouched = {spec.spec_id for spec in initial if spec.section_id == "sec-1"}
+    assert {spec.spec_id for spec in result.specs if spec.section_id == "sec-1"} == untouched
+    assert {spec.section_title for spec in result.specs if spec.section_id == "sec-1"} == {"Renamed"}
@@ -0,0 +1,60 @@
+"""Tests for the cross-document section result cache."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.config import get_settings
+from backend.services.result_cache import (
+    lookup_section_results,
+    section_content_key,
+    store_section_results,
+)
+
+_KEY_ARGS = {"namespace": "test", "model": "openrouter:model-a", "prompt_version": "1"}
+
+
+def test_key_ignores_numbering_case_and_spacing() -> None:
+    first = section_content_key(
+        ["4.2.1  Paint shall be epoxy, 200 µm DFT.", "- Colour RAL 7035."], **_KEY_ARGS
+    )
+    second = section_content_key(
+        ["7.1.3 paint shall be epoxy,  200 µm DFT.", "• Colour RAL 7035."], **_KEY_ARGS
+    )
+
+    assert first == second
+    assert first != section_content_key(["Paint shall be epoxy, 250 µm DFT."], **_KEY_ARGS)
+    assert first != section_content_key(
+        ["4.2.1  Paint shall be epoxy, 200 µm DFT.", "- Colour RAL 7035."],
+        **{**_KEY_ARGS, "model": "openrouter:model-b"},
+    )
+    assert section_content_key(["   "], **_KEY_ARGS) is None
+
+
+def test_key_keeps_abbreviations_and_values() -> None:
+    def key(*lines: str) -> str | None:
+        return section_content_key(list(lines), **_KEY_ARGS)
+
+    assert key("Max. pressure 10 bar") != key("Min. pressure 10 bar")
+    assert key("No. of bolts: 8") != key("Typ. of bolts: 8")
+    assert key("1.5 mm gasket") != key("2.5 mm gasket")
+    assert key("a) Flanges shall be raised face.") == key("(b) Flanges shall be raised face.")
+    assert key("iv) Flanges shall be raised face.") == key("3. Flanges shall be raised face.")
+    assert key("4.2 Flanges shall be raised face.") == key("Flanges shall be raised face.")
+
+
+def test_results_round_trip_and_first_writer_wins(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'cache.db'}")
+    get_settings.cache_clear()
+    key = section_content_key(["Nameplates shall be 316 stainless steel."], **_KEY_ARGS)
+
+    assert lookup_section_results([key]) == {}
+    store_section_results({key: ["- Nameplates shall be 316 stainless steel."]}, **_KEY_ARGS)
+    store_section_results({key: ["- something else"]}, **_KEY_ARGS)
+
+    assert lookup_section_results([key, "unknown"]) == {
+        key: ["- Nameplates shall be 316 stainless steel."]
+    }
+    get_settings.cache_clear()
@@ -0,0 +1,80 @@
+"""Tests for near-duplicate spec detection."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.config import get_settings
+from backend.models import DocumentObject, SectionNode
+from backend.services.dedup import collapse_spec_records, near_duplicate_groups
+from backend.services.specs import extract_specs_for_sections
+from backend.store import write_json
+
+
+def test_near_duplicates_group_but_values_stay_apart() -> None:
+    texts = [
+        "The pump shall deliver 10 bar at the outlet flange under full load.",
+        "Bolts shall conform to ASTM A193 grade B7.",
+        "the pump shall deliver 10 bar at the outlet flange, under full load",
+        "The pump shall deliver 100 bar at the outlet flange under full load.",
+    ]
+
+    assert near_duplicate_groups(texts) == [[0, 2], [1], [3]]
+
+
+def test_collapse_keeps_first_record_and_merges_provenance() -> None:
+    records = [
+        {"spec_id": "a", "spec_text": "Motor shall be rated IP55 for outdoor service.", "confidence": 0.4, "source_object_ids": ["f1-1", "f1-2"]},
+        {"spec_id": "b", "spec_text": "Gearbox oil capacity is 12 L.", "confidence": None, "source_object_ids": ["f1-3"]},
+        {"spec_id": "c", "spec_text": "Motor shall be rated IP55 for outdoor service", "confidence": 0.9, "source_object_ids": ["f2-7", "f1-2"]},
+    ]
+
+    collapsed = collapse_spec_records(records)
+
+    assert [record["spec_id"] for record in collapsed] == ["a", "b"]
+    assert collapsed[0]["source_object_ids"] == ["f1-1", "f1-2", "f2-7"]
+    assert collapsed[0]["confidence"] == 0.9
+    assert records[0]["source_object_ids"] == ["f1-1", "f1-2"]
+
+
+def test_grouping_scales_linearly_on_distinct_texts() -> None:
+    texts = [f"Component {index} shall weigh {index * 3} kg when fully assembled" for index in range(2_000)]
+
+    groups = near_duplicate_groups(texts)
+
+    assert len(groups) == len(texts)
+
+
+def test_extraction_collapses_within_sections_only(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'specs.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path))
+    get_settings.cache_clear()
+    requirement = "Flanges shall be ASME B16.5 class 150 raised face."
+    objects = [
+        DocumentObject(object_id=f"f-{index}", file_id="f", text=requirement, order_index=index)
+        for index in range(2)
+    ]
+    root = SectionNode(
+        section_id="f-root",
+        file_id="f",
+        title="Document",
+        children=[
+            SectionNode(section_id=f"s{index}", file_id="f", number=str(index), title=f"Piping {index}")
+            for index in range(2)
+        ],
+    )
+    write_json(tmp_path / "f" / "chunks" / "chunks.json", {"s0": ["f-0"], "s1": ["f-1"]})
+
+    class _Adapter:
+        def generate(self, prompt: str) -> str:
+            return f"- {requirement}\n- flanges shall be ASME B16.5 class 150, raised face"
+
+    specs = extract_specs_for_sections("f", root, objects, _Adapter())
+    get_settings.cache_clear()
+
+    assert [(spec.section_id, spec.source_object_ids) for spec in specs] == [
+        ("s0", ["f-0"]),
+        ("s1", ["f-1"]),
+    ]
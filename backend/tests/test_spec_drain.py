@@ -0,0 +1,133 @@
+"""Tests for draining in-flight pipeline jobs on worker shutdown."""
+from __future__ import annotations
+
+from io import BytesIO
+import os
+from pathlib import Path
+import signal
+import sys
+import threading
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.routers import files
+from backend.services import inflight
+from backend.services.section_edits import SectionEditResult
+
+
+def test_wait_until_idle_waits_for_running_jobs() -> None:
+    inflight.reset()
+    started = threading.Event()
+    release = threading.Event()
+
+    def _job() -> None:
+        with inflight.track_job("upload-1"):
+            started.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=_job)
+    worker.start()
+    started.wait(5)
+
+    inflight.begin_drain()
+    assert inflight.in_flight() == ["upload-1"]
+    assert inflight.wait_until_idle(0.05) is False
+
+    release.set()
+    assert inflight.wait_until_idle(5) is True
+    worker.join()
+    assert inflight.in_flight() == []
+    inflight.reset()
+
+
+def test_signal_drains_jobs_before_forwarding() -> None:
+    inflight.reset()
+    forwarded = threading.Event()
+    original = signal.signal(signal.SIGUSR1, lambda signum, frame: forwarded.set())
+    started = threading.Event()
+    release = threading.Event()
+
+    def _job() -> None:
+        with inflight.track_job("upload-1"):
+            started.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=_job)
+    try:
+        assert inflight.install_drain_handler(5, signal.SIGUSR1) is True
+        worker.start()
+        started.wait(5)
+
+        os.kill(os.getpid(), signal.SIGUSR1)
+        # The server keeps serving (and reporting draining) until the job ends.
+        assert inflight.is_draining()
+        assert not forwarded.wait(0.1)
+
+        release.set()
+        assert forwarded.wait(5)
+    finally:
+        release.set()
+        worker.join()
+        signal.signal(signal.SIGUSR1, original)
+        inflight.reset()
+
+
+def test_draining_worker_refuses_new_spec_jobs(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'drain.db'}")
+    get_settings.cache_clear()
+    inflight.reset()
+    client = TestClient(create_app())
+    inflight.begin_drain()
+    try:
+        health = client.get("/healthz")
+        response = client.post("/api/specs", json={"upload_id": "any", "provider": "openrouter", "model": "m"})
+    finally:
+        inflight.reset()
+        get_settings.cache_clear()
+
+    assert health.status_code == 503
+    assert health.json() == {"status": "draining"}
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_draining_worker_refuses_ingest_and_section_edits(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'drain.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    get_settings.cache_clear()
+    parsed = tmp_path / "artifacts" / "doc" / "parsed" / "objects.json"
+    parsed.parent.mkdir(parents=True)
+    parsed.write_text("[]")
+    root = {"section_id": "root", "file_id": "doc", "title": "Document"}
+    seen: list[list[str]] = []
+
+    async def _apply(file_id, section_root, adapter, *, reextract):
+        seen.append(inflight.in_flight())
+        return SectionEditResult(
+            chunks={}, changed_sections=[], removed_sections=[], specs=None
+        )
+
+    monkeypatch.setattr(files, "apply_section_edits", _apply)
+    inflight.reset()
+    client = TestClient(create_app())
+    try:
+        edited = client.put("/sections/doc", json=root, params={"reextract": "false"})
+        inflight.begin_drain()
+        ingest = client.post(
+            "/ingest", files={"file": ("spec.txt", BytesIO(b"1 Scope\n"), "text/plain")}
+        )
+        refused_edit = client.put("/sections/doc", json=root, params={"reextract": "false"})
+    finally:
+        inflight.reset()
+        get_settings.cache_clear()
+
+    assert edited.status_code == 200
+    assert seen == [["doc"]]
+    for response in (ingest, refused_edit):
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+    assert not any((tmp_path / "artifacts").glob("*/source"))
@@ -25,3 +25,5 @@ def test_capabilities_endpoint() -> None:
 
     assert isinstance(payload["mineru_importable"], bool)
     assert payload["pdf_engine"] in {"native", "mineru", "auto"}
+    assert payload["libraries"]["pdfplumber"]["available"] is True
+    assert {"available", "loaded", "purpose"} <= set(payload["libraries"]["camelot"])
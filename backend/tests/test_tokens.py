@@ -0,0 +1,106 @@
+"""Tests for token counting and prompt budgeting."""
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.config import get_settings
+from backend.constants import MAX_TOKENS_LIMIT
+from backend.services.tokens import (
+    DEFAULT_CONTEXT_WINDOW,
+    EstimatingTokenizer,
+    context_window,
+    fit_text,
+    get_tokenizer,
+    prompt_budget,
+    register_tokenizer,
+    split_text,
+    split_windows,
+)
+
+
+class _WordTokenizer:
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def test_split_text_respects_budget_and_keeps_every_line() -> None:
+    tokenizer = _WordTokenizer()
+    text = "\n".join(f"line {index} with five words" for index in range(20))
+
+    parts = split_text(text, 12, tokenizer)
+
+    assert len(parts) > 1
+    assert all(tokenizer.count(part) <= 12 for part in parts)
+    assert "\n".join(parts) == text
+    assert split_text("short text", 12, tokenizer) == ["short text"]
+
+
+def test_split_windows_overlap_at_unit_boundaries() -> None:
+    tokenizer = _WordTokenizer()
+    units = [f"object {index} says four" for index in range(12)]
+
+    windows = split_windows(units, 20, tokenizer, overlap=0.3)
+
+    assert len(windows) > 1
+    assert all(tokenizer.count(window) <= 20 for window in windows)
+    for window in windows:
+        assert all(line in units for line in window.splitlines())
+    for previous, current in zip(windows, windows[1:]):
+        assert previous.splitlines()[-1] == current.splitlines()[0]
+    covered = {line for window in windows for line in window.splitlines()}
+    assert covered == set(units)
+    assert split_windows(units[:2], 20, tokenizer) == ["\n".join(units[:2])]
+
+
+def test_fit_text_cuts_on_line_boundary() -> None:
+    tokenizer = EstimatingTokenizer(chars_per_token=1.0)
+    text = "alpha\nbravo\ncharlie"
+
+    assert fit_text(text, 100, tokenizer) == text
+    assert fit_text(text, 14, tokenizer) == "alpha\nbravo"
+
+
+def test_prompt_budget_reserves_completion_and_template(monkeypatch) -> None:
+    monkeypatch.delenv("SIMPLS_LLM_CONTEXT_WINDOW", raising=False)
+    get_settings.cache_clear()
+    register_tokenizer("test-words", _WordTokenizer())
+
+    window = context_window("test-words", {"num_ctx": 10_000})
+    assert window == 10_000
+    assert prompt_budget("test-words", params={"num_ctx": 10_000, "max_tokens": 1_000}) == 8_500
+    # MAX_TOKENS_LIMIT exceeds half of this window, so half is reserved.
+    assert MAX_TOKENS_LIMIT > window // 2
+    assert prompt_budget("test-words", template="four words right here", params={"num_ctx": 10_000}) == 4_496
+    assert context_window("claude-3-5-sonnet") == 200_000
+
+
+def test_unknown_model_window_falls_back_with_one_warning(monkeypatch, caplog) -> None:
+    monkeypatch.delenv("SIMPLS_LLM_CONTEXT_WINDOW", raising=False)
+    get_settings.cache_clear()
+
+    with caplog.at_level("WARNING", logger="backend.services.tokens"):
+        assert context_window("openrouter/unlisted-model") == DEFAULT_CONTEXT_WINDOW
+        assert context_window("openrouter/unlisted-model") == DEFAULT_CONTEXT_WINDOW
+
+    warnings = [record for record in caplog.records if "LLM_CONTEXT_WINDOW" in record.getMessage()]
+    assert len(warnings) == 1
+
+    monkeypatch.setenv("SIMPLS_LLM_CONTEXT_WINDOW", "128000")
+    get_settings.cache_clear()
+    assert context_window("openrouter/unlisted-model") == 128_000
+    get_settings.cache_clear()
+
+
+def test_estimator_calibrates_from_reported_usage() -> None:
+    tokenizer = get_tokenizer("calibration-model")
+    assert isinstance(tokenizer, EstimatingTokenizer)
+    before = tokenizer.count("x" * 1_000)
+
+    for _ in range(30):
+        tokenizer.calibrate(1_000, 500)
+
+    assert tokenizer.count("x" * 1_000) > before
+    assert abs(tokenizer.chars_per_token - 2.0) < 0.05
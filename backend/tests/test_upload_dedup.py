@@ -0,0 +1,54 @@
+"""Tests for content-hash deduplication of uploads."""
+from __future__ import annotations
+
+from io import BytesIO
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.store import upload_objects_path
+
+
+def _upload(client: TestClient, content: bytes, **params):
+    files = {"file": ("sample.txt", BytesIO(content), "text/plain")}
+    return client.post("/api/upload", files=files, params=params)
+
+
+def test_identical_upload_reuses_parsed_objects(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'index.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    get_settings.cache_clear()
+    client = TestClient(create_app())
+    content = b"1 Scope\nBolts shall be torqued to 40 Nm.\n"
+
+    first = _upload(client, content)
+    assert first.status_code == 201
+    assert first.json()["deduplicated"] is False
+    upload_id = first.json()["upload_id"]
+
+    second = _upload(client, content)
+    assert second.status_code == 201
+    assert second.json() == {
+        "upload_id": upload_id,
+        "object_count": first.json()["object_count"],
+        "deduplicated": True,
+    }
+
+    forced = _upload(client, content, dedupe="false")
+    assert forced.json()["deduplicated"] is False
+    assert forced.json()["upload_id"] != upload_id
+
+    other = _upload(client, b"Different document\n")
+    assert other.json()["deduplicated"] is False
+
+    # Index entries whose parsed output vanished are ignored.
+    upload_objects_path(forced.json()["upload_id"]).unlink()
+    upload_objects_path(upload_id).unlink()
+    fresh = _upload(client, content)
+    assert fresh.json()["deduplicated"] is False
+    get_settings.cache_clear()
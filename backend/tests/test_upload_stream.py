@@ -0,0 +1,120 @@
+"""Tests for the shared streaming upload receiver."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from io import BytesIO
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi import HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from backend.config import get_settings
+from backend.main import create_app
+from backend.services.upload_stream import UploadLimitMiddleware, receive_upload
+
+
+def test_receive_upload_hashes_and_writes(tmp_path: Path) -> None:
+    payload = b"x" * 5000
+    upload = UploadFile(file=BytesIO(payload), filename="a.txt")
+    target = tmp_path / "source" / "document.txt"
+
+    received = asyncio.run(receive_upload(upload, target, max_bytes=10_000, chunk_size=1024))
+
+    assert received.size == len(payload)
+    assert received.sha256 == hashlib.sha256(payload).hexdigest()
+    assert target.read_bytes() == payload
+
+
+def test_receive_upload_aborts_when_limit_exceeded(tmp_path: Path) -> None:
+    upload = UploadFile(file=BytesIO(b"x" * 5000), filename="a.txt")
+    target = tmp_path / "document.txt"
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(receive_upload(upload, target, max_bytes=2048, chunk_size=1024))
+
+    assert excinfo.value.status_code == 413
+    assert not target.exists()
+
+
+def test_api_upload_enforces_size_limit(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_MAX_FILE_MB", "1")
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'index.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    get_settings.cache_clear()
+    client = TestClient(create_app())
+
+    files = {"file": ("big.txt", BytesIO(b"0" * (2 * 1024 * 1024)), "text/plain")}
+    response = client.post("/api/upload", files=files)
+
+    assert response.status_code == 413
+    assert not list(tmp_path.glob("upload_*"))
+    get_settings.cache_clear()
+
+
+def _call_limited(monkeypatch, headers: list, chunks: int) -> tuple[int, list]:
+    """Send ``chunks`` 256 KiB body messages to /ingest behind the middleware."""
+
+    monkeypatch.setenv("SIMPLS_MAX_FILE_MB", "1")
+    get_settings.cache_clear()
+    pulled: list[int] = []
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        pulled.append(len(pulled))
+        more = len(pulled) < chunks
+        return {"type": "http.request", "body": b"0" * (256 * 1024), "more_body": more}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    async def app(scope, receive, send) -> None:
+        while (await receive()).get("more_body"):
+            pass
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    scope = {"type": "http", "method": "POST", "path": "/ingest", "headers": headers}
+    asyncio.run(UploadLimitMiddleware(app)(scope, receive, send))
+    get_settings.cache_clear()
+    return sent[0]["status"], pulled
+
+
+def test_upload_limit_rejects_declared_length_without_reading(monkeypatch) -> None:
+    declared = [(b"content-length", str(64 * 1024 * 1024).encode())]
+    status, pulled = _call_limited(monkeypatch, declared, chunks=256)
+
+    assert status == 413
+    assert pulled == []
+
+
+def test_upload_limit_cuts_off_undeclared_bodies(monkeypatch) -> None:
+    status, pulled = _call_limited(monkeypatch, [], chunks=256)
+
+    assert status == 413
+    assert len(pulled) == 5  # 1 MiB limit plus overhead, in 256 KiB messages
+
+    status, _ = _call_limited(monkeypatch, [], chunks=2)
+    assert status == 201
+
+
+def test_ingest_rejects_oversize_body_with_413(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("SIMPLS_MAX_FILE_MB", "1")
+    monkeypatch.setenv("SIMPLS_DB_URL", f"sqlite:///{tmp_path / 'index.db'}")
+    monkeypatch.setenv("SIMPLS_ARTIFACTS_DIR", str(tmp_path / "artifacts"))
+    get_settings.cache_clear()
+    client = TestClient(create_app())
+
+    files = {"file": ("big.txt", BytesIO(b"0" * (3 * 1024 * 1024)), "text/plain")}
+    response = client.post("/ingest", files=files)
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "File exceeds maximum allowed size."}
+    assert not (tmp_path / "artifacts").exists() or not any((tmp_path / "artifacts").iterdir())
+    get_settings.cache_clear()
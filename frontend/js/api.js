@@ -64,11 +64,36 @@ export async function uploadFile(file) {
   });
 }
 
+export async function uploadFiles(files) {
+  const formData = new FormData();
+  for (const file of files) {
+    formData.append("files", file);
+  }
+  return request("/api/upload/batch", {
+    method: "POST",
+    body: formData,
+  });
+}
+
 export async function fetchObjects(uploadId, page = 1, pageSize = 500) {
   const params = new URLSearchParams({ upload_id: uploadId, page: String(page), page_size: String(pageSize) });
   return request(`/api/objects?${params.toString()}`, { headers: JSON_HEADERS });
 }
 
+export async function searchIndex(query, { kind, uploadIds = [], section, page = 1, pageSize = 20 } = {}) {
+  const params = new URLSearchParams({ q: query, page: String(page), page_size: String(pageSize) });
+  if (kind) {
+    params.set("kind", kind);
+  }
+  if (section) {
+    params.set("section", section);
+  }
+  for (const uploadId of uploadIds) {
+    params.append("upload_id", uploadId);
+  }
+  return request(`/api/search?${params.toString()}`, { headers: JSON_HEADERS });
+}
+
 export async function fetchModelSettings() {
   return request("/api/settings", { headers: JSON_HEADERS });
 }
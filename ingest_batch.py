@@ -0,0 +1,70 @@
+"""Bulk-ingest folders of documents without going through the web UI."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterable
+
+from backend.services.uploads import SUPPORTED_EXTENSIONS, BatchSource, ingest_paths
+
+
+def _collect(paths: Iterable[Path], recursive: bool) -> list[Path]:
+    """Expand ``paths`` into the supported documents they contain."""
+
+    collected: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.iterdir()
+            collected.extend(
+                sorted(
+                    item
+                    for item in candidates
+                    if item.is_file() and item.suffix.lower() in SUPPORTED_EXTENSIONS
+                )
+            )
+        elif path.is_file():
+            collected.append(path)
+        else:
+            print(f"Skipping missing path: {path}", file=sys.stderr)
+    return collected
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Parse every document under the given paths and print a manifest."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="Files or folders to ingest")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Descend into sub-folders")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Parallel parser processes")
+    parser.add_argument("--no-dedupe", action="store_true", help="Re-parse already indexed content")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON manifest to this file")
+    args = parser.parse_args(argv)
+
+    documents = _collect(args.paths, args.recursive)
+    if not documents:
+        print("No supported documents found.", file=sys.stderr)
+        return 1
+
+    items = ingest_paths(
+        [BatchSource(path=path, filename=str(path)) for path in documents],
+        max_workers=args.workers,
+        dedupe=not args.no_dedupe,
+    )
+    manifest = json.dumps([item.model_dump() for item in items], indent=2)
+    if args.output:
+        args.output.write_text(manifest + "\n", encoding="utf-8")
+    else:
+        print(manifest)
+
+    failed = sum(1 for item in items if item.status == "failed")
+    print(
+        f"Ingested {len(items) - failed}/{len(items)} documents ({failed} failed).",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+"""Production launcher serving the SimpleSpecs API with multiple workers."""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Sequence
+
+ROOT = Path(__file__).resolve().parent
+APP = "backend.main:create_app"
+
+# Imported in the master before forking so every worker shares their pages
+# copy-on-write instead of importing its own copy on the first upload.
+PRELOADED_CAPABILITIES = ("pdfplumber", "pymupdf", "pikepdf", "camelot", "docx")
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    from backend.config import get_settings
+
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.WEB_WORKERS,
+        help="Worker processes (default: WEB_WORKERS, 0 means one per core).",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=settings.WORKER_MAX_REQUESTS,
+        help="Recycle a worker after this many requests (0 disables recycling).",
+    )
+    parser.add_argument(
+        "--max-requests-jitter",
+        type=int,
+        default=settings.WORKER_MAX_REQUESTS_JITTER,
+        help="Random extra requests per worker so workers do not recycle together.",
+    )
+    parser.add_argument(
+        "--graceful-timeout",
+        type=float,
+        default=settings.DRAIN_TIMEOUT_S,
+        help="Seconds a stopping worker waits for in-flight spec jobs.",
+    )
+    parser.add_argument(
+        "--server",
+        choices=("auto", "gunicorn", "uvicorn"),
+        default="auto",
+        help="Process manager; auto prefers gunicorn (preloading) when installed.",
+    )
+    return parser.parse_args(argv)
+
+
+def _worker_count(requested: int) -> int:
+    """Return ``requested`` workers, or one per available core when ``0``."""
+
+    if requested > 0:
+        return requested
+    try:
+        return max(len(os.sched_getaffinity(0)), 1)
+    except AttributeError:  # pragma: no cover - not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def _gunicorn_available() -> bool:
+    return os.name == "posix" and importlib.util.find_spec("gunicorn") is not None
+
+
+def _worker_class() -> str:
+    if importlib.util.find_spec("uvicorn_worker") is not None:
+        return "uvicorn_worker.UvicornWorker"
+    return "uvicorn.workers.UvicornWorker"
+
+
+def gunicorn_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Return the gunicorn settings for ``args``."""
+
+    return {
+        "bind": f"{args.host}:{args.port}",
+        "workers": _worker_count(args.workers),
+        "worker_class": _worker_class(),
+        "preload_app": True,
+        "max_requests": args.max_requests,
+        "max_requests_jitter": args.max_requests_jitter if args.max_requests else 0,
+        # The drain hook runs inside the graceful window; leave it room to log.
+        "graceful_timeout": int(args.graceful_timeout) + 5,
+        "timeout": 300,
+        "chdir": str(ROOT),
+    }
+
+
+def uvicorn_options(args: argparse.Namespace) -> dict[str, Any]:
+    """Return the ``uvicorn.run`` keyword arguments for ``args``."""
+
+    return {
+        "factory": True,
+        "host": args.host,
+        "port": args.port,
+        "workers": _worker_count(args.workers),
+        "limit_max_requests": args.max_requests or None,
+        "limit_max_requests_jitter": args.max_requests_jitter if args.max_requests else 0,
+        "timeout_graceful_shutdown": int(args.graceful_timeout) + 5,
+    }
+
+
+def _preload() -> Any:
+    """Import the application and the parsing libraries in the master process."""
+
+    from backend.main import create_app
+    from backend.services.capabilities import optional_import
+
+    for name in PRELOADED_CAPABILITIES:
+        optional_import(name)
+    return create_app()
+
+
+def _serve_gunicorn(args: argparse.Namespace) -> int:
+    from gunicorn.app.base import BaseApplication
+
+    options = gunicorn_options(args)
+
+    class _Application(BaseApplication):
+        def load_config(self) -> None:
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            return _preload()
+
+    print(
+        f"Starting {options['workers']} gunicorn workers on http://{options['bind']} ...",
+        flush=True,
+    )
+    _Application().run()
+    return 0
+
+
+def _serve_uvicorn(args: argparse.Namespace) -> int:
+    import uvicorn
+
+    options = uvicorn_options(args)
+    # uvicorn spawns (rather than forks) its workers, so nothing is preloaded.
+    print(
+        f"Starting {options['workers']} uvicorn workers on http://{args.host}:{args.port} ...",
+        flush=True,
+    )
+    uvicorn.run(APP, **options)
+    return 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Serve the API with worker recycling and graceful draining."""
+
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    args = _parse_args(argv)
+    server = args.server
+    if server == "auto":
+        server = "gunicorn" if _gunicorn_available() else "uvicorn"
+    if server == "gunicorn":
+        if not _gunicorn_available():
+            print("gunicorn is not installed; see requirements-optional.txt.", file=sys.stderr)
+            return 2
+        return _serve_gunicorn(args)
+    return _serve_uvicorn(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())